@@ -0,0 +1,26 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "h7i8j9k0l1m2"
+down_revision: Union[str, Sequence[str], None] = "706d274a742e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "videos",
+        sa.Column(
+            "analysis_status",
+            sa.String(length=20),
+            nullable=False,
+            server_default="complete",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("videos", "analysis_status")
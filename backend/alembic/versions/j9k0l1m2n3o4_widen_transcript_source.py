@@ -0,0 +1,34 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "j9k0l1m2n3o4"
+down_revision: Union[str, Sequence[str], None] = "i8j9k0l1m2n3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # transcript_source now carries the language, e.g. "captions-translated:en"
+    op.alter_column(
+        "videos",
+        "transcript_source",
+        existing_type=sa.String(length=20),
+        type_=sa.String(length=40),
+        existing_nullable=True,
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "UPDATE videos SET transcript_source = split_part(transcript_source, ':', 1)"
+    )
+    op.alter_column(
+        "videos",
+        "transcript_source",
+        existing_type=sa.String(length=40),
+        type_=sa.String(length=20),
+        existing_nullable=True,
+    )
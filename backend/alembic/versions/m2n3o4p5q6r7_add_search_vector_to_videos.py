@@ -0,0 +1,62 @@
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "m2n3o4p5q6r7"
+down_revision: Union[str, Sequence[str], None] = "l1m2n3o4p5q6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Kept in sync with app.models.VIDEO_SEARCH_VECTOR_SQL
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, "
+    "immutable_unaccent(coalesce(title, ''))), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, immutable_unaccent("
+    "coalesce(channel_name, '') || ' ' || "
+    "coalesce(immutable_array_to_string(keywords::text[], ' '), ''))), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "immutable_unaccent(coalesce(key_knowledge, ''))), 'C') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "immutable_unaccent(coalesce(explanation, ''))), 'D')"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    # unaccent() and array_to_string() are only STABLE, which generated
+    # columns reject. Pinning the dictionary makes the wrapper safe to mark
+    # IMMUTABLE.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION immutable_unaccent(text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text)
+        RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$ SELECT array_to_string($1, $2) $$
+        """
+    )
+    op.execute(
+        "ALTER TABLE videos ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED"
+    )
+    op.create_index(
+        "ix_videos_search_vector",
+        "videos",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_videos_search_vector", table_name="videos")
+    op.drop_column("videos", "search_vector")
+    op.execute("DROP FUNCTION IF EXISTS immutable_array_to_string(text[], text)")
+    op.execute("DROP FUNCTION IF EXISTS immutable_unaccent(text)")
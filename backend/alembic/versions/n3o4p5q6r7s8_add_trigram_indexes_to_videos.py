@@ -0,0 +1,27 @@
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "n3o4p5q6r7s8"
+down_revision: Union[str, Sequence[str], None] = "m2n3o4p5q6r7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Expressions match app.services.search.FUZZY_COLUMNS
+    op.execute(
+        "CREATE INDEX ix_videos_title_trgm ON videos "
+        "USING gin (immutable_unaccent(lower(title)) gin_trgm_ops)"
+    )
+    op.execute(
+        "CREATE INDEX ix_videos_channel_name_trgm ON videos "
+        "USING gin (immutable_unaccent(lower(channel_name)) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_videos_channel_name_trgm", table_name="videos")
+    op.drop_index("ix_videos_title_trgm", table_name="videos")
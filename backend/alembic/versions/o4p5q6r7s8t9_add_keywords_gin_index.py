@@ -0,0 +1,43 @@
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "o4p5q6r7s8t9"
+down_revision: Union[str, Sequence[str], None] = "n3o4p5q6r7s8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Tag filters now compare whole array elements, so older rows written
+    # before keywords were normalized must match app.services.tags
+    # normalize_keywords: trimmed, lower-cased, single-spaced, de-duplicated
+    # with the first occurrence kept in place.
+    op.execute(
+        r"""
+        UPDATE videos SET keywords = ARRAY(
+            SELECT tag FROM (
+                SELECT DISTINCT ON (tag) tag, ord FROM (
+                    SELECT lower(regexp_replace(btrim(k), '\s+', ' ', 'g')) AS tag,
+                           ord
+                    FROM unnest(keywords) WITH ORDINALITY AS u(k, ord)
+                ) normalized
+                WHERE tag <> ''
+                ORDER BY tag, ord
+            ) deduplicated
+            ORDER BY ord
+        )::varchar[]
+        WHERE keywords IS NOT NULL
+        """
+    )
+    op.create_index(
+        "ix_videos_keywords",
+        "videos",
+        ["keywords"],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_videos_keywords", table_name="videos")
@@ -0,0 +1,41 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "p5q6r7s8t9u0"
+down_revision: Union[str, Sequence[str], None] = "o4p5q6r7s8t9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("videos", sa.Column("excerpt", sa.String(280), nullable=True))
+    # A SQL approximation of app.services.excerpt.make_excerpt: markup
+    # stripped and whitespace collapsed, but long text is cut at a fixed
+    # width rather than a word boundary. Re-analysed videos get the exact
+    # version.
+    op.execute(
+        r"""
+        UPDATE videos SET excerpt = CASE
+            WHEN length(plain) <= 280 THEN plain
+            ELSE rtrim(left(plain, 279)) || '…'
+        END
+        FROM (
+            SELECT id AS video_id, btrim(regexp_replace(regexp_replace(
+                regexp_replace(
+                    coalesce(nullif(explanation, ''), key_knowledge),
+                    '\[([^\]]*)\]\([^)]*\)', '\1', 'g'),
+                '(^|\n)\s*(#{1,6}\s+|[-*+]\s+|\d+[.)]\s+|>\s*)|[*_`~]+', '\1', 'g'),
+                '\s+', ' ', 'g')) AS plain
+            FROM videos
+            WHERE coalesce(nullif(explanation, ''), key_knowledge) IS NOT NULL
+        ) source
+        WHERE videos.id = source.video_id AND plain <> ''
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("videos", "excerpt")
@@ -0,0 +1,78 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "q6r7s8t9u0v1"
+down_revision: Union[str, Sequence[str], None] = "p5q6r7s8t9u0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, columns, partial index predicate); must match Video.__table_args__.
+# Each ordering ends in id and lists nullable columns NULLS LAST, like the
+# keyset orderings in app.services.pagination, so a page is an index range
+# scan with no sort.
+LIST_INDEXES = [
+    ("ix_videos_user_created_at", ["user_id", "created_at", "id"], None),
+    ("ix_videos_user_title", ["user_id", "title", "id"], None),
+    (
+        "ix_videos_user_title_desc",
+        ["user_id", "title DESC NULLS LAST", "id DESC"],
+        None,
+    ),
+    ("ix_videos_user_channel_name", ["user_id", "channel_name", "id"], None),
+    (
+        "ix_videos_user_duration_desc",
+        ["user_id", "duration DESC NULLS LAST", "id DESC"],
+        None,
+    ),
+    (
+        "ix_videos_user_last_viewed_at",
+        ["user_id", "last_viewed_at DESC NULLS LAST", "id DESC"],
+        None,
+    ),
+    ("ix_videos_user_view_count", ["user_id", "view_count", "id"], None),
+    (
+        "ix_videos_user_category_created_at",
+        ["user_id", "category", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_videos_user_favourite_created_at",
+        ["user_id", "created_at", "id"],
+        "is_favourite",
+    ),
+    (
+        "ix_videos_user_never_viewed_created_at",
+        ["user_id", "created_at", "id"],
+        "view_count = 0",
+    ),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction, and avoids locking out
+    # writes to videos while the indexes build
+    with op.get_context().autocommit_block():
+        for name, columns, where in LIST_INDEXES:
+            op.create_index(
+                name,
+                "videos",
+                [sa.text(column) for column in columns],
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(LIST_INDEXES):
+            op.drop_index(
+                name,
+                table_name="videos",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,42 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "r7s8t9u0v1w2"
+down_revision: Union[str, Sequence[str], None] = "q6r7s8t9u0v1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # random() is volatile, so existing rows each get their own key
+    op.add_column(
+        "videos",
+        sa.Column(
+            "random_key",
+            sa.Double(),
+            server_default=sa.text("random()"),
+            nullable=False,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_videos_user_random_key",
+            "videos",
+            ["user_id", "random_key", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_videos_user_random_key",
+            table_name="videos",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("videos", "random_key")
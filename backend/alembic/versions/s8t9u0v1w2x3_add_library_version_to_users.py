@@ -0,0 +1,23 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "s8t9u0v1w2x3"
+down_revision: Union[str, Sequence[str], None] = "r7s8t9u0v1w2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "library_version", sa.BigInteger(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "library_version")
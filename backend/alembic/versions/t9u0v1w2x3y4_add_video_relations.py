@@ -0,0 +1,39 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "t9u0v1w2x3y4"
+down_revision: Union[str, Sequence[str], None] = "s8t9u0v1w2x3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by `python -m app.services.related` for existing libraries
+    op.create_table(
+        "video_relations",
+        sa.Column("video_id", sa.UUID(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("related_video_id", sa.UUID(), nullable=False),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["video_id"], ["videos.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["related_video_id"], ["videos.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("video_id", "rank"),
+    )
+    op.create_index(
+        op.f("ix_video_relations_related_video_id"),
+        "video_relations",
+        ["related_video_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_video_relations_related_video_id"), table_name="video_relations"
+    )
+    op.drop_table("video_relations")
@@ -0,0 +1,19 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "u0v1w2x3y4z5"
+down_revision: Union[str, Sequence[str], None] = "t9u0v1w2x3y4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Filled by `python -m app.services.embeddings` for existing videos
+    op.add_column("videos", sa.Column("embedding", sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("videos", "embedding")
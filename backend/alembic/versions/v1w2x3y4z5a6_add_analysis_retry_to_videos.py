@@ -0,0 +1,33 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "v1w2x3y4z5a6"
+down_revision: Union[str, Sequence[str], None] = "u0v1w2x3y4z5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Videos degraded before this have no stored input; the upgrade sweep
+    # re-runs their whole ingest instead, which stores it
+    op.add_column(
+        "videos",
+        sa.Column(
+            "analysis_input", postgresql.JSONB(astext_type=sa.Text()), nullable=True
+        ),
+    )
+    op.add_column(
+        "videos",
+        sa.Column(
+            "analysis_attempts", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("videos", "analysis_attempts")
+    op.drop_column("videos", "analysis_input")
@@ -0,0 +1,23 @@
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "w2x3y4z5a6b7"
+down_revision: Union[str, Sequence[str], None] = "v1w2x3y4z5a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column(
+            "embedding_version", sa.BigInteger(), server_default="0", nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "embedding_version")
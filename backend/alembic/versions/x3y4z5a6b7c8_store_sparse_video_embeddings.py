@@ -0,0 +1,21 @@
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "x3y4z5a6b7c8"
+down_revision: Union[str, Sequence[str], None] = "w2x3y4z5a6b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Dense 512-bucket vectors can't be read as the new sparse format;
+    # re-embed with `python -m app.services.embeddings`
+    op.execute("UPDATE videos SET embedding = NULL WHERE embedding IS NOT NULL")
+    op.execute("UPDATE users SET embedding_version = embedding_version + 1")
+
+
+def downgrade() -> None:
+    op.execute("UPDATE videos SET embedding = NULL WHERE embedding IS NOT NULL")
+    op.execute("UPDATE users SET embedding_version = embedding_version + 1")
@@ -20,6 +20,80 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str = ""
 
+    # Summarizer model routing
+    summarizer_model: str = "gpt-5.2"
+    summarizer_fast_model: str = "gpt-5-mini"
+    summarizer_medium_transcript_chars: int = 20_000
+    summarizer_long_transcript_chars: int = 80_000
+    summarizer_latency_budget_seconds: float = 180.0
+    summarizer_cost_budget_usd: float = 0.25
+
+    # Transcripts — "native" uses the caption track's own language,
+    # "translate" asks YouTube to translate non-English tracks to English.
+    transcript_mode: str = "native"
+    transcript_preferred_languages: list[str] = ["vi", "en"]
+
+    # Whisper fallback — downloaded audio and chunk transcripts are kept in
+    # an LRU-evicted on-disk cache so retries don't start from scratch.
+    audio_cache_dir: str = ".cache/audio"
+    audio_cache_max_mb: int = 2048
+
+    # Long videos with chapters are analysed per chapter, concurrently
+    chapter_analysis_min_chars: int = 20_000
+    chapter_analysis_max_chapters: int = 8
+
+    # Analysis memoization
+    analysis_cache_enabled: bool = True
+    analysis_cache_memory_entries: int = 256
+
+    # Pre-flight guard, checked right after the metadata fetch. Users can
+    # tighten (never loosen) the limits via the same keys in their
+    # preferences. over_limit_action is "reject" or "low_priority".
+    max_video_duration_seconds: int = 10_800
+    max_estimated_cost_usd: float = 1.50
+    over_limit_action: str = "reject"
+    low_priority_concurrency: int = 1
+    whisper_usd_per_minute: float = 0.006
+
+    # Ingest pipeline
+    max_concurrent_analyses: int = 4
+    analysis_upgrade_interval_minutes: int = 30
+    analysis_upgrade_batch_size: int = 5
+    # A degraded video stays degraded after this many failed retries
+    analysis_upgrade_max_attempts: int = 5
+
+    # Detail-page views are buffered in memory and written this often
+    # (app.services.view_tracker), so view counts lag by at most this much
+    view_flush_interval_seconds: int = 10
+
+    # Related videos precomputed per video (app.services.related); also the
+    # largest limit the related endpoint accepts
+    related_videos_top_k: int = 20
+
+    # Semantic search and related videos (app.services.embeddings): cosine
+    # similarity below this is treated as no match
+    semantic_min_similarity: float = 0.02
+
+    # Fuzzy (trigram) title/channel search: minimum word_similarity for a
+    # match. pg_trgm's own default of 0.6 misses most single-letter typos.
+    fuzzy_search_threshold: float = 0.3
+
+    # Hybrid search: full-text and semantic candidates fused per query
+    # (app.services.search); bounds the work regardless of library size
+    hybrid_search_candidates: int = 100
+
+    # Offline stand-ins for YouTube/Whisper/OpenAI (load testing only).
+    # Latencies are means (each call is jittered ±50%); sizes are characters.
+    use_fake_providers: bool = False
+    fake_metadata_latency_seconds: float = 0.3
+    fake_transcript_latency_seconds: float = 0.5
+    fake_whisper_latency_seconds: float = 20.0
+    fake_analysis_latency_seconds: float = 15.0
+    fake_error_rate: float = 0.0
+    fake_caption_rate: float = 0.9
+    fake_transcript_chars: int = 20_000
+    fake_analysis_chars: int = 4_000
+
     # Email (Gmail SMTP)
     email_address: str = ""
     email_password: str = ""
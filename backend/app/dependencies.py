@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.models import User
 from app.services.auth import decode_access_token
+from app.services.library import etag_matches, library_etag
 
 security = HTTPBearer()
 
@@ -39,3 +40,25 @@ async def get_current_user(
             detail="User not found",
         )
     return user
+
+
+async def check_library_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+) -> None:
+    """Answer 304 if the client's copy of a library read is still current.
+
+    Otherwise the response is tagged with the library ETag. Must only guard
+    reads whose result depends on nothing but the user's library and the
+    request URL.
+    """
+    etag = library_etag(current_user)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Authorization",
+    }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
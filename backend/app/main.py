@@ -11,6 +11,7 @@ from app.routers.stats import router as stats_router
 from app.routers.tags import router as tags_router
 from app.routers.videos import router as videos_router
 from app.scheduler import start_scheduler, stop_scheduler
+from app.services.view_tracker import view_tracker
 
 
 @asynccontextmanager
@@ -22,6 +23,7 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown
     stop_scheduler()
+    await view_tracker.flush()
 
 
 app = FastAPI(
@@ -1,18 +1,25 @@
+import random
 import uuid
 from datetime import datetime
 
 from sqlalchemy import (
     ARRAY,
+    BigInteger,
     Column,
+    Computed,
+    Double,
     ForeignKey,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Table,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -29,6 +36,15 @@ class User(Base):
     )
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    # Bumped by every library write; feeds ETags (app.services.library)
+    library_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0"
+    )
+    # Bumped only when a video's embedding is written or a video is deleted;
+    # keys the cached semantic index (app.services.embeddings)
+    embedding_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0"
+    )
 
 
 class RefreshToken(Base):
@@ -85,12 +101,93 @@ collection_videos = Table(
 )
 
 
+# Weighted full-text document for library search. immutable_unaccent and
+# immutable_array_to_string are SQL wrappers created by the migration, since
+# generated columns only accept IMMUTABLE functions.
+VIDEO_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple'::regconfig, "
+    "immutable_unaccent(coalesce(title, ''))), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, immutable_unaccent("
+    "coalesce(channel_name, '') || ' ' || "
+    "coalesce(immutable_array_to_string(keywords::text[], ' '), ''))), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "immutable_unaccent(coalesce(key_knowledge, ''))), 'C') || "
+    "setweight(to_tsvector('simple'::regconfig, "
+    "immutable_unaccent(coalesce(explanation, ''))), 'D')"
+)
+
+
 class Video(Base):
     """ORM model for the videos table."""
 
     __tablename__ = "videos"
     __table_args__ = (
         UniqueConstraint("user_id", "youtube_id", name="uq_video_user_youtube_id"),
+        Index("ix_videos_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_videos_keywords", "keywords", postgresql_using="gin"),
+        # Trigram indexes for fuzzy search; the expressions must match
+        # app.services.search.FUZZY_COLUMNS exactly to be used.
+        Index(
+            "ix_videos_title_trgm",
+            text("immutable_unaccent(lower(title)) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_videos_channel_name_trgm",
+            text("immutable_unaccent(lower(channel_name)) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+        # Per-user indexes for the list_videos filters and keyset orderings
+        # (app.services.pagination): each ends in id, nullable columns are
+        # NULLS LAST. Non-null columns serve both directions via a backward
+        # scan; nullable ones only the direction the browse page uses.
+        Index("ix_videos_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_videos_user_title", "user_id", "title", "id"),
+        Index(
+            "ix_videos_user_title_desc",
+            "user_id",
+            text("title DESC NULLS LAST"),
+            text("id DESC"),
+        ),
+        Index("ix_videos_user_channel_name", "user_id", "channel_name", "id"),
+        Index(
+            "ix_videos_user_duration_desc",
+            "user_id",
+            text("duration DESC NULLS LAST"),
+            text("id DESC"),
+        ),
+        # Also serves the stale/recent review filters, which are ranges on
+        # last_viewed_at relative to now() and so can't be partial indexes
+        Index(
+            "ix_videos_user_last_viewed_at",
+            "user_id",
+            text("last_viewed_at DESC NULLS LAST"),
+            text("id DESC"),
+        ),
+        Index("ix_videos_user_view_count", "user_id", "view_count", "id"),
+        # Seeded shuffle order (app.services.shuffle)
+        Index("ix_videos_user_random_key", "user_id", "random_key", "id"),
+        Index(
+            "ix_videos_user_category_created_at",
+            "user_id",
+            "category",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_videos_user_favourite_created_at",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("is_favourite"),
+        ),
+        Index(
+            "ix_videos_user_never_viewed_created_at",
+            "user_id",
+            "created_at",
+            "id",
+            postgresql_where=text("view_count = 0"),
+        ),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -107,6 +204,8 @@ class Video(Base):
     thumbnail_url: Mapped[str | None] = mapped_column(String(500))
     channel_name: Mapped[str | None] = mapped_column(String(255))
     duration: Mapped[int | None] = mapped_column(Integer)
+    # [{"title", "start_time", "end_time"}] from yt-dlp, times in seconds
+    chapters: Mapped[list[dict] | None] = mapped_column(JSONB)
 
     # Knowledge analysis fields
     explanation: Mapped[str | None] = mapped_column(Text)
@@ -115,12 +214,31 @@ class Video(Base):
     real_world_applications: Mapped[str | None] = mapped_column(Text)
     keywords: Mapped[list[str] | None] = mapped_column(ARRAY(String))
     category: Mapped[str | None] = mapped_column(String(50))
+    # Plain-text preview for list views (app.services.excerpt)
+    excerpt: Mapped[str | None] = mapped_column(String(280))
 
     # User content
     notes: Mapped[str | None] = mapped_column(Text)
 
+    # Search (generated by Postgres; never loaded with the row)
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed(VIDEO_SEARCH_VECTOR_SQL, persisted=True), deferred=True
+    )
+
     # Metadata
-    transcript_source: Mapped[str | None] = mapped_column(String(20))
+    transcript_source: Mapped[str | None] = mapped_column(String(40))
+    analysis_status: Mapped[str] = mapped_column(
+        String(20), default="complete", server_default="complete"
+    )
+    # LLM input kept while the analysis is degraded, so the upgrade sweep can
+    # retry without fetching the transcript again: {"transcript": str} or
+    # {"chapters": [{"title", "start_time", "end_time", "text"}]}. Never
+    # loaded with the row.
+    analysis_input: Mapped[dict | None] = mapped_column(JSONB, deferred=True)
+    # Upgrade sweep retries of a degraded analysis
+    analysis_attempts: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0"
+    )
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         server_default=func.now(), onupdate=func.now()
@@ -133,10 +251,43 @@ class Video(Base):
     # Favourite
     is_favourite: Mapped[bool] = mapped_column(default=False, server_default="false")
 
+    # float32 text embedding (app.services.embeddings); never loaded with the row
+    embedding: Mapped[bytes | None] = mapped_column(LargeBinary, deferred=True)
+
+    # Position in the shuffle order, uniform in [0, 1) (app.services.shuffle)
+    random_key: Mapped[float] = mapped_column(
+        Double, default=random.random, server_default=text("random()")
+    )
+
     def __repr__(self) -> str:
         return f"<Video {self.youtube_id}: {self.title}>"
 
 
+class VideoRelation(Base):
+    """One of a video's top-k related videos (app.services.related)."""
+
+    __tablename__ = "video_relations"
+
+    video_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("videos.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    # 1-based position in the video's list, best match first
+    rank: Mapped[int] = mapped_column(Integer, primary_key=True)
+    related_video_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("videos.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    # Number of shared keywords
+    score: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<VideoRelation {self.video_id} #{self.rank} {self.related_video_id}>"
+
+
 class VideoJob(Base):
     __tablename__ = "video_jobs"
 
@@ -155,6 +306,10 @@ class VideoJob(Base):
     total_steps: Mapped[int] = mapped_column(Integer, nullable=False)
     step_label: Mapped[str] = mapped_column(String(120), nullable=False)
     error_message: Mapped[str | None] = mapped_column(Text)
+    # Pipeline measurements and decisions (model route, timings, ...)
+    details: Mapped[dict] = mapped_column(
+        JSONB, nullable=False, default=dict, server_default="{}"
+    )
     video_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("videos.id", ondelete="SET NULL")
     )
@@ -167,6 +322,23 @@ class VideoJob(Base):
         return f"<VideoJob {self.id} {self.status} {self.youtube_id}>"
 
 
+class AnalysisCacheEntry(Base):
+    """Memoized knowledge analysis, keyed by a hash of its inputs."""
+
+    __tablename__ = "analysis_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    result: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    model: Mapped[str] = mapped_column(String(50), nullable=False)
+    prompt_version: Mapped[str] = mapped_column(String(50), nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(server_default=func.now())
+    last_hit_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<AnalysisCacheEntry {self.key[:12]} {self.model}>"
+
+
 class Category(Base):
     __tablename__ = "categories"
     __table_args__ = (
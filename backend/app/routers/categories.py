@@ -5,9 +5,10 @@ from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import check_library_etag, get_current_user
 from app.models import Category, User, Video
 from app.schemas import CategoryCreate, CategoryResponse, CategoryUpdate
+from app.services.library import bump_library_version
 
 
 router = APIRouter(prefix="/api/categories", tags=["categories"])
@@ -39,7 +40,11 @@ def _normalize_slug(value: str) -> str:
     return value.strip().lower()
 
 
-@router.get("", response_model=list[CategoryResponse])
+@router.get(
+    "",
+    response_model=list[CategoryResponse],
+    dependencies=[Depends(check_library_etag)],
+)
 async def list_categories(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -99,6 +104,7 @@ async def create_category(
         display_order=next_order,
     )
     db.add(category)
+    await bump_library_version(db, current_user.id)
     await db.flush()
     await db.refresh(category)
     return category
@@ -141,6 +147,7 @@ async def delete_category(
         video.category = None
 
     await db.delete(category)
+    await bump_library_version(db, current_user.id)
 
 
 @router.patch("/{slug}", response_model=CategoryResponse)
@@ -184,6 +191,7 @@ async def update_category(
     if body.display_order is not None:
         category.display_order = body.display_order
 
+    await bump_library_version(db, current_user.id)
     await db.flush()
     await db.refresh(category)
     return category
@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import check_library_etag, get_current_user
 from app.models import Collection, User, Video, collection_videos
 from app.schemas import (
     AddVideoToCollectionRequest,
@@ -13,6 +13,7 @@ from app.schemas import (
     CollectionResponse,
     CollectionDetailResponse,
 )
+from app.services.library import bump_library_version
 
 router = APIRouter(prefix="/api/collections", tags=["collections"])
 
@@ -29,6 +30,7 @@ async def create_collection(
         description=body.description,
     )
     db.add(collection)
+    await bump_library_version(db, current_user.id)
     await db.commit()
     await db.refresh(collection)
     return CollectionResponse(
@@ -41,7 +43,11 @@ async def create_collection(
     )
 
 
-@router.get("", response_model=list[CollectionResponse])
+@router.get(
+    "",
+    response_model=list[CollectionResponse],
+    dependencies=[Depends(check_library_etag)],
+)
 async def list_collections(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -114,6 +120,7 @@ async def update_collection(
         collection.name = body.name
     if body.description is not None:
         collection.description = body.description
+    await bump_library_version(db, current_user.id)
     await db.commit()
     await db.refresh(collection)
     count_result = await db.execute(
@@ -147,6 +154,7 @@ async def delete_collection(
     if not collection:
         raise HTTPException(status_code=404, detail="Collection not found")
     await db.delete(collection)
+    await bump_library_version(db, current_user.id)
     await db.commit()
 
 
@@ -181,6 +189,7 @@ async def add_video_to_collection(
 
     if video not in collection.videos:
         collection.videos.append(video)
+        await bump_library_version(db, current_user.id)
         await db.commit()
     return {"ok": True}
 
@@ -216,4 +225,5 @@ async def remove_video_from_collection(
     video = video_result.scalar_one_or_none()
     if video and video in collection.videos:
         collection.videos.remove(video)
+        await bump_library_version(db, current_user.id)
         await db.commit()
@@ -5,15 +5,20 @@ from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import check_library_etag, get_current_user
 from app.models import Collection, User, Video
-from app.schemas import DashboardStats, TagSummaryResponse
+from app.schemas import AnalysisCacheStatsResponse, DashboardStats, TagSummaryResponse
 from app.services.tags import collect_tag_stats
+from app.services.video_jobs import analysis_cache
 
 router = APIRouter(prefix="/api/stats", tags=["stats"])
 
 
-@router.get("/dashboard", response_model=DashboardStats)
+@router.get(
+    "/dashboard",
+    response_model=DashboardStats,
+    dependencies=[Depends(check_library_etag)],
+)
 async def get_dashboard(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -88,3 +93,18 @@ async def get_dashboard(
         top_tags=top_tags,
         recent_additions=recent_additions,
     )
+
+
+@router.get("/analysis-cache", response_model=AnalysisCacheStatsResponse)
+async def get_analysis_cache_stats(
+    current_user: User = Depends(get_current_user),
+):
+    """Hit counters of this worker's analysis cache since startup."""
+    stats = analysis_cache.stats
+    return AnalysisCacheStatsResponse(
+        memory_hits=stats.memory_hits,
+        database_hits=stats.database_hits,
+        misses=stats.misses,
+        hit_rate=stats.hit_rate,
+        memory_entries=analysis_cache.memory_entries,
+    )
@@ -6,7 +6,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import check_library_etag, get_current_user
 from app.models import TagAlias, User, Video
 from app.schemas import (
     TagAliasCreate,
@@ -15,6 +15,8 @@ from app.schemas import (
     TagRenameRequest,
     TagSummaryResponse,
 )
+from app.services.library import bump_library_version
+from app.services.related import update_relations
 from app.services.tags import canonicalize_keywords, collect_tag_stats, normalize_tag
 
 router = APIRouter(prefix="/api/tags", tags=["tags"])
@@ -58,7 +60,11 @@ async def _build_tag_summaries(
     ]
 
 
-@router.get("", response_model=list[TagSummaryResponse])
+@router.get(
+    "",
+    response_model=list[TagSummaryResponse],
+    dependencies=[Depends(check_library_etag)],
+)
 async def list_tags(
     db: AsyncSession = Depends(get_db),
     search: str | None = Query(default=None),
@@ -73,7 +79,11 @@ async def list_tags(
     )
 
 
-@router.get("/aliases", response_model=list[TagAliasResponse])
+@router.get(
+    "/aliases",
+    response_model=list[TagAliasResponse],
+    dependencies=[Depends(check_library_etag)],
+)
 async def list_tag_aliases(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -118,6 +128,7 @@ async def create_tag_alias(
     else:
         row.canonical = canonical
 
+    await bump_library_version(db, current_user.id)
     await db.flush()
     await db.refresh(row)
     await db.commit()
@@ -140,6 +151,7 @@ async def delete_tag_alias(
     row = result.scalar_one_or_none()
     if row:
         await db.delete(row)
+        await bump_library_version(db, current_user.id)
         await db.commit()
 
 
@@ -171,13 +183,17 @@ async def rename_tag(
     )
     videos = videos_result.scalars().all()
 
+    changed_ids = []
     for video in videos:
         if not video.keywords:
             continue
         replaced = [
             target if normalize_tag(tag) == source else tag for tag in video.keywords
         ]
-        video.keywords = await canonicalize_keywords(db, replaced, current_user.id)
+        keywords = await canonicalize_keywords(db, replaced, current_user.id)
+        if keywords != video.keywords:
+            video.keywords = keywords
+            changed_ids.append(video.id)
 
     alias_result = await db.execute(
         select(TagAlias).where(TagAlias.user_id == current_user.id)
@@ -199,6 +215,8 @@ async def rename_tag(
         if row.alias == row.canonical:
             await db.delete(row)
 
+    await bump_library_version(db, current_user.id)
+    await update_relations(db, current_user.id, changed_ids)
     await db.flush()
     await db.commit()
     return await _build_tag_summaries(
@@ -232,6 +250,7 @@ async def merge_tags(
     videos = videos_result.scalars().all()
 
     source_set = set(sources)
+    changed_ids = []
     for video in videos:
         if not video.keywords:
             continue
@@ -239,7 +258,10 @@ async def merge_tags(
             target if normalize_tag(tag) in source_set else tag
             for tag in video.keywords
         ]
-        video.keywords = await canonicalize_keywords(db, replaced, current_user.id)
+        keywords = await canonicalize_keywords(db, replaced, current_user.id)
+        if keywords != video.keywords:
+            video.keywords = keywords
+            changed_ids.append(video.id)
 
     alias_result = await db.execute(
         select(TagAlias).where(TagAlias.user_id == current_user.id)
@@ -260,6 +282,8 @@ async def merge_tags(
         if row.alias == row.canonical:
             await db.delete(row)
 
+    await bump_library_version(db, current_user.id)
+    await update_relations(db, current_user.id, changed_ids)
     await db.flush()
     await db.commit()
     return await _build_tag_summaries(
@@ -288,11 +312,15 @@ async def delete_tag(
     )
     videos = videos_result.scalars().all()
 
+    changed_ids = []
     for video in videos:
         if not video.keywords:
             continue
         remaining = [kw for kw in video.keywords if normalize_tag(kw) != target]
-        video.keywords = await canonicalize_keywords(db, remaining, current_user.id)
+        keywords = await canonicalize_keywords(db, remaining, current_user.id)
+        if keywords != video.keywords:
+            video.keywords = keywords
+            changed_ids.append(video.id)
 
     alias_result = await db.execute(
         select(TagAlias).where(TagAlias.user_id == current_user.id)
@@ -302,6 +330,8 @@ async def delete_tag(
         if row.alias == target or row.canonical == target:
             await db.delete(row)
 
+    await bump_library_version(db, current_user.id)
+    await update_relations(db, current_user.id, changed_ids)
     await db.flush()
     await db.commit()
     return await _build_tag_summaries(
@@ -2,15 +2,18 @@ import asyncio
 import uuid
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import ARRAY, String, and_, cast, func, or_, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import func, literal_column, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
+from app.config import settings
 from app.database import get_db
-from app.dependencies import get_current_user
+from app.dependencies import check_library_etag, get_current_user
 from app.logging_config import get_logger
-from app.models import Category, User, Video, VideoJob
+from app.models import Category, User, Video, VideoJob, VideoRelation
 from app.schemas import (
+    FacetCount,
     PaginatedVideosResponse,
     VideoCreate,
     VideoJobResponse,
@@ -18,7 +21,40 @@ from app.schemas import (
     VideoResponse,
     VideoUpdate,
 )
+from app.services.embeddings import SemanticMatch, embedding_indexes
+from app.services.facets import count_facets, parse_facets
+from app.services.library import bump_library_version
+from app.services.pagination import (
+    TOTAL_MODES,
+    InvalidCursorError,
+    SortKey,
+    cursor_segments,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+)
+from app.services.related import (
+    RELATED_MODES,
+    refresh_relations,
+    relation_referrers,
+)
+from app.services.search import (
+    SEARCH_MODES,
+    build_tsquery,
+    fuzzy_filter,
+    fuzzy_query,
+    fuzzy_rank,
+    hybrid_candidates,
+    hybrid_filter,
+    hybrid_rank,
+    search_filter,
+    search_rank,
+    set_fuzzy_threshold,
+)
+from app.services.shuffle import SHUFFLE_KEYS, shuffle_segments, shuffle_start
+from app.services.tags import canonicalize_keywords, keywords_filter
 from app.services.video_jobs import ACTIVE_JOB_STATUSES, JOB_STEPS, run_video_job
+from app.services.view_tracker import view_tracker
 from app.services.youtube import YouTubeService
 
 logger = get_logger(__name__)
@@ -54,7 +90,9 @@ async def create_video(
         )
     )
     existing_video = existing_video_result.scalar_one_or_none()
-    if existing_video:
+    # A video still showing its local preview gets a fresh job to finish the
+    # full analysis instead of being treated as done.
+    if existing_video and existing_video.analysis_status == "complete":
         completed_job = await _get_or_create_completed_job(
             db=db,
             user_id=current_user.id,
@@ -116,19 +154,53 @@ async def get_video_job(
     return job
 
 
-@router.get("", response_model=PaginatedVideosResponse)
+def _list_columns(*extra: str):
+    """Load only what ``VideoListResponse`` serializes, never the text fields.
+
+    ``extra`` names further columns to load, e.g. a sort key for the cursor.
+    """
+    names = [*VideoListResponse.model_fields, *extra]
+    return load_only(*(getattr(Video, name) for name in names))
+
+
+# Orders that change with every flushed view, which the view tracker
+# doesn't bump the library version for
+VIEW_SORTS = ("last_viewed_at", "view_count")
+
+
+async def _check_list_etag(
+    request: Request,
+    response: Response,
+    sort_by: str = Query(default="created_at"),
+    current_user: User = Depends(get_current_user),
+) -> None:
+    """``check_library_etag``, except for lists ordered by views."""
+    if sort_by not in VIEW_SORTS:
+        await check_library_etag(request, response, current_user)
+
+
+@router.get(
+    "",
+    response_model=PaginatedVideosResponse,
+    dependencies=[Depends(_check_list_etag)],
+)
 async def list_videos(
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
     sort_by: str = Query(default="created_at"),
     sort_order: str = Query(default="desc"),
+    seed: str | None = Query(default=None, max_length=100),
+    cursor: str | None = Query(default=None),
+    total_mode: str = Query(default="exact"),
     search: str | None = Query(default=None),
+    search_mode: str = Query(default="fulltext"),
     tag: str | None = Query(default=None),
     tag_mode: str = Query(default="any"),
     category: str | None = Query(default=None),
     collection_id: str | None = Query(default=None),
     review_status: str | None = Query(default=None),
     is_favourite: bool | None = Query(default=None),
+    facets: str | None = Query(default=None),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -140,38 +212,49 @@ async def list_videos(
         "last_viewed_at",
         "view_count",
     }
-    if sort_by == "random":
-        order_expr = func.random()
-    else:
-        sort_column = getattr(Video, sort_by if sort_by in allowed_sort else "created_at")
-        order_expr = sort_column.desc() if sort_order == "desc" else sort_column.asc()
+    if total_mode not in TOTAL_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"total_mode must be one of: {', '.join(TOTAL_MODES)}",
+        )
+    if search_mode not in SEARCH_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"search_mode must be one of: {', '.join(SEARCH_MODES)}",
+        )
+    try:
+        requested_facets = parse_facets(facets)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    if sort_by == "random" and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Random order is paged by cursor, not offset",
+        )
 
-    query = select(Video).where(Video.user_id == current_user.id)
+    search_condition = None
+    rank = None
+    # Hybrid candidates depend on the other filters; resolved further down
+    hybrid = bool(search and search.strip()) and search_mode == "hybrid"
+    if search and search.strip() and search_mode == "fuzzy":
+        fuzzy = fuzzy_query(search)
+        search_condition = fuzzy_filter(fuzzy)
+        rank = fuzzy_rank(fuzzy)
+        await set_fuzzy_threshold(db)
+    elif search and not hybrid:
+        tsquery = build_tsquery(search)
+        if tsquery is not None:
+            search_condition = search_filter(tsquery)
+            rank = search_rank(tsquery)
 
-    if search:
-        pattern = f"%{search.strip()}%"
-        query = query.where(
-            or_(
-                Video.title.ilike(pattern),
-                Video.channel_name.ilike(pattern),
-                Video.explanation.ilike(pattern),
-                Video.key_knowledge.ilike(pattern),
-                func.array_to_string(Video.keywords, " ").ilike(pattern),
-            )
-        )
+    query = select(Video).where(Video.user_id == current_user.id)
 
     if tag:
-        tags = [token.strip().lower() for token in tag.split(",") if token.strip()]
+        tags = await canonicalize_keywords(db, tag.split(","), current_user.id)
         if tags:
-            keyword_text = func.lower(func.array_to_string(Video.keywords, " "))
-            if tag_mode == "all":
-                query = query.where(
-                    and_(*[keyword_text.contains(item) for item in tags])
-                )
-            else:
-                query = query.where(
-                    or_(*[keyword_text.contains(item) for item in tags])
-                )
+            query = query.where(keywords_filter(tags, match_all=tag_mode == "all"))
 
     if category == "__uncategorized__":
         query = query.where(Video.category.is_(None))
@@ -185,8 +268,11 @@ async def list_videos(
             collection_videos.c.collection_id == collection_id
         )
 
+    # Constants rather than bound parameters, so the planner can match the
+    # partial indexes on view_count = 0 and is_favourite even in a generic
+    # plan for the prepared statement
     if review_status == "never_viewed":
-        query = query.where(Video.view_count == 0)
+        query = query.where(Video.view_count == literal_column("0"))
     elif review_status == "stale":
         stale_threshold = datetime.now() - timedelta(days=14)
         query = query.where(
@@ -197,23 +283,175 @@ async def list_videos(
         query = query.where(Video.last_viewed_at >= recent_threshold)
 
     if is_favourite is not None:
-        query = query.where(Video.is_favourite == is_favourite)
-
-    total_result = await db.execute(
-        select(func.count()).select_from(query.order_by(None).subquery())
-    )
-    total = total_result.scalar() or 0
-
-    result = await db.execute(query.order_by(order_expr).limit(limit).offset(offset))
-    items = [
-        VideoListResponse.model_validate(video) for video in result.scalars().all()
-    ]
+        query = query.where(Video.is_favourite if is_favourite else ~Video.is_favourite)
+
+    if hybrid:
+        index = await embedding_indexes.get(db, current_user)
+        candidates = await hybrid_candidates(db, query, search, index)
+        search_condition = hybrid_filter(candidates)
+        rank = hybrid_rank(candidates)
+
+    if search_condition is not None:
+        query = query.where(search_condition)
+
+    facet_counts = None
+    if requested_facets:
+        counts = await count_facets(db, query, requested_facets)
+        facet_counts = {
+            name: [FacetCount(value=value, count=count) for value, count in pairs]
+            for name, pairs in counts.items()
+        }
+
+    # Random order is a seeded shuffle (app.services.shuffle); its cursor
+    # also carries the start point, so later pages don't need the seed
+    shuffled = sort_by == "random"
+    if shuffled:
+        sort_scope = "random"
+        sort_keys = SHUFFLE_KEYS
+    elif sort_by == "relevance" and rank is not None:
+        sort_scope = "relevance"
+        sort_keys = [
+            SortKey("rank", rank, descending=True),
+            SortKey("created_at", Video.created_at, descending=True),
+            SortKey("id", Video.id, descending=True),
+        ]
+    else:
+        column_name = sort_by if sort_by in allowed_sort else "created_at"
+        descending = sort_order == "desc"
+        sort_scope = f"{column_name}:{'desc' if descending else 'asc'}"
+        sort_keys = [
+            SortKey(
+                column_name,
+                getattr(Video, column_name),
+                descending=descending,
+                nullable=Video.__table__.c[column_name].nullable,
+            ),
+            SortKey("id", Video.id, descending=descending),
+        ]
+
+    loaded_keys = [key.name for key in sort_keys if key.name != "rank"]
+    query = query.options(_list_columns(*loaded_keys))
+
+    position = offset
+    values: list | None = None
+    if cursor:
+        try:
+            values, position = decode_cursor(
+                cursor, sort_scope, len(sort_keys) + int(shuffled)
+            )
+        except InvalidCursorError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+            ) from e
+    if shuffled:
+        if values:
+            start, *values = values
+        else:
+            start = shuffle_start(seed)
+        segments = shuffle_segments(start, values)
+    elif values:
+        segments = cursor_segments(sort_keys, values)
+    else:
+        segments = [None]
+
+    # Extra columns selected next to each Video row, in this order
+    extra_columns = []
+    if sort_keys[0].name == "rank":
+        extra_columns.append(rank.label("sort_rank"))
+    # A page may span two segments (a shuffle wrapping around, or the NULL
+    # rows of a nullable sort column), which one window can't count
+    window_total = total_mode == "exact" and len(segments) == 1
+    if window_total:
+        # Counts every row matching the filters (and cursor), evaluated
+        # before LIMIT/OFFSET, so no second COUNT query is needed
+        extra_columns.append(func.count().over().label("total_count"))
+
+    page_query = query.order_by(*(key.order_by() for key in sort_keys))
+    if extra_columns:
+        page_query = page_query.add_columns(*extra_columns)
+    if not cursor and offset:
+        page_query = page_query.offset(offset)
+
+    # One extra row tells us whether there is a next page
+    rows = []
+    for segment in segments:
+        segment_query = page_query if segment is None else page_query.where(segment)
+        result = await db.execute(segment_query.limit(limit + 1 - len(rows)))
+        if extra_columns:
+            rows += [tuple(row) for row in result.all()]
+        else:
+            rows += [(video,) for video in result.scalars().all()]
+        if len(rows) > limit:
+            break
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    seen = position + len(rows)
+
+    total = None
+    if total_mode == "exact":
+        if rows and window_total:
+            # After a cursor the window only sees the remaining rows
+            total = rows[0][-1] + (position if cursor else 0)
+        elif not rows and (cursor or offset == 0):
+            total = position
+        else:
+            # Several segments, or paged past the end with no row to report on
+            total_result = await db.execute(
+                select(func.count()).select_from(query.order_by(None).subquery())
+            )
+            total = total_result.scalar() or 0
+    elif total_mode == "estimated":
+        if not has_more and (rows or position == 0):
+            total = seen
+        else:
+            estimate = await estimate_count(db, query)
+            total = max(estimate or 0, seen + int(has_more))
+
+    next_cursor = None
+    if has_more:
+        video, *extra = rows[-1]
+        last_values = [
+            extra[0] if key.name == "rank" else getattr(video, key.name)
+            for key in sort_keys
+        ]
+        if shuffled:
+            last_values.insert(0, start)
+        next_cursor = encode_cursor(sort_scope, last_values, seen)
+
+    items = [VideoListResponse.model_validate(row[0]) for row in rows]
     return PaginatedVideosResponse(
         items=items,
         total=total,
         limit=limit,
         offset=offset,
+        has_more=has_more,
+        next_cursor=next_cursor,
+        facets=facet_counts,
+    )
+
+
+@router.get("/semantic-search", response_model=list[VideoListResponse])
+async def semantic_search(
+    q: str = Query(min_length=1, max_length=500),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    index = await embedding_indexes.get(db, current_user)
+    return await _load_matches(db, index.query_text(q, limit))
+
+
+async def _load_matches(db: AsyncSession, matches: list[SemanticMatch]):
+    """List rows of ``matches``, in match order."""
+    if not matches:
+        return []
+    result = await db.execute(
+        select(Video)
+        .options(_list_columns())
+        .where(Video.id.in_([match.video_id for match in matches]))
     )
+    by_id = {video.id: video for video in result.scalars().all()}
+    return [by_id[match.video_id] for match in matches if match.video_id in by_id]
 
 
 @router.get("/{video_id}", response_model=VideoResponse)
@@ -227,46 +465,50 @@ async def get_video(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Video not found"
         )
-    video.view_count = (video.view_count or 0) + 1
-    video.last_viewed_at = datetime.now()
-    await db.commit()
-    await db.refresh(video)
-    return video
+    # Written in batches by the view tracker; show this view straight away
+    view_tracker.record(video.id)
+    pending = view_tracker.pending(video.id)
+    return VideoResponse.model_validate(video).model_copy(
+        update={
+            "view_count": (video.view_count or 0) + pending.count,
+            "last_viewed_at": pending.last_viewed_at,
+        }
+    )
 
 
 @router.get("/{video_id}/related", response_model=list[VideoListResponse])
 async def get_related_videos(
-    video_id: str,
-    limit: int = Query(default=5, ge=1, le=20),
+    video_id: uuid.UUID,
+    limit: int = Query(default=5, ge=1, le=settings.related_videos_top_k),
+    mode: str = Query(default="keywords"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(
-        select(Video).where(Video.id == video_id, Video.user_id == current_user.id)
-    )
-    video = result.scalar_one_or_none()
-    if not video:
-        raise HTTPException(status_code=404, detail="Video not found")
-
-    if not video.keywords:
-        return []
-
-    all_result = await db.execute(
-        select(Video).where(
-            Video.id != video_id,
-            Video.user_id == current_user.id,
-            Video.keywords.bool_op("&&")(cast(video.keywords, ARRAY(String))),
+    if mode not in RELATED_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"mode must be one of: {', '.join(RELATED_MODES)}",
+        )
+    video = await db.get(Video, video_id)
+    if not video or video.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Video not found"
         )
-    )
-    candidates = list(all_result.scalars().all())
 
-    def overlap_count(v: Video) -> int:
-        left_keywords = v.keywords if v.keywords is not None else []
-        right_keywords = video.keywords if video.keywords is not None else []
-        return len(set(left_keywords) & set(right_keywords))
+    if mode == "semantic":
+        index = await embedding_indexes.get(db, current_user)
+        return await _load_matches(db, index.similar_to(video_id, limit))
 
-    candidates = sorted(candidates, key=overlap_count, reverse=True)
-    return candidates[:limit]
+    # Precomputed by app.services.related; a range scan of its primary key
+    result = await db.execute(
+        select(Video)
+        .options(_list_columns())
+        .join(VideoRelation, VideoRelation.related_video_id == Video.id)
+        .where(VideoRelation.video_id == video_id)
+        .order_by(VideoRelation.rank)
+        .limit(limit)
+    )
+    return result.scalars().all()
 
 
 @router.patch("/{video_id}", response_model=VideoResponse)
@@ -307,6 +549,7 @@ async def update_video(
                 )
             video.category = normalized_category
 
+    await bump_library_version(db, current_user.id)
     await db.flush()
     await db.refresh(video)
 
@@ -326,7 +569,12 @@ async def delete_video(
             status_code=status.HTTP_404_NOT_FOUND, detail="Video not found"
         )
 
+    # Lists that included the video lose that row with it; refill them
+    referrers = await relation_referrers(db, [video_id])
     await db.delete(video)
+    await bump_library_version(db, current_user.id, embeddings=True)
+    await db.flush()
+    await refresh_relations(db, referrers)
     logger.info("Video deleted: %s", video_id)
 
 
@@ -4,6 +4,7 @@ import random
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy import select
 
 from app.config import settings
@@ -11,6 +12,8 @@ from app.database import async_session
 from app.logging_config import get_logger
 from app.models import Video
 from app.services.email_service import EmailService
+from app.services.video_jobs import requeue_degraded_analyses
+from app.services.view_tracker import view_tracker
 
 logger = get_logger(__name__)
 
@@ -44,6 +47,24 @@ async def _send_daily_review() -> None:
         logger.error("Daily review job failed: %s", exc)
 
 
+async def _upgrade_degraded_analyses() -> None:
+    """Retry the LLM analysis for videos saved with the extractive fallback."""
+    try:
+        count = await requeue_degraded_analyses(settings.analysis_upgrade_batch_size)
+        if count:
+            logger.info("Retried %d degraded analysis(es)", count)
+    except Exception as exc:
+        logger.error("Degraded analysis upgrade failed: %s", exc)
+
+
+async def _flush_views() -> None:
+    """Write the buffered video views."""
+    try:
+        await view_tracker.flush()
+    except Exception as exc:
+        logger.error("View count flush failed: %s", exc)
+
+
 def start_scheduler() -> None:
     """Create and start the APScheduler with the daily review cron job."""
     global _scheduler
@@ -56,6 +77,22 @@ def start_scheduler() -> None:
         name="Daily Knowledge Review Digest",
         replace_existing=True,
     )
+    _scheduler.add_job(
+        _upgrade_degraded_analyses,
+        trigger=IntervalTrigger(minutes=settings.analysis_upgrade_interval_minutes),
+        id="upgrade_degraded_analyses",
+        name="Upgrade Degraded Analyses",
+        replace_existing=True,
+        max_instances=1,
+    )
+    _scheduler.add_job(
+        _flush_views,
+        trigger=IntervalTrigger(seconds=settings.view_flush_interval_seconds),
+        id="flush_views",
+        name="Flush Video Views",
+        replace_existing=True,
+        max_instances=1,
+    )
     _scheduler.start()
 
     logger.info(
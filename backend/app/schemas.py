@@ -18,6 +18,12 @@ class VideoUpdate(BaseModel):
     is_favourite: bool | None = None
 
 
+class ChapterResponse(BaseModel):
+    title: str
+    start_time: float
+    end_time: float
+
+
 class VideoResponse(BaseModel):
     """Full video response with all fields."""
 
@@ -30,6 +36,8 @@ class VideoResponse(BaseModel):
     thumbnail_url: str | None = None
     channel_name: str | None = None
     duration: int | None = None
+    chapters: list[ChapterResponse] | None = None
+    excerpt: str | None = None
     explanation: str | None = None
     key_knowledge: str | None = None
     critical_analysis: str | None = None
@@ -38,6 +46,7 @@ class VideoResponse(BaseModel):
     category: str | None = None
     notes: str | None = None
     transcript_source: str | None = None
+    analysis_status: str = "complete"
     is_favourite: bool = False
     created_at: datetime
     updated_at: datetime
@@ -46,7 +55,11 @@ class VideoResponse(BaseModel):
 
 
 class VideoListResponse(BaseModel):
-    """Summary response for list view (excludes heavy text fields)."""
+    """Summary response for list view (excludes heavy text fields).
+
+    List endpoints load only these columns, so every field here must be a
+    ``Video`` column.
+    """
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -57,11 +70,11 @@ class VideoListResponse(BaseModel):
     thumbnail_url: str | None = None
     channel_name: str | None = None
     duration: int | None = None
-    explanation: str | None = None
-    key_knowledge: str | None = None
+    excerpt: str | None = None
     keywords: list[str] | None = None
     category: str | None = None
     transcript_source: str | None = None
+    analysis_status: str = "complete"
     is_favourite: bool = False
     created_at: datetime
     updated_at: datetime
@@ -69,11 +82,25 @@ class VideoListResponse(BaseModel):
     view_count: int = 0
 
 
+class FacetCount(BaseModel):
+    # Category slug, tag, collection id or "true"/"false" for favourite;
+    # None counts the uncategorized videos
+    value: str | None
+    count: int
+
+
 class PaginatedVideosResponse(BaseModel):
     items: list[VideoListResponse]
-    total: int
+    # Exact, a planner estimate, or None, depending on ?total_mode=
+    total: int | None
     limit: int
     offset: int
+    has_more: bool = False
+    # Opaque token for the page after this one (None on the last page);
+    # pass it back as ?cursor= instead of an offset.
+    next_cursor: str | None = None
+    # Counts over the whole filtered set, for the facets named in ?facets=
+    facets: dict[str, list[FacetCount]] | None = None
 
 
 class VideoJobResponse(BaseModel):
@@ -87,6 +114,7 @@ class VideoJobResponse(BaseModel):
     total_steps: int
     step_label: str
     error_message: str | None = None
+    details: dict | None = None
     video_id: uuid.UUID | None = None
     created_at: datetime
     updated_at: datetime
@@ -186,6 +214,14 @@ class DashboardStats(BaseModel):
     recent_additions: int
 
 
+class AnalysisCacheStatsResponse(BaseModel):
+    memory_hits: int
+    database_hits: int
+    misses: int
+    hit_rate: float
+    memory_entries: int
+
+
 class RegisterRequest(BaseModel):
     username: str = Field(min_length=3, max_length=50)
     password: str = Field(min_length=8, max_length=128)
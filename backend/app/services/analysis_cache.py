@@ -0,0 +1,157 @@
+"""Content-addressed cache of LLM knowledge analyses.
+
+Entries are keyed by a hash of everything that determines the model output
+(transcript, title, category slugs, model, prompt version) and live in
+Postgres, with a small in-process LRU in front so repeated lookups within
+one worker skip the database too.
+"""
+
+import hashlib
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.logging_config import get_logger
+from app.models import AnalysisCacheEntry
+from app.services.summarizer import KnowledgeResult
+
+logger = get_logger(__name__)
+
+
+def analysis_cache_key(
+    transcript: str,
+    title: str,
+    category_slugs: list[str],
+    model: str,
+    prompt_version: str,
+) -> str:
+    """Return the SHA-256 hex digest identifying one analysis request."""
+    digest = hashlib.sha256()
+    for part in (prompt_version, model, title, ",".join(sorted(category_slugs))):
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    digest.update(transcript.encode())
+    return digest.hexdigest()
+
+
+def _to_payload(result: KnowledgeResult) -> dict[str, Any]:
+    payload = asdict(result)
+    # Token usage describes the original call, not a cache hit.
+    payload.pop("usage", None)
+    return payload
+
+
+def _from_payload(payload: dict[str, Any]) -> KnowledgeResult:
+    return KnowledgeResult(
+        explanation=payload["explanation"],
+        key_knowledge=payload["key_knowledge"],
+        critical_analysis=payload["critical_analysis"],
+        real_world_applications=payload["real_world_applications"],
+        keywords=list(payload["keywords"]),
+        category=payload["category"],
+    )
+
+
+@dataclass
+class AnalysisCacheStats:
+    memory_hits: int = 0
+    database_hits: int = 0
+    misses: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.memory_hits + self.database_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        if not self.lookups:
+            return 0.0
+        return round((self.memory_hits + self.database_hits) / self.lookups, 4)
+
+
+class AnalysisCache:
+    """Two-level (LRU + Postgres) cache of ``KnowledgeResult`` objects."""
+
+    def __init__(self, max_memory_entries: int = 256) -> None:
+        self.max_memory_entries = max_memory_entries
+        self.stats = AnalysisCacheStats()
+        self._memory: OrderedDict[str, KnowledgeResult] = OrderedDict()
+
+    def _remember(self, key: str, result: KnowledgeResult) -> None:
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    async def get(
+        self, db: AsyncSession, key: str
+    ) -> tuple[KnowledgeResult, str] | None:
+        """Look up ``key``.
+
+        Returns:
+            ``(result, source)`` where source is ``"memory"`` or
+            ``"database"``, or ``None`` on a miss.
+        """
+        result = self._memory.get(key)
+        source = "memory"
+        if result is not None:
+            self._memory.move_to_end(key)
+            self.stats.memory_hits += 1
+        else:
+            entry = await db.get(AnalysisCacheEntry, key)
+            if entry is None:
+                self.stats.misses += 1
+                logger.info("Analysis cache miss (hit rate %.1f%%)", self.hit_rate_pct)
+                return None
+            result = _from_payload(entry.result)
+            source = "database"
+            self.stats.database_hits += 1
+            self._remember(key, result)
+
+        await db.execute(
+            update(AnalysisCacheEntry)
+            .where(AnalysisCacheEntry.key == key)
+            .values(
+                hit_count=AnalysisCacheEntry.hit_count + 1,
+                last_hit_at=datetime.now(),
+            )
+        )
+        logger.info(
+            "Analysis cache %s hit (hit rate %.1f%%)", source, self.hit_rate_pct
+        )
+        return result, source
+
+    async def put(
+        self,
+        db: AsyncSession,
+        key: str,
+        result: KnowledgeResult,
+        *,
+        model: str,
+        prompt_version: str,
+    ) -> None:
+        """Store ``result`` under ``key``; concurrent writers keep the first."""
+        await db.execute(
+            insert(AnalysisCacheEntry)
+            .values(
+                key=key,
+                result=_to_payload(result),
+                model=model,
+                prompt_version=prompt_version,
+            )
+            .on_conflict_do_nothing(index_elements=["key"])
+        )
+        self._remember(key, result)
+
+    @property
+    def memory_entries(self) -> int:
+        return len(self._memory)
+
+    @property
+    def hit_rate_pct(self) -> float:
+        return self.stats.hit_rate * 100
@@ -0,0 +1,123 @@
+"""Size-bounded on-disk cache of downloaded audio and Whisper chunk texts.
+
+Each entry is a directory named after the YouTube id and the audio profile
+(codec/bitrate) it was downloaded with::
+
+    <root>/<youtube_id>-<profile>/
+        audio.mp3
+        chunks-<n>/chunk_<i>.mp3
+        chunks-<n>/chunk_<i>.txt
+
+Files are written to a temporary name and renamed into place, so a crash
+or a failed chunk never leaves a half-written file that later looks valid.
+An entry's directory mtime records when it was last used; when the cache
+grows past its size limit the least recently used entries are deleted.
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from app.logging_config import get_logger
+
+_AUDIO_FILENAME = "audio.mp3"
+
+
+def _tree_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
+
+
+class AudioCacheEntry:
+    """Cached files for one (youtube_id, profile) pair."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    @property
+    def audio_path(self) -> Path | None:
+        """The downloaded audio, or ``None`` if it has not been stored yet."""
+        path = self.path / _AUDIO_FILENAME
+        return path if path.is_file() else None
+
+    def store_audio(self, source: Path) -> Path:
+        """Move a freshly downloaded file into the entry."""
+        target = self.path / _AUDIO_FILENAME
+        os.replace(source, target)
+        return target
+
+    def chunk_dir(self, num_chunks: int) -> Path:
+        """Directory holding the chunks of an ``num_chunks``-way split."""
+        path = self.path / f"chunks-{num_chunks}"
+        path.mkdir(exist_ok=True)
+        return path
+
+    def chunk_text(self, num_chunks: int, index: int) -> str | None:
+        """Previously transcribed text of one chunk, if any."""
+        path = self.chunk_dir(num_chunks) / f"chunk_{index}.txt"
+        return path.read_text(encoding="utf-8") if path.is_file() else None
+
+    def store_chunk_text(self, num_chunks: int, index: int, text: str) -> None:
+        path = self.chunk_dir(num_chunks) / f"chunk_{index}.txt"
+        partial = path.with_suffix(".txt.part")
+        partial.write_text(text, encoding="utf-8")
+        os.replace(partial, path)
+
+
+class AudioCache:
+    """LRU-evicted directory of ``AudioCacheEntry`` objects."""
+
+    def __init__(self, root: str | Path, max_bytes: int) -> None:
+        self.logger = get_logger(__name__)
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+
+    def entry(self, youtube_id: str, profile: str) -> AudioCacheEntry:
+        """Return (creating if needed) the entry and mark it as recently used."""
+        path = self.root / f"{youtube_id}-{profile}"
+        path.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        os.utime(path, (now, now))
+        return AudioCacheEntry(path)
+
+    def scratch_dir(self) -> tempfile.TemporaryDirectory:
+        """Temporary directory on the cache's filesystem (for atomic renames)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        return tempfile.TemporaryDirectory(dir=self.root, prefix=".download-")
+
+    def evict(self, keep: AudioCacheEntry | None = None) -> int:
+        """Delete least recently used entries until the cache fits its limit.
+
+        Args:
+            keep: Entry that is in use and must survive eviction.
+
+        Returns:
+            Number of entries removed.
+        """
+        if not self.root.is_dir():
+            return 0
+
+        entries = [
+            (path.stat().st_mtime, path, _tree_size(path))
+            for path in self.root.iterdir()
+            if path.is_dir() and not path.name.startswith(".")
+        ]
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for _, path, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if keep is not None and path == keep.path:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
+            removed += 1
+
+        if removed:
+            self.logger.info(
+                "Evicted %d audio cache entries (%.1f MB left)",
+                removed,
+                total / (1024 * 1024),
+            )
+        return removed
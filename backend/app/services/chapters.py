@@ -0,0 +1,120 @@
+"""Chapter-aware transcript splitting and merging of per-chapter analyses.
+
+Long videos with creator-defined chapters are analysed one chapter (or one
+group of adjacent chapters) at a time, concurrently, and the results merged
+into a single ``KnowledgeResult`` whose sections carry chapter headings with
+timestamps.
+"""
+
+from collections import Counter
+
+from app.services.summarizer import KnowledgeResult
+from app.services.youtube import Chapter, TranscriptSegment, join_segments
+
+# Matches the 1-5 keyword limit of the LLM analysis schema
+_MAX_KEYWORDS = 5
+
+
+def format_timestamp(seconds: float) -> str:
+    """Format seconds as ``m:ss`` (or ``h:mm:ss`` past an hour)."""
+    total = int(seconds)
+    hours, remainder = divmod(total, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def split_by_chapters(
+    segments: list[TranscriptSegment], chapters: tuple[Chapter, ...]
+) -> list[tuple[Chapter, str]]:
+    """Assign each segment to the chapter it starts in.
+
+    Segments before the first chapter go to the first one and segments past
+    the last chapter's end go to the last one, so no text is dropped.
+    Chapters without any text are omitted.
+    """
+    if not chapters:
+        return []
+
+    buckets: list[list[TranscriptSegment]] = [[] for _ in chapters]
+    index = 0
+    for segment in sorted(segments, key=lambda s: s.start):
+        while (
+            index + 1 < len(chapters)
+            and segment.start >= chapters[index + 1].start_time
+        ):
+            index += 1
+        buckets[index].append(segment)
+
+    return [
+        (chapter, join_segments(bucket))
+        for chapter, bucket in zip(chapters, buckets, strict=True)
+        if bucket
+    ]
+
+
+def group_chapters(
+    pieces: list[tuple[Chapter, str]], max_groups: int
+) -> list[tuple[Chapter, str]]:
+    """Merge adjacent chapters so there are at most ``max_groups`` pieces.
+
+    Groups are filled greedily up to an equal share of the total text, so
+    many short chapters don't each cost a separate LLM call.
+    """
+    if len(pieces) <= max_groups:
+        return pieces
+
+    target = sum(len(text) for _, text in pieces) / max_groups
+    groups: list[list[tuple[Chapter, str]]] = [[]]
+    size = 0
+    for piece in pieces:
+        if groups[-1] and size >= target and len(groups) < max_groups:
+            groups.append([])
+            size = 0
+        groups[-1].append(piece)
+        size += len(piece[1])
+
+    merged: list[tuple[Chapter, str]] = []
+    for group in groups:
+        chapter = Chapter(
+            title=" / ".join(c.title for c, _ in group),
+            start_time=group[0][0].start_time,
+            end_time=group[-1][0].end_time,
+        )
+        merged.append((chapter, " ".join(text for _, text in group)))
+    return merged
+
+
+def _merge_section(parts: list[tuple[Chapter, KnowledgeResult]], field: str) -> str:
+    sections = []
+    for chapter, result in parts:
+        text = getattr(result, field).strip()
+        if text:
+            heading = f"### {chapter.title} ({format_timestamp(chapter.start_time)})"
+            sections.append(f"{heading}\n\n{text}")
+    return "\n\n".join(sections)
+
+
+def merge_chapter_analyses(
+    parts: list[tuple[Chapter, KnowledgeResult]],
+) -> KnowledgeResult:
+    """Combine per-chapter results into one analysis of the whole video.
+
+    Text sections are concatenated under per-chapter headings. Keywords are
+    ranked by how many chapters produced them (ties keep chapter order) and
+    the category is the one most chapters agreed on.
+    """
+    keyword_counts = Counter(
+        keyword for _, result in parts for keyword in dict.fromkeys(result.keywords)
+    )
+    category_counts = Counter(result.category for _, result in parts if result.category)
+
+    return KnowledgeResult(
+        explanation=_merge_section(parts, "explanation"),
+        key_knowledge=_merge_section(parts, "key_knowledge"),
+        critical_analysis=_merge_section(parts, "critical_analysis"),
+        real_world_applications=_merge_section(parts, "real_world_applications"),
+        keywords=[k for k, _ in keyword_counts.most_common(_MAX_KEYWORDS)],
+        category=category_counts.most_common(1)[0][0] if category_counts else "",
+    )
@@ -0,0 +1,109 @@
+"""Deterministic transcript compaction to cut prompt tokens before analysis.
+
+Auto-generated captions repeat the tail of each line at the start of the
+next one, and carry sound markers (``[Music]``) and filler words that cost
+tokens without adding meaning. Compaction removes those and nothing else, so
+the same input always produces the same output.
+"""
+
+import html
+import re
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# Bracketed sound descriptions: [Music], [Applause], [âm nhạc], ...
+_BRACKET_NOISE = re.compile(r"\[[^\]\n]{0,40}\]")
+# Music notes and ">>" speaker-change markers
+_SYMBOL_NOISE = re.compile(r"[♪♫♬]+|>>+")
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"^[^\w]+|[^\w]+$", re.UNICODE)
+
+# Hesitation sounds only: "mm" (millimetres) and Vietnamese "ừ" ("yes")
+# carry meaning and stay
+_FILLER_WORDS = frozenset(
+    {"um", "umm", "uh", "uhh", "uhm", "erm", "hmm", "mhm", "ờ", "ừm"}
+)
+
+# Longest caption overlap we look for, in words
+_MAX_REPEAT_WORDS = 30
+# Shortest repeated run we drop; single repeated words are often intentional
+_MIN_REPEAT_WORDS = 2
+
+
+@dataclass(frozen=True)
+class CompactionResult:
+    """Compacted transcript plus before/after sizes."""
+
+    text: str
+    original_chars: int
+    compacted_chars: int
+    removed_repeats: int
+    removed_fillers: int
+
+    @property
+    def compression_ratio(self) -> float:
+        """Compacted size as a fraction of the original (lower is better)."""
+        if not self.original_chars:
+            return 1.0
+        return round(self.compacted_chars / self.original_chars, 4)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data.pop("text")
+        data["compression_ratio"] = self.compression_ratio
+        return data
+
+
+def _key(word: str) -> str:
+    return _PUNCTUATION.sub("", word).lower()
+
+
+def _drop_fillers(words: list[str]) -> tuple[list[str], int]:
+    kept = [word for word in words if _key(word) not in _FILLER_WORDS]
+    return kept, len(words) - len(kept)
+
+
+def _drop_rolling_repeats(words: list[str]) -> tuple[list[str], int]:
+    """Drop word runs that repeat the run immediately before them."""
+    keys = [_key(word) for word in words]
+    out_words: list[str] = []
+    out_keys: list[str] = []
+    removed = 0
+
+    i = 0
+    while i < len(words):
+        longest = min(_MAX_REPEAT_WORDS, len(out_keys), len(words) - i)
+        for size in range(longest, _MIN_REPEAT_WORDS - 1, -1):
+            if (
+                keys[i] == out_keys[-size]
+                and keys[i : i + size] == out_keys[-size:]
+                and any(keys[i : i + size])
+            ):
+                i += size
+                removed += size
+                break
+        else:
+            out_words.append(words[i])
+            out_keys.append(keys[i])
+            i += 1
+
+    return out_words, removed
+
+
+def compact_transcript(text: str) -> CompactionResult:
+    """Remove caption noise, filler words and rolling duplicates from text."""
+    cleaned = html.unescape(text)
+    cleaned = _BRACKET_NOISE.sub(" ", cleaned)
+    cleaned = _SYMBOL_NOISE.sub(" ", cleaned)
+
+    words, removed_fillers = _drop_fillers(_WHITESPACE.split(cleaned.strip()))
+    words, removed_repeats = _drop_rolling_repeats([w for w in words if w])
+    compacted = " ".join(words)
+
+    return CompactionResult(
+        text=compacted,
+        original_chars=len(text),
+        compacted_chars=len(compacted),
+        removed_repeats=removed_repeats,
+        removed_fillers=removed_fillers,
+    )
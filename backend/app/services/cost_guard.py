@@ -0,0 +1,157 @@
+"""Pre-flight duration and cost checks, run right after the metadata fetch.
+
+The transcript isn't known yet at that point, so the estimate works from the
+video duration: caption text is assumed to arrive at a typical speaking rate,
+and the Whisper fallback is always priced in (worst case — we can't know
+whether captions exist until we ask for them).
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.config import settings
+from app.services.summarizer import route_for_transcript
+from app.services.youtube import VideoMetadata
+
+# ~150 spoken words per minute at ~6 characters per word (with spaces)
+_CAPTION_CHARS_PER_SECOND = 15
+
+GUARD_ACTIONS = ("reject", "low_priority")
+
+
+class CostLimitExceededError(RuntimeError):
+    """Raised when a job is over its limits and the action is ``reject``."""
+
+
+@dataclass(frozen=True)
+class CostEstimate:
+    """Expected spend and LLM latency for processing one video."""
+
+    duration_seconds: int | None
+    transcript_chars: int
+    llm_calls: int
+    llm_cost_usd: float
+    whisper_cost_usd: float
+    llm_latency_seconds: float
+
+    @property
+    def total_cost_usd(self) -> float:
+        return round(self.llm_cost_usd + self.whisper_cost_usd, 4)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["total_cost_usd"] = self.total_cost_usd
+        return data
+
+
+@dataclass(frozen=True)
+class GuardLimits:
+    max_duration_seconds: int
+    max_cost_usd: float
+    over_limit_action: str
+
+
+@dataclass(frozen=True)
+class GuardDecision:
+    """Outcome of the pre-flight check: ``allow``, ``low_priority`` or ``reject``."""
+
+    action: str
+    reasons: list[str]
+    estimate: CostEstimate
+    limits: GuardLimits
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "action": self.action,
+            "reasons": self.reasons,
+            "estimate": self.estimate.as_dict(),
+            "limits": asdict(self.limits),
+        }
+
+
+def _positive_number(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value) if value > 0 else None
+
+
+def limits_for(preferences: dict[str, Any] | None) -> GuardLimits:
+    """Combine global limits with a user's own (which can only tighten them).
+
+    Users set ``max_video_duration_seconds``, ``max_estimated_cost_usd`` and
+    ``over_limit_action`` in their preferences; invalid values are ignored.
+    """
+    preferences = preferences or {}
+    max_duration = settings.max_video_duration_seconds
+    max_cost = settings.max_estimated_cost_usd
+
+    user_duration = _positive_number(preferences.get("max_video_duration_seconds"))
+    if user_duration is not None:
+        max_duration = min(max_duration, int(user_duration))
+    user_cost = _positive_number(preferences.get("max_estimated_cost_usd"))
+    if user_cost is not None:
+        max_cost = min(max_cost, user_cost)
+
+    action = preferences.get("over_limit_action")
+    if action not in GUARD_ACTIONS:
+        action = settings.over_limit_action
+
+    return GuardLimits(
+        max_duration_seconds=max_duration,
+        max_cost_usd=max_cost,
+        over_limit_action=action,
+    )
+
+
+def estimate_job_cost(metadata: VideoMetadata) -> CostEstimate:
+    """Estimate LLM and Whisper spend for a video from its duration."""
+    duration = metadata.duration or 0
+    chars = duration * _CAPTION_CHARS_PER_SECOND
+
+    # Mirrors the pipeline: long videos with chapters get one call per
+    # (grouped) chapter, run in parallel.
+    calls = 1
+    if len(metadata.chapters) >= 2 and chars >= settings.chapter_analysis_min_chars:
+        calls = min(len(metadata.chapters), settings.chapter_analysis_max_chapters)
+    route = route_for_transcript(chars // calls)
+
+    return CostEstimate(
+        duration_seconds=metadata.duration,
+        transcript_chars=chars,
+        llm_calls=calls,
+        llm_cost_usd=round(route.estimated_cost_usd * calls, 4),
+        whisper_cost_usd=round(duration / 60 * settings.whisper_usd_per_minute, 4),
+        llm_latency_seconds=route.estimated_latency_seconds,
+    )
+
+
+def check_job(
+    metadata: VideoMetadata, preferences: dict[str, Any] | None = None
+) -> GuardDecision:
+    """Decide whether a job may run now, later (low priority) or not at all.
+
+    Videos with an unknown duration (e.g. an ongoing or unprocessed
+    livestream) can't be estimated, so they count as over the limits.
+    """
+    limits = limits_for(preferences)
+    estimate = estimate_job_cost(metadata)
+
+    reasons: list[str] = []
+    if metadata.duration is None:
+        reasons.append("unknown duration, so the cost can't be estimated")
+    else:
+        if metadata.duration > limits.max_duration_seconds:
+            reasons.append(
+                f"duration {metadata.duration}s exceeds the "
+                f"{limits.max_duration_seconds}s limit"
+            )
+        if estimate.total_cost_usd > limits.max_cost_usd:
+            reasons.append(
+                f"estimated cost ${estimate.total_cost_usd:.2f} exceeds the "
+                f"${limits.max_cost_usd:.2f} limit"
+            )
+
+    action = limits.over_limit_action if reasons else "allow"
+    return GuardDecision(
+        action=action, reasons=reasons, estimate=estimate, limits=limits
+    )
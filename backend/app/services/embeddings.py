@@ -0,0 +1,330 @@
+"""Local text embeddings for semantic related videos and search.
+
+Keyword overlap misses videos that describe the same topic with different
+tags. Each video's title and key knowledge are embedded at ingest with a
+hashed TF vectorizer — the tokens of ``app.services.extractive.tokenize``
+(unigrams and bigrams) hashed into ``EMBEDDING_DIMENSIONS`` signed buckets
+with sublinear term frequency — and stored sparsely in ``videos.embedding``
+as the sorted int32 bucket ids followed by their float32 weights. No model
+and no external service are involved.
+
+IDF depends on the whole library, so it is applied at query time:
+``EmbeddingIndex`` holds one user's vectors as IDF-weighted, normalized
+postings per bucket, and a query gathers the postings of its own buckets
+followed by an ``argpartition`` top-k. Matches below
+``settings.semantic_min_similarity`` are dropped: a bucket collision
+scores like a weak real match, and nothing else keeps a nonsense query
+from returning half the library. Indexes are cached per user and rebuilt
+when the user's ``embedding_version`` changes, which only embedding writes
+and video deletions bump; views, favourites and notes leave the cached
+index alone.
+
+Videos ingested before embeddings existed are filled by::
+
+    python -m app.services.embeddings [--user USER_ID]
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import LargeBinary, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session, engine
+from app.logging_config import get_logger
+from app.models import User, Video
+from app.services.extractive import tokenize
+from app.services.library import bump_library_version
+
+logger = get_logger(__name__)
+
+# A video has a few hundred distinct tokens, so in 2**20 buckets two
+# unrelated terms share one with a chance of well under 1 in 1000 per video.
+# Only the non-zero buckets are stored, 8 bytes each.
+EMBEDDING_DIMENSIONS = 1 << 20
+
+# The title is short but the most specific text; count its tokens this often
+_TITLE_WEIGHT = 2
+
+# Users whose indexes are kept in memory
+_CACHED_INDEXES = 32
+
+_BACKFILL_BATCH = 200
+
+
+def embed_text(title: str | None, body: str | None = None) -> bytes | None:
+    """Sparse hashed sublinear-TF vector of a video's text, as bytes.
+
+    Returns None when the text has no content tokens.
+    """
+    tokens = tokenize(title or "") * _TITLE_WEIGHT + tokenize(body or "")
+    if not tokens:
+        return None
+    buckets, counts = _hashed_counts(tokens)
+    weights = np.sign(counts) * np.log1p(np.abs(counts))
+    kept = weights != 0
+    return _encode(buckets[kept], weights[kept])
+
+
+def _hashed_counts(tokens: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Sorted bucket ids and their signed token counts."""
+    # crc32 rather than hash(): stored vectors must agree across processes
+    hashes = np.fromiter(
+        (zlib.crc32(token.encode()) for token in tokens),
+        dtype=np.uint32,
+        count=len(tokens),
+    )
+    signs = np.where((hashes // EMBEDDING_DIMENSIONS) & 1, -1.0, 1.0)
+    buckets, inverse = np.unique(hashes % EMBEDDING_DIMENSIONS, return_inverse=True)
+    counts = np.bincount(inverse, weights=signs, minlength=len(buckets))
+    return buckets, counts
+
+
+def _encode(buckets: np.ndarray, weights: np.ndarray) -> bytes:
+    return buckets.astype(np.int32).tobytes() + weights.astype(np.float32).tobytes()
+
+
+def _decode(blob: bytes) -> tuple[np.ndarray, np.ndarray]:
+    size = len(blob) // 8
+    buckets = np.frombuffer(blob, dtype=np.int32, count=size)
+    weights = np.frombuffer(blob, dtype=np.float32, offset=size * 4)
+    return buckets, weights
+
+
+@dataclass(frozen=True)
+class SemanticMatch:
+    video_id: uuid.UUID
+    score: float
+
+
+class EmbeddingIndex:
+    """One user's video vectors, ready for cosine top-k queries."""
+
+    def __init__(
+        self,
+        video_ids: list[uuid.UUID],
+        blobs: list[bytes],
+        min_similarity: float | None = None,
+    ) -> None:
+        self.video_ids = video_ids
+        self.min_similarity = (
+            settings.semantic_min_similarity
+            if min_similarity is None
+            else min_similarity
+        )
+        self._positions = {video_id: i for i, video_id in enumerate(video_ids)}
+        decoded = [_decode(blob) for blob in blobs]
+        lengths = np.array([len(buckets) for buckets, _ in decoded], dtype=np.int64)
+        rows = np.repeat(np.arange(len(blobs)), lengths)
+        buckets = np.concatenate(
+            [b for b, _ in decoded] or [np.empty(0, dtype=np.int32)]
+        )
+        weights = np.concatenate(
+            [w for _, w in decoded] or [np.empty(0, dtype=np.float32)]
+        )
+
+        # Bucket ids present in the library, and each posting's column in them
+        self._buckets, columns, doc_freq = np.unique(
+            buckets, return_inverse=True, return_counts=True
+        )
+        self._unseen_idf = float(np.log(1.0 + len(blobs)) + 1.0)
+        self._idf = np.log((1.0 + len(blobs)) / (1.0 + doc_freq)) + 1.0
+        weighted = weights * self._idf[columns]
+        norms = np.sqrt(np.bincount(rows, weights=weighted**2, minlength=len(blobs)))
+        norms[norms == 0] = 1.0
+        weighted = (weighted / norms[rows]).astype(np.float32)
+
+        # Per video (row order, as stored) for similar_to
+        self._row_starts = np.concatenate(([0], np.cumsum(lengths)))
+        self._row_columns = columns
+        self._row_weights = weighted
+        # Per bucket (postings) for scoring
+        order = np.argsort(columns, kind="stable")
+        self._posting_rows = rows[order]
+        self._posting_weights = weighted[order]
+        self._posting_starts = np.concatenate(
+            ([0], np.cumsum(np.bincount(columns, minlength=len(self._buckets))))
+        )
+
+    def __len__(self) -> int:
+        return len(self.video_ids)
+
+    def query_text(self, text: str, limit: int) -> list[SemanticMatch]:
+        """Videos most similar to free text, best first."""
+        blob = embed_text(None, text)
+        if blob is None or not len(self):
+            return []
+        buckets, weights = _decode(blob)
+        columns = np.searchsorted(self._buckets, buckets)
+        columns[columns == len(self._buckets)] = 0
+        known = self._buckets[columns] == buckets
+        # Terms the library has never seen score nothing but still count
+        # towards the query's norm, so they dilute rather than vanish
+        idf = np.where(known, self._idf[columns], self._unseen_idf)
+        weights = weights * idf
+        norm = np.linalg.norm(weights)
+        return self._top_k(columns[known], weights[known] / norm, limit)
+
+    def similar_to(self, video_id: uuid.UUID, limit: int) -> list[SemanticMatch]:
+        """Videos most similar to ``video_id``, excluding itself."""
+        position = self._positions.get(video_id)
+        if position is None:
+            return []
+        start, end = self._row_starts[position], self._row_starts[position + 1]
+        return self._top_k(
+            self._row_columns[start:end],
+            self._row_weights[start:end],
+            limit,
+            exclude=position,
+        )
+
+    def _top_k(
+        self,
+        columns: np.ndarray,
+        weights: np.ndarray,
+        limit: int,
+        exclude: int | None = None,
+    ) -> list[SemanticMatch]:
+        if not len(self) or limit <= 0 or not len(columns):
+            return []
+        starts = self._posting_starts[columns]
+        lengths = self._posting_starts[columns + 1] - starts
+        # Every posting of the query's buckets, gathered in one pass
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        postings = np.repeat(starts, lengths) + offsets
+        scores = np.bincount(
+            self._posting_rows[postings],
+            weights=self._posting_weights[postings] * np.repeat(weights, lengths),
+            minlength=len(self),
+        )
+        if exclude is not None:
+            scores[exclude] = -np.inf
+        count = min(limit, len(scores))
+        top = np.argpartition(-scores, count - 1)[:count]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            SemanticMatch(self.video_ids[i], float(scores[i]))
+            for i in top
+            if scores[i] >= self.min_similarity and scores[i] > 0
+        ]
+
+
+class EmbeddingIndexCache:
+    """Per-user ``EmbeddingIndex`` instances, keyed by embedding version."""
+
+    def __init__(self, max_users: int = _CACHED_INDEXES) -> None:
+        self._max_users = max_users
+        self._indexes: OrderedDict[uuid.UUID, tuple[int, EmbeddingIndex]] = (
+            OrderedDict()
+        )
+
+    async def get(self, db: AsyncSession, user: User) -> EmbeddingIndex:
+        version = user.embedding_version or 0
+        cached = self._indexes.get(user.id)
+        if cached is not None and cached[0] == version:
+            self._indexes.move_to_end(user.id)
+            return cached[1]
+
+        result = await db.execute(
+            select(Video.id, Video.embedding).where(
+                Video.user_id == user.id, Video.embedding.is_not(None)
+            )
+        )
+        rows = result.all()
+        index = EmbeddingIndex([row[0] for row in rows], [row[1] for row in rows])
+        self._indexes[user.id] = (version, index)
+        self._indexes.move_to_end(user.id)
+        while len(self._indexes) > self._max_users:
+            self._indexes.popitem(last=False)
+        return index
+
+    def clear(self) -> None:
+        self._indexes.clear()
+
+
+embedding_indexes = EmbeddingIndexCache()
+
+
+async def backfill_embeddings(user_id: uuid.UUID | None = None) -> int:
+    """Embed every video that has no embedding yet; returns the count."""
+    total = 0
+    last_id: uuid.UUID | None = None
+    while True:
+        async with async_session() as db:
+            query = (
+                select(Video.id, Video.user_id, Video.title, Video.key_knowledge)
+                .where(Video.embedding.is_(None))
+                .order_by(Video.id)
+                .limit(_BACKFILL_BATCH)
+            )
+            if user_id is not None:
+                query = query.where(Video.user_id == user_id)
+            if last_id is not None:
+                query = query.where(Video.id > last_id)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                return total
+            embedded = [
+                (row.id, row.user_id, blob)
+                for row in rows
+                if (blob := embed_text(row.title, row.key_knowledge)) is not None
+            ]
+            if embedded:
+                await db.execute(
+                    _update_embeddings([(id_, blob) for id_, _, blob in embedded])
+                )
+            for owner in {owner for _, owner, _ in embedded}:
+                await bump_library_version(db, owner, embeddings=True)
+            await db.commit()
+        last_id = rows[-1].id
+        total += len(embedded)
+        logger.info("Embedded %d video(s)", total)
+
+
+def _update_embeddings(items: list[tuple[uuid.UUID, bytes]]):
+    rows = values(
+        column("id", UUID(as_uuid=True)),
+        column("embedding", LargeBinary),
+        name="new_embeddings",
+    ).data(items)
+    return (
+        update(Video)
+        .where(Video.id == rows.c.id)
+        .values(
+            embedding=rows.c.embedding,
+            # Embedding old videos isn't an edit; keep onupdate from
+            # touching updated_at (and so tags' last_used_at)
+            updated_at=Video.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def _run(args: argparse.Namespace) -> int:
+    try:
+        return await backfill_embeddings(args.user)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Embed videos missing an embedding")
+    parser.add_argument("--user", type=uuid.UUID, help="only this user's videos")
+    args = parser.parse_args(argv)
+    total = asyncio.run(_run(args))
+    sys.stdout.write(f"Embedded {total} video(s)\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
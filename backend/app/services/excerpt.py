@@ -0,0 +1,37 @@
+"""Short plain-text excerpts of a video's analysis for list views.
+
+Computed once when the analysis is stored, so listing videos never has to
+load (or ship) the full markdown fields.
+"""
+
+import re
+
+# Matches the videos.excerpt column width
+EXCERPT_MAX_CHARS = 280
+
+_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_LINE_MARKERS = re.compile(r"^\s*(?:#{1,6}\s+|[-*+]\s+|\d+[.)]\s+|>\s*)", re.MULTILINE)
+_INLINE_MARKERS = re.compile(r"[*_`~]+")
+
+
+def make_excerpt(*sources: str | None) -> str | None:
+    """Plain-text excerpt of the first non-empty source.
+
+    Markdown markup is stripped, whitespace collapsed, and text longer than
+    ``EXCERPT_MAX_CHARS`` is cut at a word boundary with an ellipsis.
+    """
+    for source in sources:
+        if not source:
+            continue
+        text = _LINK.sub(r"\1", source)
+        text = _LINE_MARKERS.sub("", text)
+        text = " ".join(_INLINE_MARKERS.sub("", text).split())
+        if not text:
+            continue
+        if len(text) <= EXCERPT_MAX_CHARS:
+            return text
+        cut = text[: EXCERPT_MAX_CHARS - 1]
+        if " " in cut:
+            cut = cut.rsplit(" ", 1)[0]
+        return cut.rstrip(" ,;:.-") + "…"
+    return None
@@ -0,0 +1,270 @@
+"""Local extractive summarization and TF-IDF keyword extraction.
+
+Everything here runs on the CPU with NumPy — no network calls — so it can
+produce a usable preview of a video within seconds of the transcript arriving,
+and stand in for the LLM when OpenAI is unavailable.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.logging_config import get_logger
+from app.services.summarizer import KnowledgeResult, ModelRoute, SummarizerBackend
+
+# ---------------------------------------------------------------------------
+# Tokenization
+# ---------------------------------------------------------------------------
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?…])\s+")
+_TOKEN_PATTERN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# Auto-generated captions usually have no punctuation at all; when the
+# average "sentence" gets longer than this we fall back to fixed windows.
+_MAX_SENTENCE_WORDS = 60
+_WINDOW_WORDS = 25
+_MIN_SENTENCE_TOKENS = 5
+
+# TextRank (PageRank over the sentence similarity graph)
+_DAMPING = 0.85
+_MAX_ITERATIONS = 100
+_TOLERANCE = 1.0e-6
+
+_STOPWORD_TEXT = """
+    a about above after again against all also am an and any are as at be
+    because been before being below between both but by can could did do does
+    doing down during each even few for from further get gets going gonna got
+    had has have having he her here hers herself him himself his how i if in
+    into is it its itself just know let like me more most much my myself no nor
+    not now of off on once one only or other our ours ourselves out over own
+    really right said same say she should so some something such than that the
+    their theirs them themselves then there these they thing things think this
+    those through to too um uh under until up us very was way we well were what
+    when where which while who whom why will with would yeah you your yours
+    yourself yourselves okay ok actually basically
+    và của là có được cho với này một các những trong không để thì mà người
+    khi đã sẽ cũng như từ về ra vào lại rất nhiều nó tôi bạn chúng ta mình
+    đó đây nào gì nhưng hay hoặc nếu vì bởi theo trên dưới đến còn thế vậy
+"""
+_STOPWORDS = frozenset(_STOPWORD_TEXT.split())
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences, windowing unpunctuated caption text."""
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+    if not sentences:
+        return []
+
+    total_words = sum(len(s.split()) for s in sentences)
+    if total_words / len(sentences) <= _MAX_SENTENCE_WORDS:
+        return sentences
+
+    words = text.split()
+    return [
+        " ".join(words[i : i + _WINDOW_WORDS])
+        for i in range(0, len(words), _WINDOW_WORDS)
+    ]
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase content tokens (unigrams and adjacent-word bigrams)."""
+    words = _TOKEN_PATTERN.findall(text.lower())
+    unigrams = [
+        w for w in words if w not in _STOPWORDS and not w.isdigit() and len(w) > 1
+    ]
+    bigrams = [
+        f"{left} {right}"
+        for left, right in zip(words, words[1:], strict=False)
+        if left not in _STOPWORDS
+        and right not in _STOPWORDS
+        and not left.isdigit()
+        and not right.isdigit()
+    ]
+    return unigrams + bigrams
+
+
+# ---------------------------------------------------------------------------
+# TF-IDF
+# ---------------------------------------------------------------------------
+
+
+def tfidf_matrix(token_lists: list[list[str]]) -> tuple[np.ndarray, list[str]]:
+    """Build a sentence × term TF-IDF matrix (sublinear tf, smoothed idf).
+
+    Returns:
+        A tuple of (matrix, terms) where ``terms[j]`` labels column ``j``.
+    """
+    vocab: dict[str, int] = {}
+    rows: list[int] = []
+    cols: list[int] = []
+    for i, tokens in enumerate(token_lists):
+        for token in tokens:
+            rows.append(i)
+            cols.append(vocab.setdefault(token, len(vocab)))
+
+    counts = np.zeros((len(token_lists), len(vocab)), dtype=np.float32)
+    if rows:
+        np.add.at(counts, (np.asarray(rows), np.asarray(cols)), 1.0)
+
+    doc_freq = np.count_nonzero(counts, axis=0)
+    idf = np.log((1.0 + len(token_lists)) / (1.0 + doc_freq)) + 1.0
+    matrix = np.log1p(counts) * idf.astype(np.float32)
+    return matrix, list(vocab)
+
+
+def _row_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+
+def extract_keywords(text: str, max_keywords: int = 5) -> list[str]:
+    """Return the highest-weighted TF-IDF terms of ``text``.
+
+    Sentences act as the "documents", so terms spread evenly through the
+    whole transcript are discounted relative to topical ones. A unigram is
+    skipped when a higher-ranked bigram already contains it.
+    """
+    sentences = split_sentences(text)
+    if not sentences:
+        return []
+
+    matrix, terms = tfidf_matrix([tokenize(s) for s in sentences])
+    if not terms:
+        return []
+
+    scores = matrix.sum(axis=0)
+    keywords: list[str] = []
+    for index in np.argsort(-scores, kind="stable"):
+        term = terms[index]
+        if any(term in kept.split() for kept in keywords if " " in kept):
+            continue
+        keywords.append(term)
+        if len(keywords) >= max_keywords:
+            break
+    return keywords
+
+
+def textrank_scores(vectors: np.ndarray) -> np.ndarray:
+    """Rank sentences with PageRank over their cosine-similarity graph.
+
+    Args:
+        vectors: Row-normalized sentence × term matrix.
+
+    Returns:
+        One score per row; scores sum to 1.
+    """
+    count = vectors.shape[0]
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    # Sentences sharing no terms with anything else jump uniformly.
+    transition = np.where(
+        out_weight > 0,
+        similarity / np.where(out_weight > 0, out_weight, 1.0),
+        1.0 / count,
+    )
+
+    scores = np.full(count, 1.0 / count, dtype=np.float64)
+    teleport = (1.0 - _DAMPING) / count
+    for _ in range(_MAX_ITERATIONS):
+        updated = teleport + _DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < _TOLERANCE:
+            return updated
+        scores = updated
+    return scores
+
+
+def summarize(text: str, max_sentences: int = 5) -> list[str]:
+    """Pick the most central sentences of ``text`` using TextRank.
+
+    Selected sentences are returned in their original order.
+    """
+    sentences = split_sentences(text)
+    token_lists = [tokenize(s) for s in sentences]
+    candidates = [
+        i for i, tokens in enumerate(token_lists) if len(tokens) >= _MIN_SENTENCE_TOKENS
+    ]
+    if not candidates:
+        return sentences[:max_sentences]
+
+    matrix, _ = tfidf_matrix([token_lists[i] for i in candidates])
+    scores = textrank_scores(_row_normalize(matrix))
+
+    top = np.argsort(-scores, kind="stable")[:max_sentences]
+    return [sentences[candidates[i]] for i in sorted(top)]
+
+
+@dataclass(frozen=True)
+class LocalPreview:
+    """Cheap, locally computed stand-in for the full knowledge analysis."""
+
+    key_knowledge: str
+    keywords: list[str]
+
+
+def build_local_preview(
+    transcript: str, max_sentences: int = 5, max_keywords: int = 5
+) -> LocalPreview:
+    """Build a Markdown bullet summary plus keywords from a transcript."""
+    sentences = summarize(transcript, max_sentences=max_sentences)
+    return LocalPreview(
+        key_knowledge="\n".join(f"- {sentence}" for sentence in sentences),
+        keywords=extract_keywords(transcript, max_keywords=max_keywords),
+    )
+
+
+# ---------------------------------------------------------------------------
+# ExtractiveSummarizerService
+# ---------------------------------------------------------------------------
+
+
+class ExtractiveSummarizerService(SummarizerBackend):
+    """CPU-only summarizer backend used when the LLM analysis is unavailable.
+
+    Only ``key_knowledge`` and ``keywords`` can be produced extractively; the
+    remaining sections are left empty so the video can be upgraded later.
+    """
+
+    def __init__(self, max_sentences: int = 8, max_keywords: int = 5) -> None:
+        self.logger = get_logger(__name__)
+        self.max_sentences = max_sentences
+        self.max_keywords = max_keywords
+
+    async def analyze(
+        self,
+        transcript: str,
+        title: str,
+        categories: list[dict[str, str]],
+        route: ModelRoute | None = None,
+    ) -> KnowledgeResult:
+        """Analyze a transcript locally (same contract as ``SummarizerService``).
+
+        ``route`` is accepted for interface compatibility and ignored.
+        """
+        self.logger.info(
+            "Extractive analysis for '%s' (%d chars)", title, len(transcript)
+        )
+        preview = await asyncio.to_thread(
+            build_local_preview,
+            transcript,
+            max_sentences=self.max_sentences,
+            max_keywords=self.max_keywords,
+        )
+        slugs = {c["slug"] for c in categories}
+        return KnowledgeResult(
+            explanation="",
+            key_knowledge=preview.key_knowledge,
+            critical_analysis="",
+            real_world_applications="",
+            keywords=preview.keywords,
+            category="other" if "other" in slugs else "",
+        )
@@ -0,0 +1,116 @@
+"""Facet counts for the filtered video list.
+
+Filter chips used to come from ``/api/tags`` and ``/api/categories``,
+separate requests whose counts covered the whole library rather than the
+current filter. ``list_videos`` now takes ``?facets=`` and counts the
+requested facets over exactly the rows its filters match, in one
+statement: the filtered set is a CTE that Postgres materializes once, then
+category and favourite are grouped together with GROUPING SETS, tags via
+``unnest`` and collections via ``collection_videos``, all in one
+``UNION ALL``.
+"""
+
+from sqlalchemy import Select, String, case, cast, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Video, collection_videos
+
+FACETS = ("category", "tag", "collection", "favourite")
+
+# Most frequent tags returned; the long tail isn't useful as chips
+TAG_FACET_LIMIT = 50
+
+
+def parse_facets(value: str | None) -> list[str]:
+    """Requested facets, in ``FACETS`` order; raises ValueError if unknown."""
+    if not value:
+        return []
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = requested - set(FACETS)
+    if unknown:
+        raise ValueError(f"facets must be among: {', '.join(FACETS)}")
+    return [name for name in FACETS if name in requested]
+
+
+def facet_query(query: Select, facets: list[str]):
+    """One statement counting ``facets`` over the rows ``query`` matches.
+
+    Rows are ``(facet, value, count)``; values are text, with NULL for
+    uncategorized videos.
+    """
+    filtered = (
+        query.with_only_columns(
+            Video.id, Video.category, Video.keywords, Video.is_favourite
+        )
+        .order_by(None)
+        .cte("filtered")
+    )
+    count = func.count().label("count")
+    parts = []
+
+    columns = {
+        "category": filtered.c.category,
+        "favourite": cast(filtered.c.is_favourite, String),
+    }
+    grouped = [name for name in columns if name in facets]
+    if grouped:
+        if len(grouped) == 1:
+            facet = literal(grouped[0])
+            value = columns[grouped[0]]
+        else:
+            # grouping(category) is 1 on the rows grouped by favourite
+            favourite_rows = func.grouping(columns["category"]) == 1
+            facet = case((favourite_rows, "favourite"), else_="category")
+            value = case(
+                (favourite_rows, columns["favourite"]), else_=columns["category"]
+            )
+        parts.append(
+            select(facet.label("facet"), value.label("value"), count)
+            .select_from(filtered)
+            .group_by(func.grouping_sets(*(columns[name] for name in grouped)))
+        )
+
+    if "tag" in facets:
+        tag = func.unnest(filtered.c.keywords).column_valued("tag")
+        parts.append(
+            select(literal("tag").label("facet"), tag.label("value"), count)
+            .select_from(filtered)
+            .group_by(tag)
+            .order_by(count.desc(), tag)
+            .limit(TAG_FACET_LIMIT)
+            .subquery()
+            .select()
+        )
+
+    if "collection" in facets:
+        collection_id = cast(collection_videos.c.collection_id, String)
+        parts.append(
+            select(
+                literal("collection").label("facet"),
+                collection_id.label("value"),
+                count,
+            )
+            .select_from(
+                filtered.join(
+                    collection_videos, collection_videos.c.video_id == filtered.c.id
+                )
+            )
+            .group_by(collection_videos.c.collection_id)
+        )
+
+    return union_all(*parts) if len(parts) > 1 else parts[0]
+
+
+async def count_facets(
+    db: AsyncSession, query: Select, facets: list[str]
+) -> dict[str, list[tuple[str | None, int]]]:
+    """``(value, count)`` pairs per requested facet, most frequent first."""
+    counts: dict[str, list[tuple[str | None, int]]] = {name: [] for name in facets}
+    if not facets:
+        return counts
+    result = await db.execute(facet_query(query, facets))
+    for facet, value, count in result.all():
+        counts[facet].append((value, count))
+    for pairs in counts.values():
+        pairs.sort(key=lambda pair: (-pair[1], pair[0] is None, pair[0] or ""))
+    return counts
@@ -0,0 +1,161 @@
+"""Offline stand-ins for the YouTube, Whisper and OpenAI services.
+
+Enabled with ``USE_FAKE_PROVIDERS=true`` so ingestion can be load-tested
+without network access or API spend. Each fake sleeps for a configurable,
+jittered latency, fails at a configurable rate and returns payloads of a
+configurable size. Output is seeded from the YouTube id, so the same video
+always gets the same metadata and transcript.
+"""
+
+import asyncio
+import hashlib
+import random
+
+from app.config import settings
+from app.logging_config import get_logger
+from app.services.summarizer import (
+    KnowledgeResult,
+    ModelRoute,
+    SummarizerBackend,
+    route_for_transcript,
+)
+from app.services.youtube import (
+    TranscriptNotAvailableError,
+    TranscriptSegment,
+    VideoMetadata,
+    YouTubeService,
+    join_segments,
+)
+
+_VOCABULARY_TEXT = """
+    system data model network latency cache query index memory thread process
+    design pattern learning growth habit focus energy market price value risk
+    signal history science theory evidence experiment result language music
+    story writing craft practice skill teacher student
+"""
+_VOCABULARY = _VOCABULARY_TEXT.split()
+
+# Caption lines arrive every few seconds with a handful of words each
+_SEGMENT_SECONDS = 4.0
+_WORDS_PER_SEGMENT = 10
+
+
+def _rng(*parts: str) -> random.Random:
+    seed = hashlib.sha256("\x00".join(parts).encode()).digest()
+    return random.Random(int.from_bytes(seed[:8], "big"))
+
+
+async def _simulate(rng: random.Random, latency: float, error_rate: float) -> bool:
+    """Sleep for ``latency`` ±50% and return whether the call should fail."""
+    await asyncio.sleep(latency * rng.uniform(0.5, 1.5))
+    return rng.random() < error_rate
+
+
+def _words(rng: random.Random, count: int) -> list[str]:
+    return [rng.choice(_VOCABULARY) for _ in range(count)]
+
+
+def fake_segments(youtube_id: str, chars: int) -> list[TranscriptSegment]:
+    """Deterministic caption segments totalling roughly ``chars`` characters."""
+    rng = _rng("segments", youtube_id)
+    segments: list[TranscriptSegment] = []
+    total = 0
+    while total < chars:
+        text = " ".join(_words(rng, _WORDS_PER_SEGMENT)) + "."
+        segments.append(
+            TranscriptSegment(
+                start=len(segments) * _SEGMENT_SECONDS,
+                duration=_SEGMENT_SECONDS,
+                text=text,
+            )
+        )
+        total += len(text) + 1
+    return segments
+
+
+class FakeYouTubeService(YouTubeService):
+    """``YouTubeService`` that invents metadata and captions locally.
+
+    URL parsing is inherited unchanged.
+    """
+
+    async def fetch_metadata(self, youtube_id: str) -> VideoMetadata:
+        rng = _rng("metadata", youtube_id)
+        if await _simulate(
+            rng, settings.fake_metadata_latency_seconds, settings.fake_error_rate
+        ):
+            raise RuntimeError(f"Fake metadata failure for video {youtube_id}")
+
+        chars = settings.fake_transcript_chars
+        return VideoMetadata(
+            title=" ".join(_words(rng, 5)).title(),
+            thumbnail_url=None,
+            channel_name="Fake Channel",
+            # Keep duration consistent with the generated transcript length
+            duration=int(chars / _WORDS_PER_SEGMENT / 6 * _SEGMENT_SECONDS),
+        )
+
+    async def fetch_transcript_segments(
+        self, youtube_id: str
+    ) -> tuple[list[TranscriptSegment], str]:
+        rng = _rng("captions", youtube_id)
+        await _simulate(rng, settings.fake_transcript_latency_seconds, 0.0)
+        if rng.random() >= settings.fake_caption_rate:
+            raise TranscriptNotAvailableError(f"No fake captions for {youtube_id}")
+        return fake_segments(youtube_id, settings.fake_transcript_chars), "captions:en"
+
+
+class FakeTranscriptionService:
+    """Whisper stand-in; used for the videos the fake YouTube leaves uncaptioned."""
+
+    def __init__(self) -> None:
+        self.logger = get_logger(__name__)
+
+    async def transcribe_with_whisper(self, youtube_id: str) -> tuple[str, str]:
+        rng = _rng("whisper", youtube_id)
+        if await _simulate(
+            rng, settings.fake_whisper_latency_seconds, settings.fake_error_rate
+        ):
+            raise RuntimeError(f"Fake Whisper failure for video {youtube_id}")
+        segments = fake_segments(youtube_id, settings.fake_transcript_chars)
+        return join_segments(segments), "whisper"
+
+
+class FakeSummarizerService(SummarizerBackend):
+    """LLM stand-in with the same ``route``/``analyze`` contract.
+
+    Failures raise ``RuntimeError`` like the real service, so the extractive
+    fallback path is exercised too.
+    """
+
+    def __init__(self) -> None:
+        self.logger = get_logger(__name__)
+
+    def route(self, transcript: str) -> ModelRoute:
+        return route_for_transcript(len(transcript))
+
+    async def analyze(
+        self,
+        transcript: str,
+        title: str,
+        categories: list[dict[str, str]],
+        route: ModelRoute | None = None,
+    ) -> KnowledgeResult:
+        rng = _rng("analysis", title, str(len(transcript)))
+        if await _simulate(
+            rng, settings.fake_analysis_latency_seconds, settings.fake_error_rate
+        ):
+            raise RuntimeError("Analysis failed: fake provider error")
+
+        section_words = max(settings.fake_analysis_chars // 7, 1)
+        slugs = [c["slug"] for c in categories]
+        return KnowledgeResult(
+            explanation=" ".join(_words(rng, section_words)),
+            key_knowledge="\n".join(
+                f"- {' '.join(_words(rng, 12))}" for _ in range(section_words // 12)
+            ),
+            critical_analysis=" ".join(_words(rng, section_words // 2)),
+            real_world_applications=" ".join(_words(rng, section_words // 2)),
+            keywords=sorted(set(_words(rng, 5))),
+            category=rng.choice(slugs) if slugs else "",
+        )
@@ -0,0 +1,58 @@
+"""Per-user library version, for conditional GETs on the read endpoints.
+
+``users.library_version`` is bumped in the same transaction as every write
+to a user's videos, tags, categories or collections. The library read
+endpoints derive a weak ETag from it, so a client whose copy is current
+gets a 304 after the user lookup authentication does anyway, without the
+endpoint's own queries or serialization.
+
+Views are the one exception: the view tracker bumps the version only when
+a view changes which review filters a video matches, so view counts and
+times on list cards can lag in a cached list.
+"""
+
+import uuid
+from datetime import UTC, datetime
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import User
+
+
+async def bump_library_version(
+    db: AsyncSession, user_id: uuid.UUID, *, embeddings: bool = False
+) -> None:
+    """Mark the user's library as changed, invalidating every cached read.
+
+    Pass ``embeddings=True`` for writes that set a video's embedding or
+    delete a video: those also bump ``users.embedding_version``, which is
+    all the cached semantic index depends on.
+    """
+    values = {"library_version": User.library_version + 1}
+    if embeddings:
+        values["embedding_version"] = User.embedding_version + 1
+    await db.execute(update(User).where(User.id == user_id).values(**values))
+
+
+def library_etag(user: User) -> str:
+    """Weak ETag for any library read by ``user``.
+
+    Includes the date because some reads are relative to now (the stale and
+    recent review filters, the dashboard), so they are revalidated daily.
+    """
+    today = datetime.now(UTC).date().isoformat()
+    return f'W/"{user.id.hex}-{user.library_version or 0}-{today}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an ``If-None-Match`` header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,185 @@
+"""Keyset (cursor) pagination for the video list.
+
+A cursor is an opaque, URL-safe token holding the sort key values of the
+last item on a page. The next page is everything strictly after that item
+in the sort order, so it is found with an index range scan instead of
+counting past ``offset`` rows, and rows inserted meanwhile don't shift
+items between pages.
+
+Every ordering ends in ``videos.id`` so the key is unique. The cursor
+condition is a row-value comparison such as ``(created_at, id) < (:v,
+:id)``, which Postgres uses as the start of the index scan; an OR of
+per-column comparisons would only be applied as a filter while scanning
+from the top. A nullable leading column is ordered ``NULLS LAST`` in both
+directions, and the NULL rows are read as a separate segment after the
+others. A cursor also records how many rows came before the page it points
+to, so an exact total can be derived from a window count over the remaining
+rows.
+"""
+
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, and_, bindparam, or_, text, tuple_
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# How list_videos reports ``total``: exact (window count), estimated
+# (planner row estimate) or none (only ``has_more``)
+TOTAL_MODES = ("exact", "estimated", "none")
+
+
+class InvalidCursorError(ValueError):
+    """Raised for a malformed cursor or one issued for a different sort."""
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """One column of a keyset ordering."""
+
+    name: str
+    expr: ColumnElement
+    descending: bool
+    nullable: bool = False
+
+    def order_by(self) -> ColumnElement:
+        ordered = self.expr.desc() if self.descending else self.expr.asc()
+        return ordered.nulls_last() if self.nullable else ordered
+
+    def after(self, value: ColumnElement) -> ColumnElement:
+        """Non-NULL rows strictly after ``value`` in this order."""
+        return self.expr < value if self.descending else self.expr > value
+
+    def at_or_after(self, value: ColumnElement) -> ColumnElement:
+        return self.expr <= value if self.descending else self.expr >= value
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, uuid.UUID):
+        return {"uuid": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "uuid" in value:
+            return uuid.UUID(value["uuid"])
+        raise ValueError(f"Unknown cursor value {value!r}")
+    return value
+
+
+def encode_cursor(scope: str, values: list[Any], position: int) -> str:
+    """Build a cursor for the row with sort key ``values``.
+
+    ``scope`` identifies the ordering (e.g. ``"title:asc"``); a cursor is
+    only accepted back for the same scope. ``position`` is the number of
+    rows up to and including that row.
+    """
+    payload = {
+        "s": scope,
+        "v": [_encode_value(value) for value in values],
+        "n": position,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, scope: str, size: int) -> tuple[list[Any], int]:
+    """Return the sort key values and position stored in ``token``.
+
+    Raises:
+        InvalidCursorError: If the token is malformed, was issued for a
+            different ordering, or doesn't hold ``size`` values.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        values = [_decode_value(value) for value in payload["v"]]
+        position = int(payload["n"])
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+    if payload.get("s") != scope or len(values) != size:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return values, position
+
+
+def after_cursor(keys: list[SortKey], values: list[Any]) -> ColumnElement:
+    """Lexicographic "row comes after ``values``" condition for ``keys``.
+
+    ``values`` must not hold NULLs; ``cursor_segments`` handles those. When
+    every key sorts the same way this is a single row-value comparison,
+    e.g. ``(a, id) < (:va, :vid)``. Otherwise it is ``a after va OR (a = va
+    AND id after vid)`` behind a redundant ``a at or after va``, so the scan
+    still starts at the cursor rather than filtering up to it.
+    """
+    params = [
+        bindparam(f"cursor_{i}", value, type_=key.expr.type)
+        for i, (key, value) in enumerate(zip(keys, values, strict=True))
+    ]
+    if len(keys) == 1:
+        return keys[0].after(params[0])
+    if len({key.descending for key in keys}) == 1:
+        columns = tuple_(*(key.expr for key in keys))
+        bound = tuple_(*params)
+        return columns < bound if keys[0].descending else columns > bound
+    clauses = []
+    for i, key in enumerate(keys):
+        prefix = [keys[j].expr == params[j] for j in range(i)]
+        clauses.append(and_(*prefix, key.after(params[i])))
+    return and_(keys[0].at_or_after(params[0]), or_(*clauses))
+
+
+def cursor_segments(keys: list[SortKey], values: list[Any]) -> list[ColumnElement]:
+    """Conditions selecting the rows after ``values``, in the order to read them.
+
+    Each is read in ``keys`` order. Only the leading key may be nullable:
+    its NULL rows come last, as their own segment, so neither segment needs
+    an ``IS NULL`` alternative that the index can't start from.
+    """
+    if any(key.nullable for key in keys[1:]):
+        raise ValueError("Only the leading sort key may be nullable")
+    lead = keys[0]
+    if not lead.nullable:
+        return [after_cursor(keys, values)]
+    if values[0] is None:
+        # Already within the NULL rows, which are ordered by the other keys
+        return [and_(lead.expr.is_(None), after_cursor(keys[1:], values[1:]))]
+    return [
+        and_(lead.expr.is_not(None), after_cursor(keys, values)),
+        lead.expr.is_(None),
+    ]
+
+
+async def estimate_count(db: AsyncSession, query: Select) -> int | None:
+    """The planner's row estimate for ``query``, or ``None`` if unavailable.
+
+    Costs one planning pass and no execution. The estimate can be far off
+    for selective filters, so callers should only use it as a hint.
+    """
+    try:
+        sql = str(
+            query.order_by(None).compile(
+                dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+    except CompileError:
+        return None
+    # Escape colons so text() doesn't read casts or times as bind params
+    result = await db.execute(text("EXPLAIN (FORMAT JSON) " + sql.replace(":", r"\:")))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
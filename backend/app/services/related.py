@@ -0,0 +1,339 @@
+"""Precomputed related videos.
+
+A video's related videos are the other videos of the same user sharing the
+most keywords with it (ties broken by recency). Ranking them on every
+request meant loading each overlapping video and intersecting keyword sets
+in Python; the top ``settings.related_videos_top_k`` are now stored in
+``video_relations`` so the endpoint is a primary-key range scan.
+
+Whenever a video's keywords change, ``update_relations`` recomputes that
+video's own list. Other lists are patched rather than recomputed: the
+overlap score is symmetric, so only lists that include the video or that it
+can now enter change, and each is merged from its stored rows plus the
+video's new score. Only a full list whose last places the merge can't
+vouch for needs a fresh top-k scan. Those are capped per update; the rest
+keep the merged list, which may miss a neighbour, until the next rebuild.
+
+Existing libraries are filled by the rebuild command::
+
+    python -m app.services.related [--user USER_ID]
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import and_, any_, delete, distinct, func, insert, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import async_session, engine
+from app.logging_config import get_logger
+from app.models import User, Video, VideoRelation
+
+logger = get_logger(__name__)
+
+# "keywords" reads video_relations; "semantic" ranks by embedding similarity
+# (app.services.embeddings)
+RELATED_MODES = ("keywords", "semantic")
+
+# Videos whose lists are recomputed per INSERT ... SELECT
+REFRESH_BATCH_SIZE = 500
+
+# Lists recomputed from scratch per update_relations call
+REFILL_LIMIT = 50
+
+# Relation rows per multi-row INSERT, well under the bind parameter limit
+_INSERT_BATCH_ROWS = 1_000
+
+
+@dataclass(frozen=True)
+class _Relation:
+    related_video_id: uuid.UUID
+    score: int
+    created_at: datetime
+
+
+def _overlap_score(source, other):
+    """Number of distinct keywords ``other`` shares with ``source``."""
+    keyword = func.unnest(other.c.keywords).column_valued("keyword")
+    return (
+        select(func.count(distinct(keyword)))
+        .where(keyword == any_(source.c.keywords))
+        .correlate(source, other)
+        .scalar_subquery()
+        .label("score")
+    )
+
+
+def _overlaps(source, other):
+    """``other`` is another video of the same user sharing a keyword."""
+    return and_(
+        other.c.user_id == source.c.user_id,
+        other.c.id != source.c.id,
+        other.c.keywords.bool_op("&&")(source.c.keywords),
+    )
+
+
+def _top_k(relations: Iterable[_Relation]) -> list[_Relation]:
+    """Best first: score DESC, created_at DESC, id, as ``_ranked_relations``."""
+    ordered = sorted(relations, key=lambda r: r.related_video_id)
+    ordered.sort(key=lambda r: (r.score, r.created_at), reverse=True)
+    return ordered[: settings.related_videos_top_k]
+
+
+def _ranks_no_lower(a: _Relation, b: _Relation) -> bool:
+    if (a.score, a.created_at) != (b.score, b.created_at):
+        return (a.score, a.created_at) > (b.score, b.created_at)
+    return a.related_video_id <= b.related_video_id
+
+
+def _ranked_relations(video_ids: list[uuid.UUID]):
+    """SELECT of the top-k relation rows for each of ``video_ids``."""
+    source = Video.__table__.alias("source")
+    other = Video.__table__.alias("other")
+    score = _overlap_score(source, other)
+    neighbours = (
+        select(other.c.id, other.c.created_at, score)
+        .where(_overlaps(source, other))
+        .order_by(score.desc(), other.c.created_at.desc(), other.c.id)
+        .limit(settings.related_videos_top_k)
+        .lateral("neighbours")
+    )
+    rank = func.row_number().over(
+        partition_by=source.c.id,
+        order_by=(
+            neighbours.c.score.desc(),
+            neighbours.c.created_at.desc(),
+            neighbours.c.id,
+        ),
+    )
+    return (
+        select(source.c.id, rank, neighbours.c.id, neighbours.c.score)
+        .select_from(source.join(neighbours, true()))
+        .where(source.c.id.in_(video_ids))
+    )
+
+
+async def refresh_relations(db: AsyncSession, video_ids: Iterable[uuid.UUID]) -> None:
+    """Recompute the stored related videos of ``video_ids``."""
+    video_ids = list(dict.fromkeys(video_ids))
+    for start in range(0, len(video_ids), REFRESH_BATCH_SIZE):
+        batch = video_ids[start : start + REFRESH_BATCH_SIZE]
+        await db.execute(delete(VideoRelation).where(VideoRelation.video_id.in_(batch)))
+        await db.execute(
+            insert(VideoRelation).from_select(
+                ["video_id", "rank", "related_video_id", "score"],
+                _ranked_relations(batch),
+            )
+        )
+
+
+async def relation_referrers(
+    db: AsyncSession, video_ids: Iterable[uuid.UUID]
+) -> list[uuid.UUID]:
+    """Videos whose stored related videos include any of ``video_ids``.
+
+    Collect these before deleting videos: the rows pointing at a deleted
+    video go with it, leaving the referrers' lists short until refreshed.
+    """
+    result = await db.execute(
+        select(VideoRelation.video_id)
+        .distinct()
+        .where(VideoRelation.related_video_id.in_(list(video_ids)))
+    )
+    return list(result.scalars().all())
+
+
+async def _candidates(
+    db: AsyncSession, video_ids: list[uuid.UUID]
+) -> list[tuple[uuid.UUID, _Relation, int | None]]:
+    """``(video, relation to a changed video, its k-th stored score)`` rows.
+
+    One row per pair of a changed video and a video sharing one of its
+    keywords, found through the GIN index on keywords.
+    """
+    changed = Video.__table__.alias("changed")
+    other = Video.__table__.alias("other")
+    kth = VideoRelation.__table__.alias("kth")
+    result = await db.execute(
+        select(
+            other.c.id.label("video_id"),
+            changed.c.id.label("changed_id"),
+            _overlap_score(changed, other),
+            changed.c.created_at,
+            kth.c.score.label("kth_score"),
+        )
+        .select_from(
+            changed.join(other, _overlaps(changed, other)).outerjoin(
+                kth,
+                and_(
+                    kth.c.video_id == other.c.id,
+                    kth.c.rank == settings.related_videos_top_k,
+                ),
+            )
+        )
+        .where(changed.c.id.in_(video_ids))
+    )
+    return [
+        (other_id, _Relation(video_id, score, created_at), kth_score)
+        for other_id, video_id, score, created_at, kth_score in result.all()
+    ]
+
+
+async def _stored_relations(
+    db: AsyncSession, video_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, list[_Relation]]:
+    """The stored lists of ``video_ids``, best first."""
+    result = await db.execute(
+        select(
+            VideoRelation.video_id,
+            VideoRelation.related_video_id,
+            VideoRelation.score,
+            Video.created_at,
+        )
+        .join(Video, Video.id == VideoRelation.related_video_id)
+        .where(VideoRelation.video_id.in_(video_ids))
+        .order_by(VideoRelation.video_id, VideoRelation.rank)
+    )
+    stored: dict[uuid.UUID, list[_Relation]] = {}
+    for video_id, related_video_id, score, created_at in result.all():
+        stored.setdefault(video_id, []).append(
+            _Relation(related_video_id, score, created_at)
+        )
+    return stored
+
+
+async def _write_relations(
+    db: AsyncSession, lists: dict[uuid.UUID, list[_Relation]]
+) -> None:
+    """Replace the stored lists of ``lists``' keys with its values."""
+    rows = [
+        {
+            "video_id": video_id,
+            "rank": rank,
+            "related_video_id": relation.related_video_id,
+            "score": relation.score,
+        }
+        for video_id, relations in lists.items()
+        for rank, relation in enumerate(relations, start=1)
+    ]
+    video_ids = list(lists)
+    for start in range(0, len(video_ids), REFRESH_BATCH_SIZE):
+        batch = video_ids[start : start + REFRESH_BATCH_SIZE]
+        await db.execute(delete(VideoRelation).where(VideoRelation.video_id.in_(batch)))
+    for start in range(0, len(rows), _INSERT_BATCH_ROWS):
+        await db.execute(
+            insert(VideoRelation).values(rows[start : start + _INSERT_BATCH_ROWS])
+        )
+
+
+async def update_relations(
+    db: AsyncSession, user_id: uuid.UUID, video_ids: Iterable[uuid.UUID]
+) -> None:
+    """Bring every list affected by a keyword change of ``video_ids`` up to date.
+
+    Call after assigning the new keywords; pending changes are flushed first.
+    The changed videos' own lists are recomputed. Another video's list is
+    merged from its stored rows when it includes a changed video or a
+    changed video's new score reaches its k-th; it is only recomputed when
+    it was full and the merge can't vouch for its last places, since
+    neighbours below the old k-th were never stored.
+    """
+    video_ids = list(dict.fromkeys(video_ids))
+    if not video_ids:
+        return
+    await db.flush()
+    changed = set(video_ids)
+    await refresh_relations(db, video_ids)
+
+    entering: dict[uuid.UUID, list[_Relation]] = {}
+    affected: set[uuid.UUID] = set()
+    for other_id, relation, kth_score in await _candidates(db, video_ids):
+        if other_id in changed:
+            continue
+        entering.setdefault(other_id, []).append(relation)
+        if kth_score is None or relation.score >= kth_score:
+            affected.add(other_id)
+    affected.update(await relation_referrers(db, video_ids))
+    affected -= changed
+    if not affected:
+        return
+
+    stored = await _stored_relations(db, list(affected))
+    merged: dict[uuid.UUID, list[_Relation]] = {}
+    refill: list[uuid.UUID] = []
+    approximate = 0
+    for video_id in affected:
+        current = stored.get(video_id, [])
+        kept = [r for r in current if r.related_video_id not in changed]
+        relations = _top_k([*kept, *entering.get(video_id, [])])
+        # Unstored neighbours of a full list all rank below its old k-th, so
+        # the merge holds unless it is short or its k-th now ranks lower
+        if len(current) == settings.related_videos_top_k and not (
+            len(relations) == len(current)
+            and _ranks_no_lower(relations[-1], current[-1])
+        ):
+            if len(refill) < REFILL_LIMIT:
+                refill.append(video_id)
+                continue
+            approximate += 1
+        if relations != current:
+            merged[video_id] = relations
+    await _write_relations(db, merged)
+    await refresh_relations(db, refill)
+    if approximate:
+        logger.info(
+            "Left %d related-video list(s) of user %s approximate until a rebuild",
+            approximate,
+            user_id,
+        )
+
+
+async def rebuild_relations(user_id: uuid.UUID | None = None) -> int:
+    """Recompute every stored list, one user per transaction.
+
+    Returns the number of videos processed.
+    """
+    async with async_session() as db:
+        user_query = select(User.id).order_by(User.id)
+        if user_id is not None:
+            user_query = user_query.where(User.id == user_id)
+        user_ids = list((await db.execute(user_query)).scalars().all())
+
+    total = 0
+    for uid in user_ids:
+        async with async_session() as db:
+            result = await db.execute(
+                select(Video.id).where(Video.user_id == uid).order_by(Video.id)
+            )
+            video_ids = list(result.scalars().all())
+            await refresh_relations(db, video_ids)
+            await db.commit()
+        logger.info("Rebuilt related videos of user %s (%d)", uid, len(video_ids))
+        total += len(video_ids)
+    return total
+
+
+async def _run(args: argparse.Namespace) -> int:
+    try:
+        return await rebuild_relations(args.user)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild the video_relations table")
+    parser.add_argument("--user", type=uuid.UUID, help="only this user's videos")
+    args = parser.parse_args(argv)
+    total = asyncio.run(_run(args))
+    sys.stdout.write(f"Rebuilt related videos for {total} video(s)\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
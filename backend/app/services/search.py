@@ -0,0 +1,182 @@
+"""Library search: full-text over ``videos.search_vector``, or fuzzy.
+
+The vector is a stored generated column (see the ``videos`` model): title
+(weight A), channel and keywords (B), key knowledge (C) and explanation (D),
+all run through ``unaccent`` and the ``simple`` configuration so Vietnamese
+text matches with or without diacritics and no English stemming is applied.
+
+Fuzzy mode matches only titles and channel names, by trigram word
+similarity, so typos and partial words still find something. Both columns
+have ``pg_trgm`` GIN indexes on the same unaccented, lower-cased
+expressions used here.
+
+Hybrid mode fuses the full-text ranking with embedding similarity
+(``app.services.embeddings``) by reciprocal rank fusion. Each side
+contributes at most ``settings.hybrid_search_candidates`` videos, so the
+fused set, and the work done on it, stays bounded as the library grows.
+Semantic candidates must clear ``settings.semantic_min_similarity``; RRF
+scores ranks, not similarities, so anything weaker would be fused in as if
+it were a real match.
+"""
+
+import re
+import uuid
+
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Select,
+    any_,
+    bindparam,
+    func,
+    literal_column,
+    or_,
+    select,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Video
+from app.services.embeddings import EmbeddingIndex
+
+SEARCH_MODES = ("fulltext", "fuzzy", "hybrid")
+
+# The usual RRF constant: damps the weight of the very first ranks
+RRF_K = 60
+
+_TS_CONFIG = literal_column("'simple'::regconfig")
+_WORD = re.compile(r"\w+", re.UNICODE)
+# Quotes, "OR" and -exclusions switch to websearch_to_tsquery semantics
+_WEBSEARCH_SYNTAX = re.compile(r'"|(?:^|\s)-\w|\sOR\s')
+
+
+def build_tsquery(search: str) -> ColumnElement | None:
+    """Translate a user search string into a ``tsquery`` expression.
+
+    Plain words become an AND of prefix matches (``pyth`` finds
+    ``python``), which keeps search-as-you-type working. Queries using
+    quotes, ``OR`` or ``-word`` are handed to ``websearch_to_tsquery`` for
+    phrase, alternative and exclusion matching.
+
+    Returns:
+        The tsquery, or ``None`` when ``search`` contains no words.
+    """
+    text = search.strip()
+    if _WEBSEARCH_SYNTAX.search(text):
+        return func.websearch_to_tsquery(_TS_CONFIG, func.immutable_unaccent(text))
+
+    words = _WORD.findall(text)
+    if not words:
+        return None
+    prefix_query = " & ".join(f"{word}:*" for word in words)
+    return func.to_tsquery(_TS_CONFIG, func.immutable_unaccent(prefix_query))
+
+
+def search_filter(tsquery: ColumnElement) -> ColumnElement:
+    return Video.search_vector.op("@@")(tsquery)
+
+
+def search_rank(tsquery: ColumnElement) -> ColumnElement:
+    """Cover-density rank; title hits (weight A) count the most."""
+    return func.ts_rank_cd(Video.search_vector, tsquery)
+
+
+def _normalized(expr: ColumnElement) -> ColumnElement:
+    return func.immutable_unaccent(func.lower(expr))
+
+
+# Must match the ix_videos_*_trgm index expressions
+FUZZY_COLUMNS = (_normalized(Video.title), _normalized(Video.channel_name))
+
+
+def fuzzy_query(search: str) -> ColumnElement:
+    """Normalized search text, bound once and shared by filter and rank."""
+    return _normalized(bindparam("fuzzy_query", search.strip()))
+
+
+def fuzzy_filter(query: ColumnElement) -> ColumnElement:
+    """Title or channel contains ``query``, or is similar to it.
+
+    ``<%`` (word similarity above ``pg_trgm.word_similarity_threshold``) and
+    ``LIKE`` can both use the trigram indexes.
+    """
+    return or_(
+        *(query.op("<%")(column) for column in FUZZY_COLUMNS),
+        *(column.contains(query) for column in FUZZY_COLUMNS),
+    )
+
+
+def fuzzy_rank(query: ColumnElement) -> ColumnElement:
+    return func.greatest(
+        *(func.word_similarity(query, column) for column in FUZZY_COLUMNS)
+    )
+
+
+async def set_fuzzy_threshold(db: AsyncSession) -> None:
+    """Apply ``settings.fuzzy_search_threshold`` for the current transaction."""
+    await db.execute(
+        select(
+            func.set_config(
+                "pg_trgm.word_similarity_threshold",
+                str(settings.fuzzy_search_threshold),
+                True,
+            )
+        )
+    )
+
+
+async def hybrid_candidates(
+    db: AsyncSession, query: Select, search: str, index: EmbeddingIndex
+) -> list[uuid.UUID]:
+    """Videos for a hybrid search, best fused rank first.
+
+    ``query`` is the filtered video query; the full-text candidates are
+    its best matches by ``ts_rank_cd``. Semantic candidates come from the
+    user's whole embedding index, above ``index.min_similarity``, and are
+    filtered along with the rest once the fused ids are applied to
+    ``query``. A search with neither kind of match fuses to nothing.
+    """
+    limit = settings.hybrid_search_candidates
+    lexical: list[uuid.UUID] = []
+    tsquery = build_tsquery(search)
+    if tsquery is not None:
+        rank = search_rank(tsquery)
+        result = await db.execute(
+            query.with_only_columns(Video.id)
+            .where(search_filter(tsquery))
+            .order_by(rank.desc(), Video.created_at.desc(), Video.id.desc())
+            .limit(limit)
+        )
+        lexical = list(result.scalars().all())
+    semantic = [
+        match.video_id
+        for match in index.query_text(search, limit)
+        if match.score >= index.min_similarity
+    ]
+    return reciprocal_rank_fusion(lexical, semantic)
+
+
+def reciprocal_rank_fusion(*rankings: list[uuid.UUID]) -> list[uuid.UUID]:
+    """Merge rankings by the sum of ``1 / (RRF_K + rank)``, best first.
+
+    Ties keep the order of first appearance, earlier rankings first.
+    """
+    scores: dict[uuid.UUID, float] = {}
+    for ranking in rankings:
+        for position, video_id in enumerate(ranking, start=1):
+            scores[video_id] = scores.get(video_id, 0.0) + 1.0 / (RRF_K + position)
+    return sorted(scores, key=lambda video_id: -scores[video_id])
+
+
+def _hybrid_ids(video_ids: list[uuid.UUID]) -> ColumnElement:
+    return bindparam("hybrid_ids", video_ids, type_=ARRAY(UUID(as_uuid=True)))
+
+
+def hybrid_filter(video_ids: list[uuid.UUID]) -> ColumnElement:
+    return Video.id == any_(_hybrid_ids(video_ids))
+
+
+def hybrid_rank(video_ids: list[uuid.UUID]) -> ColumnElement:
+    """Higher for better fused ranks; unique, so it orders without ties."""
+    return -func.array_position(_hybrid_ids(video_ids), Video.id)
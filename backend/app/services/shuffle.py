@@ -0,0 +1,53 @@
+"""Seeded shuffle order for the video list.
+
+Every video gets a uniformly random, indexed ``random_key`` when it is
+created. A shuffle lists the videos by ``(random_key, id)`` starting at a
+point derived from the seed and wrapping around once the end is reached.
+That is at most two range scans of ``ix_videos_user_random_key``: a page
+reads only its own rows, and the same seed always gives the same order,
+so pages never repeat or skip a video.
+
+Different seeds rotate one per-row permutation rather than drawing a new
+one, which is plenty for "show me something from my library".
+"""
+
+import hashlib
+import random
+from typing import Any
+
+from sqlalchemy import ColumnElement, and_, bindparam
+
+from app.models import Video
+from app.services.pagination import SortKey, after_cursor
+
+SHUFFLE_KEYS = [
+    SortKey("random_key", Video.random_key, descending=False),
+    SortKey("id", Video.id, descending=False),
+]
+
+
+def shuffle_start(seed: str | None) -> float:
+    """Start point in ``[0, 1)`` for ``seed``, or a random one without a seed."""
+    if seed is None:
+        return random.random()
+    digest = hashlib.sha256(seed.encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2**64
+
+
+def shuffle_segments(
+    start: float, after: list[Any] | None = None
+) -> list[ColumnElement]:
+    """Conditions selecting the rest of the shuffle, in the order to read them.
+
+    Each is read in ``SHUFFLE_KEYS`` order. ``after`` holds the key values
+    of the last row already returned, if any.
+    """
+    start_param = bindparam("shuffle_start", start, type_=Video.random_key.type)
+    head = Video.random_key >= start_param
+    tail = Video.random_key < start_param
+    if after is None:
+        return [head, tail]
+    resume = after_cursor(SHUFFLE_KEYS, after)
+    if after[0] >= start:
+        return [and_(head, resume), tail]
+    return [and_(tail, resume)]
@@ -1,6 +1,9 @@
 """GPT-powered knowledge analysis service for video transcripts."""
 
-from dataclasses import dataclass
+import math
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any, Protocol
 
 from openai import AsyncOpenAI
 from pydantic import BaseModel, Field
@@ -55,6 +58,34 @@ class _KnowledgeSchema(BaseModel):
     )
 
 
+@dataclass(frozen=True)
+class AnalysisUsage:
+    """Token accounting reported by the provider for one analysis call."""
+
+    prompt_version: str
+    prompt_tokens: int
+    cached_tokens: int
+    completion_tokens: int
+    reasoning_tokens: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def total(cls, usages: Iterable["AnalysisUsage"]) -> "AnalysisUsage | None":
+        """Summed usage of several calls, e.g. a video's chapters."""
+        usages = list(usages)
+        if not usages:
+            return None
+        return cls(
+            prompt_version=usages[0].prompt_version,
+            prompt_tokens=sum(u.prompt_tokens for u in usages),
+            cached_tokens=sum(u.cached_tokens for u in usages),
+            completion_tokens=sum(u.completion_tokens for u in usages),
+            reasoning_tokens=sum(u.reasoning_tokens for u in usages),
+        )
+
+
 @dataclass(frozen=True)
 class KnowledgeResult:
     """Immutable result from the knowledge analysis pipeline."""
@@ -65,6 +96,152 @@ class KnowledgeResult:
     real_world_applications: str
     keywords: list[str]
     category: str
+    usage: AnalysisUsage | None = None
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Model and generation limits chosen for a single analysis call."""
+
+    tier: str
+    model: str
+    reasoning_effort: str
+    max_output_tokens: int
+    transcript_chars: int
+    estimated_latency_seconds: float
+    estimated_cost_usd: float
+    downgraded: bool = False
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SummarizerBackend(Protocol):
+    """Interface shared by the LLM and local (extractive) summarizers.
+
+    The ingest pipeline (``app.services.video_jobs``) only talks to its
+    primary and fallback summarizers through this.
+    """
+
+    async def analyze(
+        self,
+        transcript: str,
+        title: str,
+        categories: list[dict[str, str]],
+        route: ModelRoute | None = None,
+    ) -> KnowledgeResult: ...
+
+
+# ---------------------------------------------------------------------------
+# Model routing
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class _ModelProfile:
+    """Rough per-model numbers used only to estimate latency and cost."""
+
+    input_usd_per_mtok: float
+    output_usd_per_mtok: float
+    output_tokens_per_second: float
+    input_tokens_per_second: float
+    efforts: tuple[str, ...]  # cheapest first
+
+
+_MODEL_PROFILES: dict[str, _ModelProfile] = {
+    "gpt-5.2": _ModelProfile(1.75, 14.0, 60.0, 4000.0, ("none", "low", "medium")),
+    "gpt-5-mini": _ModelProfile(0.25, 2.0, 120.0, 8000.0, ("minimal", "low", "medium")),
+}
+_DEFAULT_PROFILE = _MODEL_PROFILES["gpt-5.2"]
+
+# (preferred reasoning effort, expected visible output tokens) by transcript
+# size tier. Short transcripts, the common case, keep the original
+# no-reasoning call; longer ones get some reasoning to organise the material.
+_TIERS = {
+    "short": ("none", 4_000),
+    "medium": ("low", 6_000),
+    "long": ("low", 8_000),
+}
+
+# Hidden reasoning tokens, as a multiple of the visible output
+_REASONING_MULTIPLIER = {"none": 0.0, "minimal": 0.1, "low": 0.3, "medium": 1.0}
+
+# max_completion_tokens over the expected output plus reasoning. Hitting the
+# cap loses the whole structured response, so leave room for long analyses.
+_OUTPUT_CAP_HEADROOM = 2.0
+
+# Average characters per token
+_CHARS_PER_TOKEN = 4
+# System prompt, schema and title on top of the transcript itself
+_PROMPT_OVERHEAD_TOKENS = 1_500
+
+
+def _generated_tokens(effort: str, output_tokens: int) -> float:
+    """Expected visible output plus hidden reasoning tokens."""
+    return output_tokens * (1.0 + _REASONING_MULTIPLIER.get(effort, 1.0))
+
+
+def _estimate(
+    model: str, effort: str, transcript_chars: int, output_tokens: int
+) -> tuple[float, float]:
+    """Return (latency_seconds, cost_usd) estimates for one call."""
+    profile = _MODEL_PROFILES.get(model, _DEFAULT_PROFILE)
+    input_tokens = transcript_chars / _CHARS_PER_TOKEN + _PROMPT_OVERHEAD_TOKENS
+    generated = _generated_tokens(effort, output_tokens)
+
+    latency = (
+        input_tokens / profile.input_tokens_per_second
+        + generated / profile.output_tokens_per_second
+    )
+    cost = (
+        input_tokens * profile.input_usd_per_mtok
+        + generated * profile.output_usd_per_mtok
+    ) / 1_000_000
+    return round(latency, 1), round(cost, 4)
+
+
+def route_for_transcript(transcript_chars: int) -> ModelRoute:
+    """Pick model, reasoning effort and output limit for a transcript.
+
+    The size tier sets the preferred effort and expected output. If the
+    estimate exceeds the configured latency or cost budget, reasoning effort
+    is stepped down first and the fast model is used as a last resort. The
+    output limit is sized for the chosen effort, with headroom.
+    """
+    if transcript_chars >= settings.summarizer_long_transcript_chars:
+        tier = "long"
+    elif transcript_chars >= settings.summarizer_medium_transcript_chars:
+        tier = "medium"
+    else:
+        tier = "short"
+    preferred_effort, output_tokens = _TIERS[tier]
+
+    candidates: list[tuple[str, str]] = []
+    for model in (settings.summarizer_model, settings.summarizer_fast_model):
+        efforts = _MODEL_PROFILES.get(model, _DEFAULT_PROFILE).efforts
+        start = efforts.index(preferred_effort) if preferred_effort in efforts else 0
+        candidates.extend((model, effort) for effort in reversed(efforts[: start + 1]))
+
+    for position, (model, effort) in enumerate(candidates):
+        latency, cost = _estimate(model, effort, transcript_chars, output_tokens)
+        within_budget = (
+            latency <= settings.summarizer_latency_budget_seconds
+            and cost <= settings.summarizer_cost_budget_usd
+        )
+        if within_budget or position == len(candidates) - 1:
+            return ModelRoute(
+                tier=tier,
+                model=model,
+                reasoning_effort=effort,
+                max_output_tokens=math.ceil(
+                    _generated_tokens(effort, output_tokens) * _OUTPUT_CAP_HEADROOM
+                ),
+                transcript_chars=transcript_chars,
+                estimated_latency_seconds=latency,
+                estimated_cost_usd=cost,
+                downgraded=position > 0,
+            )
+    raise AssertionError("unreachable: candidate list is never empty")
 
 
 # ---------------------------------------------------------------------------
@@ -119,26 +296,100 @@ Even if the original video is in English or another language, your output must b
 """
 
 
+# ---------------------------------------------------------------------------
+# Prompt assembly
+# ---------------------------------------------------------------------------
+
+# Bump whenever _SYSTEM_PROMPT, the category block or _KnowledgeSchema change,
+# so cached prefixes and stored analyses can be told apart.
+PROMPT_VERSION = "knowledge-2026-10.1"
+
+
+@dataclass(frozen=True)
+class AnalysisPrompt:
+    """Chat messages for one analysis, ordered from most to least stable."""
+
+    version: str
+    messages: list[dict[str, str]]
+
+
+def build_analysis_prompt(
+    transcript: str, title: str, categories: list[dict[str, str]]
+) -> AnalysisPrompt:
+    """Assemble the analysis prompt with a byte-stable leading prefix.
+
+    Provider-side prompt caching matches on the longest identical prefix, so
+    the static instructions always come first and stay untouched. The
+    per-user category list follows (sorted, so it is stable for a given
+    user), and the per-video title and transcript come last.
+    """
+    cat_lines = "\n".join(
+        f"- `{c['slug']}`: {c['name']}"
+        for c in sorted(categories, key=lambda c: c["slug"])
+    )
+    category_instruction = (
+        f"### category\n"
+        f"- Classify this video into exactly one of these categories by returning its slug:\n{cat_lines}\n"
+        f"- If none fit well, use `other`."
+    )
+    user_message = f"## Video Title\n{title}\n\n## Transcript\n{transcript}"
+
+    return AnalysisPrompt(
+        version=PROMPT_VERSION,
+        messages=[
+            {"role": "system", "content": _SYSTEM_PROMPT},
+            {"role": "system", "content": category_instruction},
+            {"role": "user", "content": user_message},
+        ],
+    )
+
+
+def _usage_from_response(response: Any, prompt_version: str) -> AnalysisUsage | None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    prompt_details = getattr(usage, "prompt_tokens_details", None)
+    completion_details = getattr(usage, "completion_tokens_details", None)
+    return AnalysisUsage(
+        prompt_version=prompt_version,
+        prompt_tokens=usage.prompt_tokens or 0,
+        cached_tokens=getattr(prompt_details, "cached_tokens", None) or 0,
+        completion_tokens=usage.completion_tokens or 0,
+        reasoning_tokens=getattr(completion_details, "reasoning_tokens", None) or 0,
+    )
+
+
 # ---------------------------------------------------------------------------
 # SummarizerService
 # ---------------------------------------------------------------------------
 
 
-class SummarizerService:
+class SummarizerService(SummarizerBackend):
     """Service for analyzing video transcripts using OpenAI GPT."""
 
     def __init__(self) -> None:
         self.logger = get_logger(__name__)
         self.client = AsyncOpenAI(api_key=settings.openai_api_key)
 
+    def route(self, transcript: str) -> ModelRoute:
+        """Choose the model route for ``transcript`` (see ``route_for_transcript``)."""
+        return route_for_transcript(len(transcript))
+
     async def analyze(
-        self, transcript: str, title: str, categories: list[dict[str, str]]
+        self,
+        transcript: str,
+        title: str,
+        categories: list[dict[str, str]],
+        route: ModelRoute | None = None,
     ) -> KnowledgeResult:
         """Analyze a video transcript into structured knowledge sections.
 
         Args:
             transcript: The full transcript text.
             title: The video title (provides context to the model).
+            categories: The user's categories as ``{"slug", "name"}`` dicts.
+            route: Pre-computed model route; chosen from the transcript
+                length when omitted.
 
         Returns:
             A KnowledgeResult with explanation, critical_analysis,
@@ -147,29 +398,32 @@ class SummarizerService:
         Raises:
             RuntimeError: If the OpenAI API call fails.
         """
+        if route is None:
+            route = self.route(transcript)
         self.logger.info(
-            "Analyzing transcript for '%s' (%d chars)", title, len(transcript)
+            "Analyzing transcript for '%s' (%d chars) — model=%s, effort=%s, tier=%s",
+            title,
+            len(transcript),
+            route.model,
+            route.reasoning_effort,
+            route.tier,
         )
 
-        cat_lines = "\n".join(f"- `{c['slug']}`: {c['name']}" for c in categories)
-        category_instruction = (
-            f"\n\n### category\n"
-            f"- Classify this video into exactly one of these categories by returning its slug:\n{cat_lines}\n"
-            f"- If none fit well, use `other`."
-        )
-        system_prompt = _SYSTEM_PROMPT + category_instruction
+        prompt = build_analysis_prompt(transcript, title, categories)
 
-        user_message = f"## Video Title\n{title}\n\n## Transcript\n{transcript}"
+        # Sampling temperature is only accepted when reasoning is disabled.
+        sampling = {"temperature": 0.3} if route.reasoning_effort == "none" else {}
 
         try:
             response = await self.client.beta.chat.completions.parse(
-                model="gpt-5.2",
-                temperature=0.3,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
+                model=route.model,
+                reasoning_effort=route.reasoning_effort,
+                max_completion_tokens=route.max_output_tokens,
+                messages=prompt.messages,
                 response_format=_KnowledgeSchema,
+                # Routes requests sharing the static prefix to the same cache.
+                extra_body={"prompt_cache_key": prompt.version},
+                **sampling,
             )
 
             parsed = response.choices[0].message.parsed
@@ -186,12 +440,16 @@ class SummarizerService:
                 real_world_applications=parsed.real_world_applications,
                 keywords=parsed.keywords,
                 category=parsed.category,
+                usage=_usage_from_response(response, prompt.version),
             )
 
             self.logger.info(
-                "Analysis complete — explanation=%d chars, keywords=%s",
+                "Analysis complete — explanation=%d chars, keywords=%s, "
+                "prompt_tokens=%s, cached_tokens=%s",
                 len(result.explanation),
                 result.keywords,
+                result.usage.prompt_tokens if result.usage else "?",
+                result.usage.cached_tokens if result.usage else "?",
             )
             return result
 
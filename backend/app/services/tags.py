@@ -2,7 +2,7 @@ import uuid
 from collections import defaultdict
 from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import ARRAY, ColumnElement, String, bindparam, cast, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import TagAlias, Video
@@ -47,6 +47,17 @@ async def canonicalize_keywords(
     return normalize_keywords(canonicalized)
 
 
+def keywords_filter(tags: list[str], *, match_all: bool) -> ColumnElement:
+    """``keywords @> tags`` (all) or ``keywords && tags`` (any).
+
+    Both operators are served by the GIN index on ``videos.keywords``.
+    ``tags`` must already be canonicalized, since stored keywords are.
+    """
+    operator = "@>" if match_all else "&&"
+    tags_param = bindparam("tags", tags, type_=ARRAY(String))
+    return Video.keywords.bool_op(operator)(cast(tags_param, ARRAY(String)))
+
+
 def collect_tag_stats(videos: list[Video]) -> list[dict[str, object]]:
     counts: dict[str, int] = defaultdict(int)
     last_used: dict[str, datetime] = {}
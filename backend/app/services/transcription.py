@@ -1,6 +1,7 @@
 """Whisper-based fallback transcription for videos without captions."""
 
-import tempfile
+import asyncio
+import os
 from pathlib import Path
 
 import yt_dlp
@@ -10,11 +11,16 @@ from pydub import AudioSegment
 
 from app.config import settings
 from app.logging_config import get_logger
+from app.services.audio_cache import AudioCache, AudioCacheEntry
 
 # Whisper API hard limit
 _WHISPER_MAX_MB = 25
 # Target chunk size — kept under the limit with headroom
 _CHUNK_TARGET_MB = 20
+# Codec/bitrate the audio is extracted with; part of the cache key
+_AUDIO_CODEC = "mp3"
+_AUDIO_QUALITY = "128"
+AUDIO_PROFILE = f"{_AUDIO_CODEC}-{_AUDIO_QUALITY}"
 
 
 class TranscriptionService:
@@ -26,6 +32,9 @@ class TranscriptionService:
             api_key=settings.openai_api_key,
             timeout=httpx.Timeout(300.0, connect=10.0),  # 5 min for large uploads
         )
+        self.audio_cache = AudioCache(
+            settings.audio_cache_dir, settings.audio_cache_max_mb * 1024 * 1024
+        )
 
     async def transcribe_with_whisper(self, youtube_id: str) -> tuple[str, str]:
         """Download audio via yt-dlp and transcribe with OpenAI Whisper API.
@@ -37,6 +46,10 @@ class TranscriptionService:
         split into chunks and each chunk is transcribed separately before
         the results are joined.
 
+        Audio and per-chunk texts are kept in the on-disk audio cache, so a
+        retry after a partial failure skips the download and every chunk
+        that already succeeded.
+
         Args:
             youtube_id: The 11-character YouTube video ID.
 
@@ -46,62 +59,35 @@ class TranscriptionService:
         Raises:
             RuntimeError: If audio download or transcription fails.
         """
-        video_url = f"https://www.youtube.com/watch?v={youtube_id}"
-
         try:
-            self.logger.info(
-                "Downloading audio for Whisper transcription: %s", youtube_id
-            )
-
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                output_template = str(Path(tmp_dir) / "%(id)s.%(ext)s")
-
-                ydl_opts = {
-                    "format": "bestaudio/best",
-                    "quiet": True,
-                    "no_warnings": True,
-                    "outtmpl": output_template,
-                    "postprocessors": [
-                        {
-                            "key": "FFmpegExtractAudio",
-                            "preferredcodec": "mp3",
-                            "preferredquality": "128",
-                        }
-                    ],
-                }
-
-                with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                    ydl.download([video_url])
-
-                audio_files = list(Path(tmp_dir).glob("*.mp3"))
-                if not audio_files:
-                    raise RuntimeError(
-                        f"Audio download produced no mp3 file for video: {youtube_id}"
-                    )
-
-                audio_path = audio_files[0]
-                file_size_mb = audio_path.stat().st_size / (1024 * 1024)
-                self.logger.info(
-                    "Audio downloaded: %s (%.1f MB)", audio_path.name, file_size_mb
+            entry = self.audio_cache.entry(youtube_id, AUDIO_PROFILE)
+            audio_path = entry.audio_path
+            if audio_path is None:
+                audio_path = self._download_audio(youtube_id, entry)
+                self.audio_cache.evict(keep=entry)
+            else:
+                self.logger.info("Reusing cached audio for %s", youtube_id)
+
+            file_size_mb = audio_path.stat().st_size / (1024 * 1024)
+            self.logger.info("Audio ready: %s (%.1f MB)", audio_path.name, file_size_mb)
+
+            if file_size_mb > _WHISPER_MAX_MB:
+                transcript_text = await self._transcribe_in_chunks(
+                    audio_path, file_size_mb, entry
                 )
+            else:
+                transcript_text = await self._transcribe_cached(audio_path, entry, 1, 0)
 
-                if file_size_mb > _WHISPER_MAX_MB:
-                    transcript_text = await self._transcribe_in_chunks(
-                        audio_path, file_size_mb, tmp_dir
-                    )
-                else:
-                    transcript_text = await self._transcribe_file(audio_path)
-
-                if not transcript_text:
-                    raise RuntimeError(
-                        f"Whisper returned empty transcription for video: {youtube_id}"
-                    )
-
-                self.logger.info(
-                    "Whisper transcription complete — %d characters",
-                    len(transcript_text),
+            if not transcript_text:
+                raise RuntimeError(
+                    f"Whisper returned empty transcription for video: {youtube_id}"
                 )
-                return transcript_text, "whisper"
+
+            self.logger.info(
+                "Whisper transcription complete — %d characters",
+                len(transcript_text),
+            )
+            return transcript_text, "whisper"
 
         except RuntimeError:
             raise
@@ -113,6 +99,53 @@ class TranscriptionService:
                 f"Whisper transcription failed for video {youtube_id}: {exc}"
             ) from exc
 
+    def _download_audio(self, youtube_id: str, entry: AudioCacheEntry) -> Path:
+        """Download the audio track with yt-dlp and store it in the cache."""
+        video_url = f"https://www.youtube.com/watch?v={youtube_id}"
+        self.logger.info("Downloading audio for Whisper transcription: %s", youtube_id)
+
+        with self.audio_cache.scratch_dir() as tmp_dir:
+            output_template = str(Path(tmp_dir) / "%(id)s.%(ext)s")
+
+            ydl_opts = {
+                "format": "bestaudio/best",
+                "quiet": True,
+                "no_warnings": True,
+                "outtmpl": output_template,
+                "postprocessors": [
+                    {
+                        "key": "FFmpegExtractAudio",
+                        "preferredcodec": _AUDIO_CODEC,
+                        "preferredquality": _AUDIO_QUALITY,
+                    }
+                ],
+            }
+
+            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+                ydl.download([video_url])
+
+            audio_files = list(Path(tmp_dir).glob(f"*.{_AUDIO_CODEC}"))
+            if not audio_files:
+                raise RuntimeError(
+                    f"Audio download produced no mp3 file for video: {youtube_id}"
+                )
+            return entry.store_audio(audio_files[0])
+
+    async def _transcribe_cached(
+        self, audio_path: Path, entry: AudioCacheEntry, num_chunks: int, index: int
+    ) -> str:
+        """Transcribe one chunk, reusing its text if an earlier run saved it."""
+        cached = entry.chunk_text(num_chunks, index)
+        if cached is not None:
+            self.logger.info(
+                "Reusing cached transcription of chunk %d/%d", index + 1, num_chunks
+            )
+            return cached
+
+        text = await self._transcribe_file(audio_path)
+        entry.store_chunk_text(num_chunks, index, text)
+        return text
+
     async def _transcribe_file(self, audio_path: Path) -> str:
         """Send a single audio file to the Whisper API and return the text."""
         with open(audio_path, "rb") as audio_file:
@@ -124,20 +157,22 @@ class TranscriptionService:
         return str(transcription).strip()
 
     async def _transcribe_in_chunks(
-        self, audio_path: Path, file_size_mb: float, tmp_dir: str
+        self, audio_path: Path, file_size_mb: float, entry: AudioCacheEntry
     ) -> str:
         """Split the audio into chunks and transcribe them in parallel.
 
+        Chunk files and the text of every chunk that transcribed successfully
+        are kept in the audio cache, so a retry only re-sends the chunks that
+        failed last time.
+
         Args:
             audio_path: Path to the full MP3 file.
             file_size_mb: Known size of the file in MB.
-            tmp_dir: Temporary directory to write chunk files into.
+            entry: Audio cache entry to read/write chunk files and texts.
 
         Returns:
             Combined transcript text from all chunks.
         """
-        import asyncio
-
         num_chunks = int(file_size_mb / _CHUNK_TARGET_MB) + 1
         self.logger.info(
             "File is %.1f MB — splitting into %d chunks for parallel Whisper transcription",
@@ -145,29 +180,40 @@ class TranscriptionService:
             num_chunks,
         )
 
-        audio = AudioSegment.from_mp3(audio_path)
-        chunk_duration_ms = len(audio) // num_chunks
-
-        # Export all chunks first
-        chunk_paths: list[Path] = []
-        for i in range(num_chunks):
+        chunk_dir = entry.chunk_dir(num_chunks)
+        chunk_paths = [chunk_dir / f"chunk_{i}.mp3" for i in range(num_chunks)]
+        missing = [
+            i
+            for i, path in enumerate(chunk_paths)
+            if not path.is_file() and entry.chunk_text(num_chunks, i) is None
+        ]
+
+        # Export the chunks we have neither audio nor text for
+        if missing:
+            audio = AudioSegment.from_mp3(audio_path)
+            chunk_duration_ms = len(audio) // num_chunks
+        for i in missing:
             start_ms = i * chunk_duration_ms
             end_ms = len(audio) if i == num_chunks - 1 else start_ms + chunk_duration_ms
 
             chunk = audio[start_ms:end_ms]
-            chunk_path = Path(tmp_dir) / f"chunk_{i}.mp3"
-            chunk.export(chunk_path, format="mp3")
+            chunk_path = chunk_paths[i]
+            partial = chunk_path.with_suffix(".mp3.part")
+            chunk.export(partial, format="mp3")
+            os.replace(partial, chunk_path)
 
             chunk_size_mb = chunk_path.stat().st_size / (1024 * 1024)
             self.logger.info(
                 "Prepared chunk %d/%d (%.1f MB)", i + 1, num_chunks, chunk_size_mb
             )
-            chunk_paths.append(chunk_path)
 
         # Transcribe all chunks in parallel
         self.logger.info("Sending %d chunks to Whisper in parallel...", num_chunks)
         parts = await asyncio.gather(
-            *(self._transcribe_file(path) for path in chunk_paths)
+            *(
+                self._transcribe_cached(path, entry, num_chunks, i)
+                for i, path in enumerate(chunk_paths)
+            )
         )
 
         self.logger.info("All %d chunks transcribed successfully", num_chunks)
@@ -1,19 +1,62 @@
+import asyncio
+import time
 import uuid
+from dataclasses import dataclass
+from typing import Any
 
 from sqlalchemy import select
+from sqlalchemy.orm import undefer
 
+from app.config import settings
 from app.database import async_session
 from app.logging_config import get_logger
-from app.models import Category, Video, VideoJob
-from app.services.summarizer import SummarizerService
+from app.models import Category, UserSettings, Video, VideoJob
+from app.services.analysis_cache import AnalysisCache, analysis_cache_key
+from app.services.chapters import (
+    group_chapters,
+    merge_chapter_analyses,
+    split_by_chapters,
+)
+from app.services.compaction import compact_transcript
+from app.services.cost_guard import CostLimitExceededError, check_job
+from app.services.embeddings import embed_text
+from app.services.excerpt import make_excerpt
+from app.services.extractive import (
+    ExtractiveSummarizerService,
+    LocalPreview,
+    build_local_preview,
+)
+from app.services.fakes import (
+    FakeSummarizerService,
+    FakeTranscriptionService,
+    FakeYouTubeService,
+)
+from app.services.library import bump_library_version
+from app.services.related import update_relations
+from app.services.summarizer import (
+    PROMPT_VERSION,
+    AnalysisUsage,
+    KnowledgeResult,
+    ModelRoute,
+    SummarizerBackend,
+    SummarizerService,
+    route_for_transcript,
+)
 from app.services.tags import canonicalize_keywords
 from app.services.transcription import TranscriptionService
-from app.services.youtube import TranscriptNotAvailableError, YouTubeService
-
+from app.services.youtube import (
+    Chapter,
+    TranscriptNotAvailableError,
+    TranscriptSegment,
+    VideoMetadata,
+    YouTubeService,
+    join_segments,
+)
 
 JOB_STEPS = [
     "Fetching video information",
     "Transcribing content",
+    "Building preview",
     "Analyzing knowledge",
     "Saving results",
 ]
@@ -23,9 +66,26 @@ TERMINAL_JOB_STATUSES = {"completed", "failed"}
 
 logger = get_logger(__name__)
 
-youtube_service = YouTubeService()
-summarizer_service = SummarizerService()
-transcription_service = TranscriptionService()
+summarizer_service: SummarizerBackend
+fallback_summarizer_service: SummarizerBackend = ExtractiveSummarizerService()
+if settings.use_fake_providers:
+    youtube_service = FakeYouTubeService()
+    summarizer_service = FakeSummarizerService()
+    transcription_service = FakeTranscriptionService()
+else:
+    youtube_service = YouTubeService()
+    summarizer_service = SummarizerService()
+    transcription_service = TranscriptionService()
+analysis_cache = AnalysisCache(settings.analysis_cache_memory_entries)
+
+# The LLM stage is the slow, expensive one. Bounding it lets previews keep
+# flowing under load while full analyses queue up behind the semaphore.
+_analysis_slots = asyncio.Semaphore(settings.max_concurrent_analyses)
+# Over-limit jobs (when the guard is set to "low_priority") run one at a time
+# so a long livestream can't tie up the whole pipeline.
+_low_priority_slots = asyncio.Semaphore(settings.low_priority_concurrency)
+
+LOW_PRIORITY_STEP_LABEL = "Waiting in low-priority queue"
 
 
 async def run_video_job(job_id: uuid.UUID, user_id: uuid.UUID) -> None:
@@ -34,6 +94,7 @@ async def run_video_job(job_id: uuid.UUID, user_id: uuid.UUID) -> None:
         if not job or job.status in TERMINAL_JOB_STATUSES or job.user_id != user_id:
             return
 
+        low_priority = False
         try:
             await _set_job_state(
                 db,
@@ -46,6 +107,19 @@ async def run_video_job(job_id: uuid.UUID, user_id: uuid.UUID) -> None:
 
             metadata = await youtube_service.fetch_metadata(job.youtube_id)
 
+            decision = check_job(metadata, await _load_preferences(db, user_id))
+            _record_job_details(job, cost_guard=decision.as_dict())
+            if decision.action == "reject":
+                raise CostLimitExceededError(
+                    "Video exceeds processing limits: " + "; ".join(decision.reasons)
+                )
+            if decision.action == "low_priority":
+                await _set_job_state(
+                    db, job, status="queued", step_label=LOW_PRIORITY_STEP_LABEL
+                )
+                await _low_priority_slots.acquire()
+                low_priority = True
+
             await _set_job_state(
                 db,
                 job,
@@ -55,15 +129,22 @@ async def run_video_job(job_id: uuid.UUID, user_id: uuid.UUID) -> None:
             )
 
             try:
-                transcript, transcript_source = await youtube_service.fetch_transcript(
-                    job.youtube_id
-                )
+                (
+                    segments,
+                    transcript_source,
+                ) = await youtube_service.fetch_transcript_segments(job.youtube_id)
+                transcript = join_segments(segments)
             except TranscriptNotAvailableError:
+                segments = []
                 (
                     transcript,
                     transcript_source,
                 ) = await transcription_service.transcribe_with_whisper(job.youtube_id)
 
+            compaction = compact_transcript(transcript)
+            transcript = compaction.text
+            _record_job_details(job, compaction=compaction.as_dict())
+
             await _set_job_state(
                 db,
                 job,
@@ -72,69 +153,422 @@ async def run_video_job(job_id: uuid.UUID, user_id: uuid.UUID) -> None:
                 step_label=JOB_STEPS[2],
             )
 
-            cats_result = await db.execute(
-                select(Category).where(Category.user_id == user_id)
-            )
-            category_rows = cats_result.scalars().all()
-            categories = [{"slug": c.slug, "name": c.name} for c in category_rows]
-            analysis = await summarizer_service.analyze(
-                transcript, metadata.title, categories
+            preview = await asyncio.to_thread(build_local_preview, transcript)
+            video = await _save_preview(
+                db,
+                job,
+                user_id,
+                metadata=metadata,
+                transcript_source=transcript_source,
+                preview=preview,
             )
 
-            allowed_category_slugs = {c["slug"] for c in categories}
-            if analysis.category in allowed_category_slugs:
-                selected_category = analysis.category
-            elif "other" in allowed_category_slugs:
-                selected_category = "other"
-            else:
-                selected_category = None
+            pieces = _chapter_pieces(metadata, segments, transcript)
+            video.chapters = _chapter_dicts(metadata)
+            analysis_status = await _analyze_and_save(
+                db, job, video, _analysis_input(transcript, pieces), metadata.title
+            )
 
-            canonical_keywords = await canonicalize_keywords(
+            await _set_job_state(
                 db,
-                analysis.keywords,
-                user_id,
+                job,
+                status="completed",
+                current_step=len(JOB_STEPS) - 1,
+                step_label=JOB_STEPS[-1],
+                video_id=video.id,
+                error_message=None,
             )
 
+            logger.info("Video job completed: %s (%s)", job_id, analysis_status)
+        except CostLimitExceededError as exc:
+            logger.warning("Video job rejected: %s (%s)", job_id, exc)
             await _set_job_state(
                 db,
                 job,
-                status="processing",
-                current_step=3,
-                step_label=JOB_STEPS[3],
+                status="failed",
+                step_label="Rejected",
+                error_message=str(exc),
             )
+        except Exception as exc:
+            logger.exception("Video job failed: %s", job_id)
+            await _set_job_state(
+                db,
+                job,
+                status="failed",
+                step_label="Failed",
+                error_message=str(exc),
+            )
+        finally:
+            if low_priority:
+                _low_priority_slots.release()
 
-            existing = await db.execute(
-                select(Video).where(
-                    Video.youtube_id == job.youtube_id,
-                    Video.user_id == user_id,
-                )
+
+async def _analyze_and_save(
+    db,
+    job: VideoJob,
+    video: Video,
+    analysis_input: dict[str, Any],
+    title: str,
+) -> str:
+    """Run the LLM stage on ``analysis_input`` and save the result to ``video``.
+
+    The input is kept on the video while its analysis is degraded, for the
+    upgrade sweep to retry. Returns the analysis status.
+    """
+    user_id = video.user_id
+    await _set_job_state(
+        db,
+        job,
+        status="processing",
+        current_step=3,
+        step_label=JOB_STEPS[3],
+        video_id=video.id,
+    )
+
+    cats_result = await db.execute(select(Category).where(Category.user_id == user_id))
+    category_rows = cats_result.scalars().all()
+    categories = [{"slug": c.slug, "name": c.name} for c in category_rows]
+    pieces = _input_pieces(analysis_input)
+    if pieces:
+        analysis, analysis_status = await _analyze_chapters(
+            db, job, pieces, title, categories
+        )
+    else:
+        analysis, analysis_status = await _analyze_transcript(
+            db, job, analysis_input["transcript"], title, categories
+        )
+
+    allowed_category_slugs = {c["slug"] for c in categories}
+    if analysis.category in allowed_category_slugs:
+        selected_category = analysis.category
+    elif "other" in allowed_category_slugs:
+        selected_category = "other"
+    else:
+        selected_category = None
+
+    canonical_keywords = await canonicalize_keywords(
+        db,
+        analysis.keywords,
+        user_id,
+    )
+
+    await _set_job_state(
+        db,
+        job,
+        status="processing",
+        current_step=4,
+        step_label=JOB_STEPS[4],
+    )
+
+    video.explanation = analysis.explanation or None
+    video.key_knowledge = analysis.key_knowledge or None
+    video.critical_analysis = analysis.critical_analysis or None
+    video.real_world_applications = analysis.real_world_applications or None
+    video.excerpt = make_excerpt(analysis.explanation, analysis.key_knowledge)
+    video.keywords = canonical_keywords
+    video.category = selected_category
+    video.analysis_status = analysis_status
+    video.analysis_input = analysis_input if analysis_status == "degraded" else None
+    video.embedding = embed_text(video.title, video.key_knowledge)
+    await bump_library_version(db, user_id, embeddings=True)
+    await update_relations(db, user_id, [video.id])
+    return analysis_status
+
+
+def _analysis_input(
+    transcript: str, pieces: list[tuple[Chapter, str]]
+) -> dict[str, Any]:
+    if pieces:
+        return {
+            "chapters": [
+                {**chapter.as_dict(), "text": text} for chapter, text in pieces
+            ]
+        }
+    return {"transcript": transcript}
+
+
+def _input_pieces(analysis_input: dict[str, Any]) -> list[tuple[Chapter, str]]:
+    return [
+        (Chapter(piece["title"], piece["start_time"], piece["end_time"]), piece["text"])
+        for piece in analysis_input.get("chapters") or ()
+    ]
+
+
+@dataclass
+class _AnalysisRun:
+    """One LLM analysis request and, once run, its outcome."""
+
+    transcript: str
+    title: str
+    route: ModelRoute
+    cache_key: str
+    analysis: KnowledgeResult | None = None
+    status: str = "complete"
+    cache_source: str | None = None
+    seconds: float | None = None
+
+
+def _prepare_run(
+    transcript: str, title: str, categories: list[dict[str, str]]
+) -> _AnalysisRun:
+    route = route_for_transcript(len(transcript))
+    cache_key = analysis_cache_key(
+        transcript,
+        title,
+        [c["slug"] for c in categories],
+        route.model,
+        PROMPT_VERSION,
+    )
+    return _AnalysisRun(transcript, title, route, cache_key)
+
+
+async def _load_cached(db, run: _AnalysisRun) -> None:
+    if not settings.analysis_cache_enabled:
+        return
+    cached = await analysis_cache.get(db, run.cache_key)
+    if cached is not None:
+        run.analysis, run.cache_source = cached
+
+
+async def _store_cached(db, run: _AnalysisRun) -> None:
+    if (
+        settings.analysis_cache_enabled
+        and run.cache_source is None
+        and run.status == "complete"
+        and run.analysis is not None
+    ):
+        await analysis_cache.put(
+            db,
+            run.cache_key,
+            run.analysis,
+            model=run.route.model,
+            prompt_version=PROMPT_VERSION,
+        )
+
+
+async def _run_llm(
+    job_id: uuid.UUID, run: _AnalysisRun, categories: list[dict[str, str]]
+) -> None:
+    """Analyze ``run`` with the primary summarizer, then the fallback.
+
+    Either backend is any ``SummarizerBackend``: normally the LLM and the
+    extractive summarizer.
+
+    Does not touch the database, so several runs can be gathered at once.
+    """
+    async with _analysis_slots:
+        started = time.monotonic()
+        try:
+            run.analysis = await summarizer_service.analyze(
+                run.transcript, run.title, categories, route=run.route
+            )
+            run.seconds = round(time.monotonic() - started, 2)
+            return
+        except RuntimeError as exc:
+            # Finish in degraded mode; the scheduler re-queues these videos
+            # for a full LLM analysis later.
+            logger.warning(
+                "LLM analysis failed for job %s, using extractive fallback: %s",
+                job_id,
+                exc,
             )
-            video = existing.scalar_one_or_none()
-
-            if video is None:
-                video = Video(
-                    user_id=user_id,
-                    youtube_url=job.youtube_url,
-                    youtube_id=job.youtube_id,
-                    title=metadata.title,
-                    thumbnail_url=metadata.thumbnail_url,
-                    channel_name=metadata.channel_name,
-                    duration=metadata.duration,
-                    explanation=analysis.explanation,
-                    key_knowledge=analysis.key_knowledge,
-                    critical_analysis=analysis.critical_analysis,
-                    real_world_applications=analysis.real_world_applications,
-                    keywords=canonical_keywords,
-                    category=selected_category,
-                    transcript_source=transcript_source,
+    run.analysis = await fallback_summarizer_service.analyze(
+        run.transcript, run.title, categories
+    )
+    run.status = "degraded"
+
+
+async def _analyze_transcript(
+    db,
+    job: VideoJob,
+    transcript: str,
+    title: str,
+    categories: list[dict[str, str]],
+) -> tuple[KnowledgeResult, str]:
+    """Run the knowledge analysis, memoized and with a local fallback.
+
+    Returns:
+        ``(analysis, analysis_status)`` where status is ``"complete"`` for an
+        LLM (or cached LLM) result and ``"degraded"`` for the extractive one.
+    """
+    run = _prepare_run(transcript, title, categories)
+    _record_job_details(job, route=run.route.as_dict())
+
+    await _load_cached(db, run)
+    if settings.analysis_cache_enabled:
+        _record_job_details(
+            job,
+            analysis_cache={
+                "hit": run.cache_source is not None,
+                "source": run.cache_source,
+            },
+        )
+    if run.analysis is None:
+        await _run_llm(job.id, run, categories)
+        if run.seconds is not None:
+            _record_job_details(job, analysis_seconds=run.seconds)
+        if run.analysis.usage is not None:
+            _record_job_details(job, usage=run.analysis.usage.as_dict())
+        await _store_cached(db, run)
+    return run.analysis, run.status
+
+
+def _chapter_pieces(
+    metadata: VideoMetadata, segments: list[TranscriptSegment], transcript: str
+) -> list[tuple[Chapter, str]]:
+    """Compacted per-chapter transcripts, or ``[]`` to analyse the whole video.
+
+    Only long videos with at least two chapters (and caption timestamps to
+    place text in them) are split.
+    """
+    if (
+        len(metadata.chapters) < 2
+        or not segments
+        or len(transcript) < settings.chapter_analysis_min_chars
+    ):
+        return []
+
+    pieces = [
+        (chapter, compact_transcript(text).text)
+        for chapter, text in split_by_chapters(segments, metadata.chapters)
+    ]
+    pieces = group_chapters(
+        [(chapter, text) for chapter, text in pieces if text],
+        settings.chapter_analysis_max_chapters,
+    )
+    return pieces if len(pieces) >= 2 else []
+
+
+async def _analyze_chapters(
+    db,
+    job: VideoJob,
+    pieces: list[tuple[Chapter, str]],
+    title: str,
+    categories: list[dict[str, str]],
+) -> tuple[KnowledgeResult, str]:
+    """Analyse chapters concurrently and merge them into one result.
+
+    Cache lookups and writes stay sequential because they share the job's
+    session; only the LLM calls run in parallel (bounded by the analysis
+    semaphore). The video is ``"degraded"`` if any chapter fell back.
+    """
+    runs = [
+        _prepare_run(text, f"{title} — {chapter.title}", categories)
+        for chapter, text in pieces
+    ]
+    for run in runs:
+        await _load_cached(db, run)
+
+    started = time.monotonic()
+    await asyncio.gather(
+        *(_run_llm(job.id, run, categories) for run in runs if run.analysis is None)
+    )
+    for run in runs:
+        await _store_cached(db, run)
+
+    # Cache hits carry no usage, so this covers the calls made for this job
+    usage = AnalysisUsage.total(
+        run.analysis.usage for run in runs if run.analysis.usage is not None
+    )
+    if usage is not None:
+        _record_job_details(job, usage=usage.as_dict())
+    _record_job_details(
+        job,
+        analysis_seconds=round(time.monotonic() - started, 2),
+        chapters=[
+            {
+                "title": chapter.title,
+                "start_time": chapter.start_time,
+                "tier": run.route.tier,
+                "status": run.status,
+                "cache_source": run.cache_source,
+                "analysis_seconds": run.seconds,
+            }
+            for (chapter, _), run in zip(pieces, runs, strict=True)
+        ],
+    )
+
+    analysis = merge_chapter_analyses(
+        [
+            (chapter, run.analysis)
+            for (chapter, _), run in zip(pieces, runs, strict=True)
+        ]
+    )
+    status = "degraded" if any(r.status == "degraded" for r in runs) else "complete"
+    return analysis, status
+
+
+async def requeue_degraded_analyses(limit: int) -> int:
+    """Retry the LLM analysis of videos saved with the extractive fallback.
+
+    Only the analysis stage runs again, from the input stored with the
+    video; metadata and transcript aren't fetched (or transcribed) again.
+    Videos degraded before inputs were stored get one full ingest instead.
+    Each video is retried at most ``settings.analysis_upgrade_max_attempts``
+    times. Videos are retried one after another, so a sweep only ever holds
+    one video's analysis slots: one, or one per chapter group for a video
+    analysed by chapter.
+
+    Returns:
+        The number of videos retried.
+    """
+    async with async_session() as db:
+        result = await db.execute(
+            select(Video)
+            .options(undefer(Video.analysis_input))
+            .where(
+                Video.analysis_status == "degraded",
+                Video.analysis_attempts < settings.analysis_upgrade_max_attempts,
+            )
+            .order_by(Video.updated_at.asc())
+            .limit(limit)
+        )
+        retries: list[tuple[VideoJob, Video]] = []
+        for video in result.scalars().all():
+            active = await db.execute(
+                select(VideoJob.id).where(
+                    VideoJob.youtube_id == video.youtube_id,
+                    VideoJob.user_id == video.user_id,
+                    VideoJob.status.in_(tuple(ACTIVE_JOB_STATUSES)),
                 )
-                db.add(video)
-                await db.flush()
-                await db.refresh(video)
-            else:
-                video.keywords = canonical_keywords
-                video.category = selected_category
+            )
+            if active.first() is not None:
+                continue
+            video.analysis_attempts = (video.analysis_attempts or 0) + 1
+            job = VideoJob(
+                user_id=video.user_id,
+                youtube_url=video.youtube_url,
+                youtube_id=video.youtube_id,
+                status="queued",
+                current_step=0,
+                total_steps=len(JOB_STEPS),
+                step_label=JOB_STEPS[0],
+            )
+            db.add(job)
+            retries.append((job, video))
+        await db.commit()
+
+    for job, video in retries:
+        if video.analysis_input is None:
+            await run_video_job(job.id, job.user_id)
+        else:
+            await _retry_analysis(job.id, video.id, video.analysis_input)
+    return len(retries)
 
+
+async def _retry_analysis(
+    job_id: uuid.UUID, video_id: uuid.UUID, analysis_input: dict[str, Any]
+) -> None:
+    """Run ``job_id`` as the analysis stage alone, on a degraded video."""
+    async with async_session() as db:
+        job = await db.get(VideoJob, job_id)
+        video = await db.get(Video, video_id)
+        if not job or job.status in TERMINAL_JOB_STATUSES or video is None:
+            return
+        try:
+            analysis_status = await _analyze_and_save(
+                db, job, video, analysis_input, video.title or ""
+            )
             await _set_job_state(
                 db,
                 job,
@@ -144,10 +578,9 @@ async def run_video_job(job_id: uuid.UUID, user_id: uuid.UUID) -> None:
                 video_id=video.id,
                 error_message=None,
             )
-
-            logger.info("Video job completed: %s", job_id)
+            logger.info("Analysis retry completed: %s (%s)", job_id, analysis_status)
         except Exception as exc:
-            logger.exception("Video job failed: %s", job_id)
+            logger.exception("Analysis retry failed: %s", job_id)
             await _set_job_state(
                 db,
                 job,
@@ -157,6 +590,70 @@ async def run_video_job(job_id: uuid.UUID, user_id: uuid.UUID) -> None:
             )
 
 
+async def _save_preview(
+    db,
+    job: VideoJob,
+    user_id: uuid.UUID,
+    *,
+    metadata: VideoMetadata,
+    transcript_source: str,
+    preview: LocalPreview,
+) -> Video:
+    """Persist a preview card so the video is browsable before the LLM runs.
+
+    An existing video (e.g. one being re-analyzed) is returned untouched.
+    """
+    existing = await db.execute(
+        select(Video).where(
+            Video.youtube_id == job.youtube_id,
+            Video.user_id == user_id,
+        )
+    )
+    video = existing.scalar_one_or_none()
+    if video is not None:
+        return video
+
+    video = Video(
+        user_id=user_id,
+        youtube_url=job.youtube_url,
+        youtube_id=job.youtube_id,
+        title=metadata.title,
+        thumbnail_url=metadata.thumbnail_url,
+        channel_name=metadata.channel_name,
+        duration=metadata.duration,
+        key_knowledge=preview.key_knowledge,
+        excerpt=make_excerpt(preview.key_knowledge),
+        keywords=await canonicalize_keywords(db, preview.keywords, user_id),
+        transcript_source=transcript_source,
+        chapters=_chapter_dicts(metadata),
+        analysis_status="preview",
+        embedding=embed_text(metadata.title, preview.key_knowledge),
+    )
+    db.add(video)
+    await bump_library_version(db, user_id, embeddings=True)
+    await db.flush()
+    await update_relations(db, user_id, [video.id])
+    await db.refresh(video)
+    return video
+
+
+async def _load_preferences(db, user_id: uuid.UUID) -> dict[str, Any]:
+    result = await db.execute(
+        select(UserSettings).where(UserSettings.user_id == user_id)
+    )
+    row = result.scalar_one_or_none()
+    return row.preferences if row is not None else {}
+
+
+def _chapter_dicts(metadata: VideoMetadata) -> list[dict[str, Any]] | None:
+    return [chapter.as_dict() for chapter in metadata.chapters] or None
+
+
+def _record_job_details(job: VideoJob, **values: Any) -> None:
+    """Merge measurements into ``job.details``; saved on the next state change."""
+    job.details = {**(job.details or {}), **values}
+
+
 async def _set_job_state(
     db,
     job: VideoJob,
@@ -0,0 +1,149 @@
+"""Write-behind view tracking for the video detail page.
+
+Opening a video used to increment ``view_count`` with its own UPDATE,
+commit and refresh: a write on every read, contending for the row lock,
+and an ``updated_at`` bump that made a merely viewed video look recently
+edited (e.g. in the tags' ``last_used_at``). Views are now counted in
+memory and written by a periodic ``flush`` as one
+``UPDATE ... FROM (VALUES ...)`` per batch, so the stored counts lag by at
+most the flush interval (``settings.view_flush_interval_seconds``).
+
+Each worker process buffers its own views; the UPDATE adds to the stored
+count, so concurrent flushes from several processes don't lose any.
+
+A flush bumps a user's library version (and so the ETag of their library
+reads) only when a view moves a video between review buckets: its first
+view ever, or its first within ``REVIEW_WINDOW``. Other views only change
+the counts and timestamps shown on list cards, which may lag in a cached
+list; lists ordered by views aren't served from the cache at all.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import DateTime, Integer, column, func, or_, update, values
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import aliased
+
+from app.database import async_session
+from app.logging_config import get_logger
+from app.models import Video
+from app.services.library import bump_library_version
+
+logger = get_logger(__name__)
+
+# Rows per UPDATE; three bind parameters each, well under asyncpg's limit
+FLUSH_BATCH_SIZE = 1_000
+
+# The shortest view-based review filter ("recent"; "stale" is 14 days)
+REVIEW_WINDOW = timedelta(days=7)
+
+
+@dataclass
+class PendingViews:
+    """Views of one video not yet written to the database."""
+
+    count: int
+    last_viewed_at: datetime
+
+
+class ViewTracker:
+    """Buffers video views and writes them to ``videos`` in batches."""
+
+    def __init__(self) -> None:
+        self._pending: dict[uuid.UUID, PendingViews] = {}
+        self._flush_lock = asyncio.Lock()
+
+    def record(self, video_id: uuid.UUID, viewed_at: datetime | None = None) -> None:
+        viewed_at = viewed_at or datetime.now()
+        pending = self._pending.get(video_id)
+        if pending is None:
+            self._pending[video_id] = PendingViews(1, viewed_at)
+        else:
+            pending.count += 1
+            pending.last_viewed_at = max(pending.last_viewed_at, viewed_at)
+
+    def pending(self, video_id: uuid.UUID) -> PendingViews | None:
+        """Views of ``video_id`` recorded since the last flush."""
+        return self._pending.get(video_id)
+
+    async def flush(self) -> int:
+        """Write every buffered view; returns the number of videos updated.
+
+        On a database error the views are put back into the buffer to be
+        retried by the next flush.
+        """
+        async with self._flush_lock:
+            batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                async with async_session() as db:
+                    user_ids: set[uuid.UUID] = set()
+                    items = list(batch.items())
+                    for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                        result = await db.execute(
+                            _update_views(items[start : start + FLUSH_BATCH_SIZE])
+                        )
+                        user_ids.update(
+                            user_id for user_id, moved in result.all() if moved
+                        )
+                    for user_id in user_ids:
+                        await bump_library_version(db, user_id)
+                    await db.commit()
+            except Exception:
+                self._restore(batch)
+                raise
+            logger.debug("Flushed views for %d video(s)", len(batch))
+            return len(batch)
+
+    def _restore(self, batch: dict[uuid.UUID, PendingViews]) -> None:
+        for video_id, views in batch.items():
+            pending = self._pending.get(video_id)
+            if pending is None:
+                self._pending[video_id] = views
+            else:
+                pending.count += views.count
+                pending.last_viewed_at = max(
+                    pending.last_viewed_at, views.last_viewed_at
+                )
+
+
+def _update_views(items: list[tuple[uuid.UUID, PendingViews]]):
+    """Add the views; returns ``(user_id, moved)`` per video.
+
+    ``moved`` is true when the video changed review bucket. The self-join
+    reads the row as it was before the update.
+    """
+    previous = aliased(Video)
+    window_start = datetime.now() - REVIEW_WINDOW
+    rows = values(
+        column("id", UUID(as_uuid=True)),
+        column("views", Integer),
+        column("viewed_at", DateTime),
+        name="pending_views",
+    ).data([(video_id, views.count, views.last_viewed_at) for video_id, views in items])
+    return (
+        update(Video)
+        .where(Video.id == rows.c.id, previous.id == rows.c.id)
+        .values(
+            view_count=Video.view_count + rows.c.views,
+            last_viewed_at=func.greatest(Video.last_viewed_at, rows.c.viewed_at),
+            # A view isn't an edit; keep onupdate from touching updated_at
+            updated_at=Video.updated_at,
+        )
+        .returning(
+            Video.user_id,
+            or_(
+                previous.view_count == 0,
+                previous.last_viewed_at.is_(None),
+                previous.last_viewed_at < window_start,
+            ),
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+view_tracker = ViewTracker()
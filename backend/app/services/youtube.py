@@ -1,11 +1,13 @@
 """YouTube data extraction services — URL parsing, metadata, and transcript."""
 
 import re
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from typing import Any
 
 import yt_dlp
 from youtube_transcript_api import YouTubeTranscriptApi
 
+from app.config import settings
 from app.logging_config import get_logger
 
 # ---------------------------------------------------------------------------
@@ -30,6 +32,27 @@ _YOUTUBE_URL_PATTERNS: list[re.Pattern[str]] = [
 ]
 
 
+@dataclass(frozen=True)
+class Chapter:
+    """A creator-defined chapter of a video (times in seconds)."""
+
+    title: str
+    start_time: float
+    end_time: float
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class TranscriptSegment:
+    """One timestamped caption line (times in seconds)."""
+
+    start: float
+    duration: float
+    text: str
+
+
 @dataclass(frozen=True)
 class VideoMetadata:
     """Metadata extracted from a YouTube video via yt-dlp."""
@@ -38,12 +61,35 @@ class VideoMetadata:
     thumbnail_url: str | None
     channel_name: str | None
     duration: int | None  # seconds
+    chapters: tuple[Chapter, ...] = ()
+
+
+def _parse_chapters(info: dict[str, Any]) -> tuple[Chapter, ...]:
+    """Build chapters from yt-dlp's ``chapters`` list, skipping malformed ones."""
+    chapters: list[Chapter] = []
+    for raw in info.get("chapters") or []:
+        try:
+            chapter = Chapter(
+                title=str(raw.get("title") or f"Chapter {len(chapters) + 1}"),
+                start_time=float(raw["start_time"]),
+                end_time=float(raw["end_time"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+        if chapter.end_time > chapter.start_time:
+            chapters.append(chapter)
+    return tuple(sorted(chapters, key=lambda c: c.start_time))
 
 
 class TranscriptNotAvailableError(Exception):
     """Raised when no transcript/captions can be found for a video."""
 
 
+def join_segments(segments: list[TranscriptSegment]) -> str:
+    """Flatten transcript segments into one space-separated string."""
+    return " ".join(segment.text for segment in segments)
+
+
 # ---------------------------------------------------------------------------
 # YouTubeService
 # ---------------------------------------------------------------------------
@@ -87,7 +133,8 @@ class YouTubeService:
             youtube_id: The 11-character YouTube video ID.
 
         Returns:
-            A VideoMetadata dataclass with title, thumbnail, channel, and duration.
+            A VideoMetadata dataclass with title, thumbnail, channel, duration
+            and chapters (empty when the video defines none).
 
         Raises:
             RuntimeError: If yt-dlp fails to extract metadata.
@@ -115,13 +162,16 @@ class YouTubeService:
                 thumbnail_url=info.get("thumbnail"),
                 channel_name=info.get("uploader") or info.get("channel"),
                 duration=info.get("duration"),
+                chapters=_parse_chapters(info),
             )
 
             self.logger.info(
-                "Metadata fetched — title='%s', channel='%s', duration=%ss",
+                "Metadata fetched — title='%s', channel='%s', duration=%ss, "
+                "chapters=%d",
                 metadata.title,
                 metadata.channel_name,
                 metadata.duration,
+                len(metadata.chapters),
             )
             return metadata
 
@@ -132,9 +182,34 @@ class YouTubeService:
             ) from exc
 
     async def fetch_transcript(self, youtube_id: str) -> tuple[str, str]:
-        """Fetch the transcript/captions for a YouTube video.
+        """Fetch the transcript/captions for a YouTube video as plain text.
+
+        See ``fetch_transcript_segments`` for how the caption track is chosen.
+
+        Returns:
+            A tuple of (transcript_text, source).
+
+        Raises:
+            TranscriptNotAvailableError: If no transcript can be found.
+        """
+        segments, source = await self.fetch_transcript_segments(youtube_id)
+        return join_segments(segments), source
+
+    async def fetch_transcript_segments(
+        self, youtube_id: str
+    ) -> tuple[list[TranscriptSegment], str]:
+        """Fetch the timestamped transcript/captions for a YouTube video.
+
+        In ``native`` mode (the default, see ``settings.transcript_mode``) the
+        track is used in its own language — no server-side translation:
+
+        1. Manual transcript in a preferred language (Vietnamese, English)
+        2. Auto-generated transcript in a preferred language
+        3. Manual transcript in any language
+        4. Auto-generated transcript in any language
+
+        In ``translate`` mode non-English tracks are translated to English:
 
-        Strategy (in order of preference):
         1. Manual transcript in English
         2. Manual transcript in any language → translate to English
         3. Auto-generated transcript in English
@@ -145,8 +220,9 @@ class YouTubeService:
             youtube_id: The 11-character YouTube video ID.
 
         Returns:
-            A tuple of (transcript_text, source) where source is
-            ``"captions"`` or ``"captions-translated"``.
+            A tuple of (segments, source) where source is
+            ``"captions:<lang>"`` or ``"captions-translated:<lang>"`` and
+            ``<lang>`` is the language code of the returned text.
 
         Raises:
             TranscriptNotAvailableError: If no transcript can be found.
@@ -157,55 +233,10 @@ class YouTubeService:
             ytt_api = YouTubeTranscriptApi()
             transcript_list = ytt_api.list(youtube_id)
 
-            transcript = None
-            source_label = "captions"
-
-            # --- 1. Try manual transcripts ---
-            try:
-                transcript = transcript_list.find_manually_created_transcript(["en"])
-                self.logger.info("Found manual English transcript")
-            except Exception:
-                # Try any manual transcript and translate
-                for t in transcript_list:
-                    if not t.is_generated:
-                        if t.is_translatable:
-                            transcript = t.translate("en")
-                            source_label = "captions-translated"
-                            self.logger.info(
-                                "Found manual %s transcript → translating to en",
-                                t.language_code,
-                            )
-                        else:
-                            transcript = t
-                            self.logger.info(
-                                "Found manual %s transcript (not translatable)",
-                                t.language_code,
-                            )
-                        break
-
-            # --- 2. Try auto-generated transcripts ---
-            if transcript is None:
-                try:
-                    transcript = transcript_list.find_generated_transcript(["en"])
-                    self.logger.info("Found auto-generated English transcript")
-                except Exception:
-                    # Try any auto-generated transcript
-                    for t in transcript_list:
-                        if t.is_generated:
-                            if t.is_translatable:
-                                transcript = t.translate("en")
-                                source_label = "captions-translated"
-                                self.logger.info(
-                                    "Found auto-generated %s transcript → translating to en",
-                                    t.language_code,
-                                )
-                            else:
-                                transcript = t
-                                self.logger.info(
-                                    "Found auto-generated %s transcript (not translatable)",
-                                    t.language_code,
-                                )
-                            break
+            if settings.transcript_mode == "translate":
+                transcript, source_label = self._select_translated(transcript_list)
+            else:
+                transcript, source_label = self._select_native(transcript_list)
 
             if transcript is None:
                 raise TranscriptNotAvailableError(
@@ -214,19 +245,29 @@ class YouTubeService:
 
             # Fetch the transcript data
             fetched = transcript.fetch()
-            full_text = " ".join(snippet.text for snippet in fetched.snippets)
+            segments = [
+                TranscriptSegment(
+                    start=float(snippet.start),
+                    duration=float(snippet.duration),
+                    text=snippet.text,
+                )
+                for snippet in fetched.snippets
+            ]
+            full_text = join_segments(segments)
 
             if not full_text.strip():
                 raise TranscriptNotAvailableError(
                     f"Transcript is empty for video: {youtube_id}"
                 )
 
+            source = f"{source_label}:{transcript.language_code}"
             self.logger.info(
-                "Transcript fetched — %d characters, source=%s",
+                "Transcript fetched — %d segments, %d characters, source=%s",
+                len(segments),
                 len(full_text),
-                source_label,
+                source,
             )
-            return full_text, source_label
+            return segments, source
 
         except TranscriptNotAvailableError:
             raise
@@ -235,3 +276,86 @@ class YouTubeService:
             raise TranscriptNotAvailableError(
                 f"No captions available for video {youtube_id}: {exc}"
             ) from exc
+
+    def _select_native(self, transcript_list) -> tuple[Any, str]:
+        """Pick a transcript in its original language, preferring vi/en."""
+        languages = settings.transcript_preferred_languages
+
+        for finder in (
+            transcript_list.find_manually_created_transcript,
+            transcript_list.find_generated_transcript,
+        ):
+            try:
+                transcript = finder(languages)
+                self.logger.info(
+                    "Found preferred %s transcript (%s)",
+                    transcript.language_code,
+                    "auto-generated" if transcript.is_generated else "manual",
+                )
+                return transcript, "captions"
+            except Exception:
+                continue
+
+        tracks = sorted(transcript_list, key=lambda t: t.is_generated)
+        if tracks:
+            self.logger.info(
+                "Using native %s transcript (%s)",
+                tracks[0].language_code,
+                "auto-generated" if tracks[0].is_generated else "manual",
+            )
+            return tracks[0], "captions"
+        return None, "captions"
+
+    def _select_translated(self, transcript_list) -> tuple[Any, str]:
+        """Pick an English transcript, translating other languages if needed."""
+        transcript = None
+        source_label = "captions"
+
+        # --- 1. Try manual transcripts ---
+        try:
+            transcript = transcript_list.find_manually_created_transcript(["en"])
+            self.logger.info("Found manual English transcript")
+        except Exception:
+            # Try any manual transcript and translate
+            for t in transcript_list:
+                if not t.is_generated:
+                    if t.is_translatable:
+                        transcript = t.translate("en")
+                        source_label = "captions-translated"
+                        self.logger.info(
+                            "Found manual %s transcript → translating to en",
+                            t.language_code,
+                        )
+                    else:
+                        transcript = t
+                        self.logger.info(
+                            "Found manual %s transcript (not translatable)",
+                            t.language_code,
+                        )
+                    break
+
+        # --- 2. Try auto-generated transcripts ---
+        if transcript is None:
+            try:
+                transcript = transcript_list.find_generated_transcript(["en"])
+                self.logger.info("Found auto-generated English transcript")
+            except Exception:
+                # Try any auto-generated transcript
+                for t in transcript_list:
+                    if t.is_generated:
+                        if t.is_translatable:
+                            transcript = t.translate("en")
+                            source_label = "captions-translated"
+                            self.logger.info(
+                                "Found auto-generated %s transcript → translating to en",
+                                t.language_code,
+                            )
+                        else:
+                            transcript = t
+                            self.logger.info(
+                                "Found auto-generated %s transcript (not translatable)",
+                                t.language_code,
+                            )
+                        break
+
+        return transcript, source_label
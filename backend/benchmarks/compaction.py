@@ -0,0 +1,129 @@
+"""Measure prompt-token savings of transcript compaction on caption files.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.compaction path/to/captions [--json]
+
+``path`` may be a single file or a directory searched recursively for
+``.txt``, ``.vtt``, ``.srt`` and ``.json`` (youtube-transcript-api dump)
+files. Token counts use ``tiktoken`` when it is installed and fall back to a
+4-characters-per-token estimate otherwise.
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from app.services.compaction import compact_transcript
+
+_SUFFIXES = {".txt", ".vtt", ".srt", ".json"}
+_TIMESTAMP_LINE = re.compile(r"^\d{1,2}:\d{2}(?::\d{2})?[.,]\d{3}\s+-->")
+_INLINE_TAGS = re.compile(r"<[^>]+>")
+
+
+def _token_counter() -> tuple[str, Callable[[str], int]]:
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return "tiktoken/o200k_base", lambda text: len(encoding.encode(text))
+    except ImportError:
+        return "chars/4 estimate", lambda text: (len(text) + 3) // 4
+
+
+def load_caption_text(path: Path) -> str:
+    """Flatten a caption file into the space-joined text fetch_transcript builds."""
+    raw = path.read_text(encoding="utf-8", errors="replace")
+
+    if path.suffix == ".json":
+        data = json.loads(raw)
+        snippets = data.get("snippets", data) if isinstance(data, dict) else data
+        return " ".join(str(item.get("text", "")) for item in snippets)
+
+    if path.suffix in {".vtt", ".srt"}:
+        lines = []
+        for line in raw.splitlines():
+            line = line.strip()
+            if (
+                not line
+                or line == "WEBVTT"
+                or line.isdigit()
+                or _TIMESTAMP_LINE.match(line)
+                or line.startswith(("Kind:", "Language:", "NOTE"))
+            ):
+                continue
+            lines.append(_INLINE_TAGS.sub("", line))
+        return " ".join(lines)
+
+    return " ".join(raw.split())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--json", action="store_true", help="print JSON rows")
+    args = parser.parse_args(argv)
+
+    files = (
+        [args.path]
+        if args.path.is_file()
+        else sorted(p for p in args.path.rglob("*") if p.suffix in _SUFFIXES)
+    )
+    if not files:
+        sys.stderr.write(f"No caption files found under {args.path}\n")
+        return 1
+
+    counter_name, count_tokens = _token_counter()
+    rows = []
+    for path in files:
+        text = load_caption_text(path)
+        started = time.perf_counter()
+        result = compact_transcript(text)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        rows.append(
+            {
+                "file": str(path),
+                "tokens_before": count_tokens(text),
+                "tokens_after": count_tokens(result.text),
+                "compression_ratio": result.compression_ratio,
+                "removed_repeats": result.removed_repeats,
+                "removed_fillers": result.removed_fillers,
+                "compaction_ms": round(elapsed_ms, 2),
+            }
+        )
+
+    before = sum(row["tokens_before"] for row in rows)
+    after = sum(row["tokens_after"] for row in rows)
+
+    if args.json:
+        sys.stdout.write(json.dumps({"tokenizer": counter_name, "files": rows}) + "\n")
+        return 0
+
+    sys.stdout.write(f"Tokenizer: {counter_name}\n")
+    sys.stdout.write(
+        f"{'file':<48} {'before':>9} {'after':>9} {'saved':>7} {'ms':>8}\n"
+    )
+    for row in rows:
+        saved = (
+            1 - row["tokens_after"] / row["tokens_before"]
+            if row["tokens_before"]
+            else 0
+        )
+        sys.stdout.write(
+            f"{Path(row['file']).name[:48]:<48} {row['tokens_before']:>9} "
+            f"{row['tokens_after']:>9} {saved:>7.1%} {row['compaction_ms']:>8.1f}\n"
+        )
+    saved_total = 1 - after / before if before else 0
+    sys.stdout.write(
+        f"{'TOTAL (' + str(len(rows)) + ' files)':<48} {before:>9} {after:>9} "
+        f"{saved_total:>7.1%}\n"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,306 @@
+"""Relevance and latency of full-text, semantic and hybrid library search.
+
+Usage (from ``backend/``, with ``DATABASE_URL`` pointing at a migrated
+database)::
+
+    python -m benchmarks.hybrid_search --sizes 1000,10000,50000 \\
+        --queries 50 [--json]
+
+Seeds a throwaway user with a synthetic corpus that grows to each of
+``--sizes`` in turn. Every video belongs to one of ``--topics`` topics and
+draws its title, key knowledge and explanation mostly from that topic's
+vocabulary with a skewed term distribution, so a multi-word query often
+does not appear in full in a relevant video — the case where the
+prefix-AND full-text search misses it. Each query is three words of one
+topic; the videos of that topic are its relevant set.
+
+For every size and mode the report has:
+
+* ``ndcg@10``, ``recall@10`` and ``mrr`` over the queries
+* p50/p90 latency of ``list_videos`` (first page of 10, sorted by
+  relevance, ``total_mode=exact``) — the semantic mode queries the
+  embedding index directly, as ``/api/videos/semantic-search`` does
+* for semantic and hybrid, the one-off time to build the user's
+  embedding index (excluded from the per-query latencies)
+
+Hybrid candidate sets are bounded by ``settings.hybrid_search_candidates``
+per side, so its cost over full-text should stay flat as the corpus grows.
+The user and its videos are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import secrets
+import statistics
+import sys
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import delete, insert, text
+
+from app.database import async_session, engine
+from app.models import User, Video
+from app.routers.videos import embedding_indexes, list_videos
+from app.services.embeddings import embed_text
+
+_GENERIC = [
+    "overview", "introduction", "guide", "practical", "example", "detail",
+    "approach", "method", "result", "problem", "simple", "common", "modern",
+    "basic", "advanced", "idea", "question", "answer", "part", "step", "case",
+]  # fmt: skip
+_SYLLABLES = ["ka", "lo", "mi", "ne", "ra", "su", "ti", "vo", "ze", "ba", "de"]
+
+_BATCH = 2_000
+
+
+def _vocabularies(topics: int, rng: random.Random) -> list[list[str]]:
+    """Per topic, a list of made-up terms, most common first."""
+
+    def word() -> str:
+        return "".join(rng.choice(_SYLLABLES) for _ in range(3))
+
+    return [[word() for _ in range(24)] for _ in range(topics)]
+
+
+def _sentence(vocabulary: list[str], rng: random.Random, words: int) -> str:
+    # Topic terms follow a Zipf-like skew, so some are far more common
+    picks = [
+        vocabulary[min(int(rng.paretovariate(1.2)) - 1, len(vocabulary) - 1)]
+        if rng.random() < 0.6
+        else rng.choice(_GENERIC)
+        for _ in range(words)
+    ]
+    return " ".join(picks)
+
+
+def _video_rows(
+    user_id: uuid.UUID,
+    start: int,
+    stop: int,
+    vocabularies: list[list[str]],
+    rng: random.Random,
+) -> tuple[list[dict[str, Any]], list[int]]:
+    rows, topics = [], []
+    for i in range(start, stop):
+        topic = rng.randrange(len(vocabularies))
+        vocabulary = vocabularies[topic]
+        title = _sentence(vocabulary, rng, rng.randint(3, 6)).capitalize()
+        key_knowledge = "\n".join(
+            f"- {_sentence(vocabulary, rng, rng.randint(6, 12))}" for _ in range(4)
+        )
+        rows.append(
+            {
+                "user_id": user_id,
+                "youtube_url": f"https://www.youtube.com/watch?v=hyb{i:08d}",
+                "youtube_id": f"hyb{i:08d}",
+                "title": title,
+                "key_knowledge": key_knowledge,
+                "explanation": _sentence(vocabulary, rng, 60),
+                "keywords": [],
+                "embedding": embed_text(title, key_knowledge),
+            }
+        )
+        topics.append(topic)
+    return rows, topics
+
+
+async def _create_user() -> uuid.UUID:
+    async with async_session() as db:
+        user = User(username=f"bench-{secrets.token_hex(6)}", password_hash="!")
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+async def _grow(
+    user_id: uuid.UUID,
+    start: int,
+    stop: int,
+    vocabularies: list[list[str]],
+    rng: random.Random,
+) -> dict[uuid.UUID, int]:
+    """Insert videos ``start..stop``; returns their topic by video id."""
+    topics_by_id: dict[uuid.UUID, int] = {}
+    async with async_session() as db:
+        for batch_start in range(start, stop, _BATCH):
+            rows, topics = _video_rows(
+                user_id,
+                batch_start,
+                min(batch_start + _BATCH, stop),
+                vocabularies,
+                rng,
+            )
+            result = await db.execute(insert(Video).returning(Video.id), rows)
+            topics_by_id.update(zip(result.scalars().all(), topics, strict=True))
+        await db.commit()
+    async with async_session() as db:
+        await db.execute(text("ANALYZE videos"))
+        await db.commit()
+    return topics_by_id
+
+
+def _queries(
+    vocabularies: list[list[str]], count: int, rng: random.Random
+) -> list[tuple[str, int]]:
+    queries = []
+    for _ in range(count):
+        topic = rng.randrange(len(vocabularies))
+        # Mid-frequency terms: neither in every video of the topic nor rare
+        terms = rng.sample(vocabularies[topic][1:8], 3)
+        queries.append((" ".join(terms), topic))
+    return queries
+
+
+def _relevance(ranked: list[uuid.UUID], relevant: set[uuid.UUID]) -> dict[str, float]:
+    gains = [1.0 if video_id in relevant else 0.0 for video_id in ranked[:10]]
+    dcg = sum(gain / math.log2(i + 2) for i, gain in enumerate(gains))
+    ideal = sum(1.0 / math.log2(i + 2) for i in range(min(10, len(relevant))))
+    first_hit = next((i for i, gain in enumerate(gains) if gain), None)
+    return {
+        "ndcg@10": dcg / ideal if ideal else 0.0,
+        "recall@10": sum(gains) / min(10, len(relevant)) if relevant else 0.0,
+        "mrr": 1.0 / (first_hit + 1) if first_hit is not None else 0.0,
+    }
+
+
+async def _search(db, user: User, mode: str, query: str) -> list[uuid.UUID]:
+    if mode == "semantic":
+        index = await embedding_indexes.get(db, user)
+        return [match.video_id for match in index.query_text(query, 10)]
+    page = await list_videos(
+        limit=10,
+        offset=0,
+        sort_by="relevance",
+        sort_order="desc",
+        seed=None,
+        cursor=None,
+        total_mode="exact",
+        search=query,
+        search_mode=mode,
+        tag=None,
+        tag_mode="any",
+        category=None,
+        collection_id=None,
+        review_status=None,
+        is_favourite=None,
+        db=db,
+        current_user=user,
+    )
+    return [item.id for item in page.items]
+
+
+def _summary(timings: list[float]) -> dict[str, float]:
+    deciles = statistics.quantiles(timings, n=10) if len(timings) > 1 else timings
+    return {
+        "p50_ms": round(statistics.median(timings) * 1000, 2),
+        "p90_ms": round(deciles[-1] * 1000, 2),
+    }
+
+
+async def _run_size(
+    user_id: uuid.UUID,
+    topics_by_id: dict[uuid.UUID, int],
+    queries: list[tuple[str, int]],
+) -> dict[str, Any]:
+    relevant_by_topic: dict[int, set[uuid.UUID]] = {}
+    for video_id, topic in topics_by_id.items():
+        relevant_by_topic.setdefault(topic, set()).add(video_id)
+
+    report: dict[str, Any] = {}
+    async with async_session() as db:
+        user = await db.get(User, user_id)
+        started = time.perf_counter()
+        embedding_indexes.clear()
+        await embedding_indexes.get(db, user)
+        index_build = time.perf_counter() - started
+
+        for mode in ("fulltext", "semantic", "hybrid"):
+            timings = []
+            scores: dict[str, list[float]] = {}
+            for query, topic in queries:
+                started = time.perf_counter()
+                ranked = await _search(db, user, mode, query)
+                timings.append(time.perf_counter() - started)
+                for name, value in _relevance(
+                    ranked, relevant_by_topic.get(topic, set())
+                ).items():
+                    scores.setdefault(name, []).append(value)
+            report[mode] = {
+                **{name: round(statistics.mean(v), 3) for name, v in scores.items()},
+                **_summary(timings),
+            }
+            if mode != "fulltext":
+                report[mode]["index_build_ms"] = round(index_build * 1000, 1)
+    return report
+
+
+async def _cleanup(user_id: uuid.UUID) -> None:
+    async with async_session() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    vocabularies = _vocabularies(args.topics, rng)
+    queries = _queries(vocabularies, args.queries, rng)
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    user_id = await _create_user()
+    topics_by_id: dict[uuid.UUID, int] = {}
+    results = {}
+    try:
+        for size in sizes:
+            topics_by_id |= await _grow(
+                user_id, len(topics_by_id), size, vocabularies, rng
+            )
+            results[size] = await _run_size(user_id, topics_by_id, queries)
+    finally:
+        if not args.keep:
+            await _cleanup(user_id)
+        await engine.dispose()
+    return {"topics": args.topics, "queries": len(queries), "sizes": results}
+
+
+def _write_report(report: dict[str, Any]) -> None:
+    out = sys.stdout
+    out.write(f"{report['topics']} topics, {report['queries']} queries per size\n\n")
+    header = (
+        f"{'videos':>8}  {'mode':<9}{'ndcg@10':>9}{'recall@10':>11}{'mrr':>7}"
+        f"{'p50':>10}{'p90':>10}"
+    )
+    out.write(header + "\n" + "-" * len(header) + "\n")
+    for size, modes in report["sizes"].items():
+        label = str(size)
+        for mode, row in modes.items():
+            out.write(
+                f"{label:>8}  {mode:<9}{row['ndcg@10']:>9.3f}{row['recall@10']:>11.3f}"
+                f"{row['mrr']:>7.3f}{row['p50_ms']:>8.1f}ms{row['p90_ms']:>8.1f}ms\n"
+            )
+            label = ""
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--topics", type=int, default=40)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="keep the bench user")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if args.json:
+        sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    else:
+        _write_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
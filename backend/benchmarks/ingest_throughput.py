@@ -0,0 +1,288 @@
+"""Drive concurrent ingest jobs through ``run_video_job`` against Postgres.
+
+YouTube, Whisper and OpenAI are replaced by the fakes in
+``app.services.fakes``; everything else — the pipeline, the database session
+pool, compaction, previews, tag canonicalization — is the real code.
+
+Usage (from ``backend/``, with ``DATABASE_URL`` pointing at a migrated
+database)::
+
+    python -m benchmarks.ingest_throughput --jobs 200 --concurrency 50 \\
+        --analysis-latency 2 --error-rate 0.05 [--json]
+
+The benchmark creates a throwaway user, runs the jobs and deletes the user
+(and with it every job and video) at the end. The analysis cache is disabled
+unless ``--with-cache`` is given so repeated runs measure the same work.
+
+Reported:
+
+* jobs/min over the whole run, and completed/failed/degraded counts
+* p50/p90/p99/max per pipeline stage (time spent in each ``JOB_STEPS``
+  entry, measured from the job's state transitions)
+* connection pool waits, from a probe that checks out a connection every
+  ``--probe-interval`` seconds, plus the peak number of checked-out
+  connections
+* event-loop lag, from a probe that sleeps ``--probe-interval`` seconds and
+  records how late it wakes up
+"""
+
+import argparse
+import asyncio
+import json
+import secrets
+import string
+import sys
+import time
+import uuid
+from collections import defaultdict
+from typing import Any
+
+import numpy as np
+from sqlalchemy import delete, func, select
+
+from app.config import settings
+from app.database import async_session, engine
+from app.models import User, Video, VideoJob
+from app.services import video_jobs
+from app.services.fakes import (
+    FakeSummarizerService,
+    FakeTranscriptionService,
+    FakeYouTubeService,
+)
+
+_ID_ALPHABET = string.ascii_letters + string.digits + "-_"
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0}
+    data = np.asarray(values)
+    p50, p90, p99 = np.percentile(data, [50, 90, 99])
+    return {
+        "count": len(values),
+        "p50": round(float(p50), 4),
+        "p90": round(float(p90), 4),
+        "p99": round(float(p99), 4),
+        "max": round(float(data.max()), 4),
+    }
+
+
+class StageTimer:
+    """Records when each job enters each step by wrapping ``_set_job_state``."""
+
+    def __init__(self) -> None:
+        self.transitions: dict[uuid.UUID, list[tuple[str, float]]] = defaultdict(list)
+        self._original = video_jobs._set_job_state
+
+    def install(self) -> None:
+        original = self._original
+
+        async def timed(db, job, **kwargs):
+            await original(db, job, **kwargs)
+            self.transitions[job.id].append((job.step_label, time.perf_counter()))
+
+        video_jobs._set_job_state = timed
+
+    def uninstall(self) -> None:
+        video_jobs._set_job_state = self._original
+
+    def stage_latencies(self) -> dict[str, list[float]]:
+        stages: dict[str, list[float]] = defaultdict(list)
+        for transitions in self.transitions.values():
+            for (label, started), (_, ended) in zip(
+                transitions, transitions[1:], strict=False
+            ):
+                stages[label].append(ended - started)
+        return stages
+
+
+async def _loop_lag_probe(interval: float, samples: list[float], stop: asyncio.Event):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(max(time.perf_counter() - started - interval, 0.0))
+
+
+async def _pool_probe(
+    interval: float, waits: list[float], peak: list[int], stop: asyncio.Event
+):
+    while not stop.is_set():
+        started = time.perf_counter()
+        async with engine.connect():
+            waits.append(time.perf_counter() - started)
+        peak[0] = max(peak[0], engine.pool.checkedout())
+        await asyncio.sleep(interval)
+
+
+async def _create_jobs(count: int) -> tuple[uuid.UUID, list[uuid.UUID]]:
+    async with async_session() as db:
+        user = User(
+            username=f"bench-{secrets.token_hex(6)}",
+            password_hash="!",  # not a valid hash; the user can't log in
+        )
+        db.add(user)
+        await db.flush()
+
+        jobs = []
+        for _ in range(count):
+            youtube_id = "".join(secrets.choice(_ID_ALPHABET) for _ in range(11))
+            job = VideoJob(
+                user_id=user.id,
+                youtube_url=f"https://www.youtube.com/watch?v={youtube_id}",
+                youtube_id=youtube_id,
+                status="queued",
+                current_step=0,
+                total_steps=len(video_jobs.JOB_STEPS),
+                step_label=video_jobs.JOB_STEPS[0],
+            )
+            db.add(job)
+            jobs.append(job)
+        await db.commit()
+        return user.id, [job.id for job in jobs]
+
+
+async def _collect_outcomes(user_id: uuid.UUID) -> dict[str, int]:
+    async with async_session() as db:
+        job_statuses = await db.execute(
+            select(VideoJob.status, func.count())
+            .where(VideoJob.user_id == user_id)
+            .group_by(VideoJob.status)
+        )
+        analysis_statuses = await db.execute(
+            select(Video.analysis_status, func.count())
+            .where(Video.user_id == user_id)
+            .group_by(Video.analysis_status)
+        )
+        outcomes = {status: count for status, count in job_statuses.all()}
+        for status, count in analysis_statuses.all():
+            outcomes[f"analysis_{status}"] = count
+    return outcomes
+
+
+async def _cleanup(user_id: uuid.UUID) -> None:
+    async with async_session() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    settings.fake_metadata_latency_seconds = args.metadata_latency
+    settings.fake_transcript_latency_seconds = args.transcript_latency
+    settings.fake_whisper_latency_seconds = args.whisper_latency
+    settings.fake_analysis_latency_seconds = args.analysis_latency
+    settings.fake_error_rate = args.error_rate
+    settings.fake_caption_rate = args.caption_rate
+    settings.fake_transcript_chars = args.transcript_chars
+    settings.analysis_cache_enabled = args.with_cache
+
+    video_jobs.youtube_service = FakeYouTubeService()
+    video_jobs.summarizer_service = FakeSummarizerService()
+    video_jobs.transcription_service = FakeTranscriptionService()
+
+    user_id, job_ids = await _create_jobs(args.jobs)
+    timer = StageTimer()
+    timer.install()
+
+    stop = asyncio.Event()
+    lag: list[float] = []
+    pool_waits: list[float] = []
+    pool_peak = [0]
+    probes = [
+        asyncio.create_task(_loop_lag_probe(args.probe_interval, lag, stop)),
+        asyncio.create_task(
+            _pool_probe(args.probe_interval, pool_waits, pool_peak, stop)
+        ),
+    ]
+
+    slots = asyncio.Semaphore(args.concurrency)
+
+    async def one(job_id: uuid.UUID) -> None:
+        async with slots:
+            await video_jobs.run_video_job(job_id, user_id)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(job_id) for job_id in job_ids))
+        elapsed = time.perf_counter() - started
+    finally:
+        stop.set()
+        await asyncio.gather(*probes)
+        timer.uninstall()
+
+    outcomes = await _collect_outcomes(user_id)
+    if not args.keep:
+        await _cleanup(user_id)
+
+    return {
+        "jobs": args.jobs,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": round(elapsed, 2),
+        "jobs_per_minute": round(args.jobs / elapsed * 60, 1),
+        "outcomes": outcomes,
+        "stages": {
+            label: _percentiles(values)
+            for label, values in timer.stage_latencies().items()
+        },
+        "pool": {
+            "size": engine.pool.size(),
+            "peak_checked_out": pool_peak[0],
+            "wait_seconds": _percentiles(pool_waits),
+        },
+        "event_loop_lag_seconds": _percentiles(lag),
+    }
+
+
+def _write_report(report: dict[str, Any]) -> None:
+    out = sys.stdout
+    out.write(
+        f"{report['jobs']} jobs, concurrency {report['concurrency']}: "
+        f"{report['elapsed_seconds']}s, {report['jobs_per_minute']} jobs/min\n"
+    )
+    outcomes = ", ".join(f"{k}={v}" for k, v in report["outcomes"].items())
+    out.write(f"outcomes: {outcomes}\n\n")
+
+    header = f"{'stage':<32}{'n':>6}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}"
+    out.write(header + "\n" + "-" * len(header) + "\n")
+    rows = list(report["stages"].items())
+    rows.append(("pool wait", report["pool"]["wait_seconds"]))
+    rows.append(("event-loop lag", report["event_loop_lag_seconds"]))
+    for label, stats in rows:
+        if not stats["count"]:
+            continue
+        out.write(
+            f"{label:<32}{stats['count']:>6}{stats['p50']:>9.3f}"
+            f"{stats['p90']:>9.3f}{stats['p99']:>9.3f}{stats['max']:>9.3f}\n"
+        )
+    out.write(
+        f"\npool size {report['pool']['size']}, "
+        f"peak checked out {report['pool']['peak_checked_out']}\n"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--metadata-latency", type=float, default=0.3)
+    parser.add_argument("--transcript-latency", type=float, default=0.5)
+    parser.add_argument("--whisper-latency", type=float, default=5.0)
+    parser.add_argument("--analysis-latency", type=float, default=3.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--caption-rate", type=float, default=0.9)
+    parser.add_argument("--transcript-chars", type=int, default=20_000)
+    parser.add_argument("--probe-interval", type=float, default=0.05)
+    parser.add_argument("--with-cache", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="keep the bench user")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if args.json:
+        sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    else:
+        _write_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
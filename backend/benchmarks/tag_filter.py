@@ -0,0 +1,211 @@
+"""Compare the old substring tag filter with the GIN-indexed array operators.
+
+Usage (from ``backend/``, with ``DATABASE_URL`` pointing at a migrated
+database)::
+
+    python -m benchmarks.tag_filter --videos 100000 --repeat 20 [--json]
+
+Seeds a throwaway user with ``--videos`` videos whose keywords follow a
+Zipf-like distribution over a fixed vocabulary (which deliberately contains
+short tags such as "go" that are substrings of others), runs ``ANALYZE``
+and then times the ``list_videos`` count and first-page queries for a few
+tag selections with:
+
+* ``like``  — ``lower(array_to_string(keywords, ' ')) LIKE '%tag%'``, the
+  filter used before the GIN index existed
+* ``array`` — ``keywords && tags`` / ``keywords @> tags``
+
+Reported per case: median and p90 latency of each query, matched rows (the
+difference is the substring false positives) and whether the plan used
+``ix_videos_keywords``. The user and its videos are deleted at the end.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import secrets
+import statistics
+import sys
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import and_, delete, func, insert, or_, select, text
+
+from app.database import async_session, engine
+from app.models import User, Video
+from app.services.tags import keywords_filter
+
+_VOCABULARY = [
+    "go", "golang", "django", "python", "ai", "openai", "rust", "trust",
+    "react", "reactivity", "java", "javascript", "sql", "postgresql", "ml",
+    "html", "css", "scss", "data", "big data", "cloud", "security",
+    "devops", "kubernetes", "docker", "linux", "career", "design",
+]  # fmt: skip
+_VOCABULARY += [f"topic {i}" for i in range(2_000)]
+
+_CASES: list[tuple[str, list[str], bool]] = [
+    ("popular tag", ["python"], False),
+    ("short tag (substring of others)", ["go"], False),
+    ("rare tag", ["topic 1999"], False),
+    ("any of three", ["rust", "go", "ai"], False),
+    ("all of two", ["python", "data"], True),
+]
+
+_BATCH = 5_000
+
+
+def _legacy_filter(tags: list[str], match_all: bool):
+    keyword_text = func.lower(func.array_to_string(Video.keywords, " "))
+    conditions = [keyword_text.contains(item) for item in tags]
+    return and_(*conditions) if match_all else or_(*conditions)
+
+
+def _random_keywords(rng: random.Random) -> list[str]:
+    # Low indices (the named tags) are far more common than "topic N"
+    count = rng.randint(3, 8)
+    picks = {
+        _VOCABULARY[min(int(rng.paretovariate(0.6)) - 1, len(_VOCABULARY) - 1)]
+        for _ in range(count)
+    }
+    return sorted(picks)
+
+
+async def _seed(videos: int, seed: int) -> uuid.UUID:
+    rng = random.Random(seed)
+    async with async_session() as db:
+        user = User(username=f"bench-{secrets.token_hex(6)}", password_hash="!")
+        db.add(user)
+        await db.flush()
+
+        for start in range(0, videos, _BATCH):
+            rows = [
+                {
+                    "user_id": user.id,
+                    "youtube_url": f"https://www.youtube.com/watch?v=bench{i:07d}",
+                    "youtube_id": f"bench{i:07d}",
+                    "title": f"Benchmark video {i}",
+                    "keywords": _random_keywords(rng),
+                }
+                for i in range(start, min(start + _BATCH, videos))
+            ]
+            await db.execute(insert(Video), rows)
+        await db.commit()
+
+    async with async_session() as db:
+        await db.execute(text("ANALYZE videos"))
+        await db.commit()
+    return user.id
+
+
+async def _timed(db, stmt, repeat: int) -> tuple[list[float], Any]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = (await db.execute(stmt)).all()
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+
+def _summary(timings: list[float]) -> dict[str, float]:
+    deciles = statistics.quantiles(timings, n=10) if len(timings) > 1 else timings
+    return {
+        "p50_ms": round(statistics.median(timings) * 1000, 2),
+        "p90_ms": round(deciles[-1] * 1000, 2),
+    }
+
+
+async def _run_case(
+    user_id: uuid.UUID, tags: list[str], match_all: bool, repeat: int
+) -> dict[str, Any]:
+    report: dict[str, Any] = {}
+    filters = {
+        "like": _legacy_filter(tags, match_all),
+        "array": keywords_filter(tags, match_all=match_all),
+    }
+    async with async_session() as db:
+        for name, condition in filters.items():
+            base = select(Video.id).where(Video.user_id == user_id, condition)
+            count_stmt = select(func.count()).select_from(base.subquery())
+            page_stmt = base.order_by(Video.created_at.desc()).limit(50)
+
+            count_timings, count_rows = await _timed(db, count_stmt, repeat)
+            page_timings, _ = await _timed(db, page_stmt, repeat)
+
+            compiled = count_stmt.compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+            plan = await db.execute(text(f"EXPLAIN {compiled}"))
+            plan_text = "\n".join(row[0] for row in plan.all())
+
+            report[name] = {
+                "matches": count_rows[0][0],
+                "count": _summary(count_timings),
+                "page": _summary(page_timings),
+                "uses_gin_index": "ix_videos_keywords" in plan_text,
+            }
+    return report
+
+
+async def _cleanup(user_id: uuid.UUID) -> None:
+    async with async_session() as db:
+        await db.execute(delete(User).where(User.id == user_id))
+        await db.commit()
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    user_id = await _seed(args.videos, args.seed)
+    try:
+        cases = {}
+        for label, tags, match_all in _CASES:
+            cases[label] = {
+                "tags": tags,
+                "mode": "all" if match_all else "any",
+                **await _run_case(user_id, tags, match_all, args.repeat),
+            }
+    finally:
+        if not args.keep:
+            await _cleanup(user_id)
+    return {"videos": args.videos, "repeat": args.repeat, "cases": cases}
+
+
+def _write_report(report: dict[str, Any]) -> None:
+    out = sys.stdout
+    out.write(f"{report['videos']} videos, {report['repeat']} runs per query\n\n")
+    header = (
+        f"{'case':<34}{'filter':<7}{'matches':>9}"
+        f"{'count p50':>11}{'page p50':>10}{'index':>7}"
+    )
+    out.write(header + "\n" + "-" * len(header) + "\n")
+    for label, case in report["cases"].items():
+        for name in ("like", "array"):
+            row = case[name]
+            out.write(
+                f"{label:<34}{name:<7}{row['matches']:>9}"
+                f"{row['count']['p50_ms']:>9.1f}ms{row['page']['p50_ms']:>8.1f}ms"
+                f"{'yes' if row['uses_gin_index'] else 'no':>7}\n"
+            )
+            label = ""
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="keep the bench user")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    if args.json:
+        sys.stdout.write(json.dumps(report, indent=2) + "\n")
+    else:
+        _write_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
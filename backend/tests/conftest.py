@@ -1,15 +1,30 @@
 """Shared test fixtures."""
 
+import re
+import unicodedata
 import uuid
+from collections import defaultdict
 from datetime import UTC, datetime
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from app.config import settings
 from app.database import get_db
 from app.dependencies import get_current_user
-from app.models import Category, Collection, TagAlias, User, Video, VideoJob
+from app.models import (
+    AnalysisCacheEntry,
+    Category,
+    Collection,
+    TagAlias,
+    User,
+    UserSettings,
+    Video,
+    VideoJob,
+)
+from app.services.embeddings import EmbeddingIndexCache
+from app.services.view_tracker import ViewTracker
 
 TEST_USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
 
@@ -36,16 +51,115 @@ def make_video(**overrides) -> Video:
         keywords=["test", "python"],
         notes=None,
         transcript_source="captions",
+        analysis_status="complete",
         created_at=datetime(2026, 1, 15, tzinfo=UTC),
         updated_at=datetime(2026, 1, 15, tzinfo=UTC),
         view_count=0,
         last_viewed_at=None,
         is_favourite=False,
+        random_key=0.5,
     )
     defaults.update(overrides)
     return Video(**defaults)
 
 
+# ---------------------------------------------------------------------------
+# Full-text search emulation
+# ---------------------------------------------------------------------------
+
+# ts_rank_cd's default weights for A, B, C and D
+_TS_WEIGHTS = (1.0, 0.4, 0.2, 0.1)
+
+
+def _fold(text: str) -> list[str]:
+    """Approximate unaccent + the 'simple' text search configuration."""
+    decomposed = unicodedata.normalize("NFKD", text.replace("đ", "d").replace("Đ", "D"))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return re.findall(r"\w+", stripped.lower())
+
+
+def _fake_ts_fields(video: Video) -> list[list[str]]:
+    return [
+        _fold(video.title or ""),
+        _fold(f"{video.channel_name or ''} {' '.join(video.keywords or [])}"),
+        _fold(video.key_knowledge or ""),
+        _fold(video.explanation or ""),
+    ]
+
+
+def _fake_ts_match(video: Video, query: str, websearch: bool) -> float:
+    """Score ``video`` against a to_tsquery/websearch_to_tsquery string.
+
+    Returns 0.0 for no match, otherwise a weight-based stand-in for
+    ts_rank_cd.
+    """
+    fields = _fake_ts_fields(video)
+
+    def word_weight(word: str, prefix: bool) -> float:
+        for weight, tokens in zip(_TS_WEIGHTS, fields, strict=True):
+            if any(t.startswith(word) if prefix else t == word for t in tokens):
+                return weight
+        return 0.0
+
+    def phrase_weight(words: list[str]) -> float:
+        for weight, tokens in zip(_TS_WEIGHTS, fields, strict=True):
+            for i in range(len(tokens) - len(words) + 1):
+                if tokens[i : i + len(words)] == words:
+                    return weight
+        return 0.0
+
+    if not websearch:
+        terms = [term.removesuffix(":*") for term in query.split(" & ")]
+        weights = [word_weight(_fold(term)[0], prefix=True) for term in terms]
+        return sum(weights) if all(weights) else 0.0
+
+    best = 0.0
+    for alternative in re.split(r"\s+OR\s+", query):
+        phrases = [_fold(p) for p in re.findall(r'"([^"]*)"', alternative)]
+        rest = re.sub(r'"[^"]*"', " ", alternative).split()
+        excluded = [_fold(w[1:]) for w in rest if w.startswith("-")]
+        words = [_fold(w) for w in rest if not w.startswith("-")]
+        if any(phrase_weight(w) for w in excluded if w):
+            continue
+        weights = [phrase_weight(p) for p in phrases + words if p]
+        if weights and all(weights):
+            best = max(best, sum(weights))
+    return best
+
+
+def _trigrams(word: str) -> set[str]:
+    padded = f"  {word} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _fake_word_similarity(query: str, text: str) -> float:
+    """Approximate pg_trgm's word_similarity(query, text)."""
+    query_words = _fold(query)
+    text_words = _fold(text)
+    if not query_words or not text_words:
+        return 0.0
+    wanted = set().union(*(_trigrams(w) for w in query_words))
+    size = len(query_words)
+    best = 0.0
+    for i in range(max(len(text_words) - size + 1, 1)):
+        window = set().union(*(_trigrams(w) for w in text_words[i : i + size]))
+        best = max(best, len(wanted & window) / len(wanted))
+    return best
+
+
+def _fake_fuzzy_match(video: Video, query: str) -> float:
+    """Score for the fuzzy search filter; 0.0 when the video doesn't match."""
+    folded = " ".join(_fold(query))
+    score = 0.0
+    for text in (video.title or "", video.channel_name or ""):
+        if folded and folded in " ".join(_fold(text)):
+            score = max(score, 1.0)
+        similarity = _fake_word_similarity(query, text)
+        if similarity >= settings.fuzzy_search_threshold:
+            score = max(score, similarity)
+    return score
+
+
 # ---------------------------------------------------------------------------
 # Mock DB session
 # ---------------------------------------------------------------------------
@@ -61,6 +175,16 @@ class FakeDB:
         self.category_store: dict[uuid.UUID, Category] = {}
         self.collection_store: dict[uuid.UUID, Collection] = {}
         self.collection_videos: dict[uuid.UUID, list[uuid.UUID]] = {}
+        self.analysis_cache_store: dict[str, AnalysisCacheEntry] = {}
+        self.preferences: dict[uuid.UUID, dict] = {}
+        self.library_versions: dict[uuid.UUID, int] = {}
+        self.embedding_versions: dict[uuid.UUID, int] = {}
+        # video_relations: video id -> related video ids, best first
+        self.relations: dict[uuid.UUID, list[uuid.UUID]] = {}
+        # Scores as stored, which go stale when keywords change; lists set
+        # directly by a test fall back to the current overlap
+        self.relation_scores: dict[tuple[uuid.UUID, uuid.UUID], int] = {}
+        self.executed: list[str] = []
 
     async def get(self, model, pk):
         if model is VideoJob:
@@ -71,12 +195,158 @@ class FakeDB:
             return self.category_store.get(pk)
         if model is Collection:
             return self.collection_store.get(pk)
+        if model is AnalysisCacheEntry:
+            return self.analysis_cache_store.get(pk)
         return self.store.get(pk)
 
     async def execute(self, stmt):
         result = MagicMock()
         sql = str(stmt)
         params = stmt.compile().params
+        self.executed.append(sql)
+
+        if "set_config(" in sql:
+            return result
+
+        if sql.startswith("EXPLAIN"):
+            # A deliberately rough planner: every video of every user
+            result.scalar.return_value = [{"Plan": {"Plan Rows": len(self.store)}}]
+            return result
+
+        if sql.startswith("UPDATE videos") and "FROM (VALUES" in sql:
+            # The view tracker's batch: (id, views, viewed_at) per row
+            flat = [v for k, v in params.items() if k.startswith("param_")]
+            window_start = params["last_viewed_at_1"]
+            moved = []
+            for video_id, views, viewed_at in zip(
+                flat[0::3], flat[1::3], flat[2::3], strict=True
+            ):
+                video = self.store.get(video_id)
+                if video is None:
+                    continue
+                moved.append(
+                    (
+                        video.user_id,
+                        not video.view_count
+                        or video.last_viewed_at is None
+                        or video.last_viewed_at < window_start,
+                    )
+                )
+                video.view_count = (video.view_count or 0) + views
+                if video.last_viewed_at is None or viewed_at > video.last_viewed_at:
+                    video.last_viewed_at = viewed_at
+            result.all.return_value = moved
+            return result
+
+        if sql.startswith("UPDATE users"):
+            user_id = params["id_1"]
+            self.library_versions[user_id] = self.library_versions.get(user_id, 0) + 1
+            if "embedding_version" in sql:
+                versions = self.embedding_versions
+                versions[user_id] = versions.get(user_id, 0) + 1
+            return result
+
+        if sql.startswith("DELETE FROM video_relations"):
+            for video_id in params["video_id_1"]:
+                self.relations.pop(video_id, None)
+            return result
+
+        if sql.startswith("INSERT INTO video_relations") and "VALUES" in sql:
+            rows: dict[str, dict] = defaultdict(dict)
+            for key, value in params.items():
+                column, _, row = key.rpartition("_m")
+                rows[row][column] = value
+            for row in sorted(rows.values(), key=lambda row: row["rank"]):
+                pair = (row["video_id"], row["related_video_id"])
+                self.relations.setdefault(pair[0], []).append(pair[1])
+                self.relation_scores[pair] = row["score"]
+            return result
+
+        if sql.startswith("INSERT INTO video_relations"):
+            source_ids = next(v for v in params.values() if isinstance(v, list))
+            for video_id in source_ids:
+                if video_id in self.store:
+                    self.relations[video_id] = self._rank_related(video_id)
+                    for related_id in self.relations[video_id]:
+                        self.relation_scores[video_id, related_id] = self._overlap(
+                            self.store[video_id], self.store[related_id]
+                        )
+            return result
+
+        if "FROM videos AS changed JOIN videos AS other" in sql:
+            # update_relations: (other, changed, score, created_at, k-th score)
+            rows = []
+            for video_id in next(v for v in params.values() if isinstance(v, list)):
+                changed = self.store[video_id]
+                for other in self.store.values():
+                    score = self._overlap(changed, other)
+                    if other.id == video_id or other.user_id != changed.user_id:
+                        continue
+                    if score:
+                        stored = self.relations.get(other.id, [])
+                        kth = (
+                            self._stored_score(other.id, stored[-1])
+                            if len(stored) == settings.related_videos_top_k
+                            else None
+                        )
+                        rows.append(
+                            (other.id, video_id, score, changed.created_at, kth)
+                        )
+            result.all.return_value = rows
+            return result
+
+        if sql.startswith("SELECT video_relations.video_id, video_relations.related"):
+            rows = []
+            for video_id in params["video_id_1"]:
+                for related_id in self.relations.get(video_id, []):
+                    score = self._stored_score(video_id, related_id)
+                    created_at = self.store[related_id].created_at
+                    rows.append((video_id, related_id, score, created_at))
+            result.all.return_value = rows
+            return result
+
+        if "FROM video_relations" in sql:
+            wanted = set(params["related_video_id_1"])
+            result.scalars.return_value.all.return_value = [
+                video_id
+                for video_id, related in self.relations.items()
+                if wanted & set(related)
+            ]
+            return result
+
+        if "JOIN video_relations" in sql:
+            related = self.relations.get(params["video_id_1"], [])
+            videos = [self.store[vid] for vid in related if vid in self.store]
+            result.scalars.return_value.all.return_value = videos[: params["param_1"]]
+            return result
+
+        if "FROM user_settings" in sql:
+            preferences = self.preferences.get(params.get("user_id_1"))
+            row = (
+                UserSettings(user_id=params.get("user_id_1"), preferences=preferences)
+                if preferences is not None
+                else None
+            )
+            result.scalar_one_or_none.return_value = row
+            return result
+
+        if "INSERT INTO analysis_cache" in sql:
+            key = params["key"]
+            if key not in self.analysis_cache_store:
+                self.analysis_cache_store[key] = AnalysisCacheEntry(
+                    key=key,
+                    result=params["result"],
+                    model=params["model"],
+                    prompt_version=params["prompt_version"],
+                    hit_count=0,
+                )
+            return result
+
+        if "UPDATE analysis_cache" in sql:
+            entry = self.analysis_cache_store.get(params["key_1"])
+            if entry is not None:
+                entry.hit_count += 1
+            return result
 
         if "FROM video_jobs" in sql:
             jobs = sorted(
@@ -103,6 +373,7 @@ class FakeDB:
 
             result.scalars.return_value.all.return_value = jobs
             result.scalars.return_value.first.return_value = jobs[0] if jobs else None
+            result.first.return_value = (jobs[0].id,) if jobs else None
             result.scalar_one_or_none.return_value = jobs[0] if jobs else None
             return result
 
@@ -177,28 +448,45 @@ class FakeDB:
 
         videos = list(self.store.values())
 
-        search_pattern = next(
-            (
-                value
-                for key, value in params.items()
-                if key
-                in {"title_1", "channel_name_1", "explanation_1", "key_knowledge_1"}
-                and isinstance(value, str)
-            ),
-            None,
-        )
-        if isinstance(search_pattern, str):
-            term = search_pattern.replace("%", "").strip().lower()
-            if term:
-                videos = [
-                    video
-                    for video in videos
-                    if term in (video.title or "").lower()
-                    or term in (video.channel_name or "").lower()
-                    or term in (video.explanation or "").lower()
-                    or term in (video.key_knowledge or "").lower()
-                    or term in " ".join(video.keywords or []).lower()
-                ]
+        search_query = params.get("immutable_unaccent_1")
+        ranked: dict[uuid.UUID, float] = {}
+        if isinstance(search_query, str) and "@@" in sql:
+            websearch = "websearch_to_tsquery" in sql
+            for video in videos:
+                score = _fake_ts_match(video, search_query, websearch)
+                if score:
+                    ranked[video.id] = score
+            videos = [v for v in videos if v.id in ranked]
+
+        fuzzy_query = params.get("fuzzy_query")
+        if isinstance(fuzzy_query, str):
+            for video in videos:
+                score = _fake_fuzzy_match(video, fuzzy_query)
+                if score:
+                    ranked[video.id] = score
+            videos = [v for v in videos if v.id in ranked]
+
+        hybrid_ids = params.get("hybrid_ids")
+        if isinstance(hybrid_ids, list):
+            # Fused rank order; higher sorts first, like the SQL expression
+            positions = {video_id: i for i, video_id in enumerate(hybrid_ids)}
+            videos = [v for v in videos if v.id in positions]
+            ranked = {v.id: -float(positions[v.id] + 1) for v in videos}
+
+        tags = params.get("tags")
+        if isinstance(tags, list):
+            wanted = set(tags)
+            if "@>" in sql:
+                videos = [v for v in videos if wanted <= set(v.keywords or [])]
+            else:
+                videos = [v for v in videos if wanted & set(v.keywords or [])]
+
+        shuffle_start = params.get("shuffle_start")
+        if shuffle_start is not None:
+            if ">= :shuffle_start" in sql:
+                videos = [v for v in videos if v.random_key >= shuffle_start]
+            else:
+                videos = [v for v in videos if v.random_key < shuffle_start]
 
         category = params.get("category_1")
         if category is not None:
@@ -206,48 +494,79 @@ class FakeDB:
         elif "videos.category IS NULL" in sql:
             videos = [v for v in videos if v.category is None]
 
+        analysis_status = params.get("analysis_status_1")
+        if analysis_status is not None:
+            videos = [v for v in videos if v.analysis_status == analysis_status]
+        max_attempts = params.get("analysis_attempts_1")
+        if max_attempts is not None:
+            videos = [v for v in videos if (v.analysis_attempts or 0) < max_attempts]
+
         view_count = params.get("view_count_1")
         if view_count is not None:
             videos = [v for v in videos if (v.view_count or 0) == view_count]
+        elif "videos.view_count = 0" in sql:
+            videos = [v for v in videos if not v.view_count]
+
+        if sql.startswith("WITH filtered AS"):
+            result.all.return_value = self._facet_rows(sql, videos)
+            return result
 
-        if "count(" in sql.lower() and (
-            "from videos" in sql.lower() or "FROM videos" in sql
+        if (
+            "count(" in sql.lower()
+            and "OVER ()" not in sql
+            and ("from videos" in sql.lower() or "FROM videos" in sql)
         ):
             result.scalar.return_value = len(videos)
             return result
 
-        order_key = "created_at"
-        if "videos.title" in sql:
-            order_key = "title"
-        elif "videos.channel_name" in sql:
-            order_key = "channel_name"
-        elif "videos.duration" in sql:
-            order_key = "duration"
-
-        reverse = " desc" in sql.lower()
-        if order_key == "duration":
+        order_by = sql.split("ORDER BY")[-1] if "ORDER BY" in sql else ""
+        if any(
+            rank in order_by
+            for rank in ("ts_rank_cd", "word_similarity", "array_position")
+        ):
             videos = sorted(
                 videos,
-                key=lambda v: (
-                    getattr(v, order_key) is None,
-                    getattr(v, order_key) or 0,
-                ),
-                reverse=reverse,
+                key=lambda v: (ranked.get(v.id, 0.0), v.created_at, v.id),
+                reverse=True,
             )
         else:
+            match = re.search(r"videos\.(\w+)( DESC)?", order_by)
+            order_key = match.group(1) if match else "created_at"
+            reverse = bool(match and match.group(2))
+            # NULLS LAST in both directions, ties broken by id
+            present = [v for v in videos if getattr(v, order_key) is not None]
+            missing = [v for v in videos if getattr(v, order_key) is None]
             videos = sorted(
-                videos,
-                key=lambda v: (
-                    getattr(v, order_key) is None,
-                    str(getattr(v, order_key) or ""),
-                ),
+                present,
+                key=lambda v: (getattr(v, order_key), v.id),
                 reverse=reverse,
-            )
+            ) + sorted(missing, key=lambda v: v.id, reverse=reverse)
+            # A nullable sort column's cursor reads its NULL rows separately
+            where = sql.split("ORDER BY")[0]
+            if f"videos.{order_key} IS NOT NULL" in where:
+                videos = [v for v in videos if getattr(v, order_key) is not None]
+            elif f"videos.{order_key} IS NULL" in where:
+                videos = [v for v in videos if getattr(v, order_key) is None]
+
+        cursor_ids = [
+            value for key, value in params.items() if key.startswith("cursor_")
+        ]
+        if cursor_ids:
+            # The id is always the last cursor key; resume right after it
+            last_id = cursor_ids[-1]
+            position = next(i for i, v in enumerate(videos) if v.id == last_id)
+            videos = videos[position + 1 :]
 
         youtube_id = params.get("youtube_id_1")
         if youtube_id is not None:
             videos = [v for v in videos if v.youtube_id == youtube_id]
 
+        video_ids = params.get("id_1")
+        if isinstance(video_ids, list):
+            videos = [v for v in videos if v.id in set(video_ids)]
+
+        window_total = len(videos)
+
         limit = params.get("param_1")
         offset = params.get("param_2")
         if isinstance(offset, int):
@@ -255,11 +574,70 @@ class FakeDB:
         if isinstance(limit, int):
             videos = videos[:limit]
 
+        if sql.startswith("SELECT videos.id, videos.embedding \nFROM"):
+            result.all.return_value = [
+                (v.id, v.embedding) for v in videos if v.embedding is not None
+            ]
+            return result
+
+        column = re.match(r"SELECT videos\.(\w+) \nFROM", sql)
+        if column:
+            # A single-column select, e.g. the related-video bookkeeping
+            values = [getattr(v, column.group(1)) for v in videos]
+            result.scalars.return_value.all.return_value = values
+            return result
+
         result.scalars.return_value.all.return_value = videos
         result.scalars.return_value.first.return_value = videos[0] if videos else None
         result.scalar_one_or_none.return_value = videos[0] if videos else None
+        extras = []
+        if "AS sort_rank" in sql:
+            extras.append(lambda v: ranked.get(v.id, 0.0))
+        if "AS total_count" in sql:
+            extras.append(lambda v: window_total)
+        result.all.return_value = [(v, *(f(v) for f in extras)) for v in videos]
         return result
 
+    def _facet_rows(self, sql: str, videos: list[Video]) -> list[tuple]:
+        """(facet, value, count) rows of the facet query over ``videos``."""
+        counts: dict[tuple[str, str | None], int] = defaultdict(int)
+        for video in videos:
+            if "filtered.category" in sql:
+                counts["category", video.category] += 1
+            if "filtered.is_favourite" in sql:
+                counts["favourite", str(bool(video.is_favourite)).lower()] += 1
+            if "unnest(filtered.keywords)" in sql:
+                for tag in set(video.keywords or []):
+                    counts["tag", tag] += 1
+            if "JOIN collection_videos" in sql:
+                for collection_id, video_ids in self.collection_videos.items():
+                    if video.id in video_ids:
+                        counts["collection", str(collection_id)] += 1
+        return [(facet, value, count) for (facet, value), count in counts.items()]
+
+    @staticmethod
+    def _overlap(source: Video, other: Video) -> int:
+        return len(set(source.keywords or []) & set(other.keywords or []))
+
+    def _stored_score(self, video_id: uuid.UUID, related_id: uuid.UUID) -> int:
+        score = self.relation_scores.get((video_id, related_id))
+        if score is None:
+            score = self._overlap(self.store[video_id], self.store[related_id])
+        return score
+
+    def _rank_related(self, video_id: uuid.UUID) -> list[uuid.UUID]:
+        source = self.store[video_id]
+        scored = [
+            (self._overlap(source, v), v)
+            for v in self.store.values()
+            if v.id != video_id and v.user_id == source.user_id
+        ]
+        scored = [(score, v) for score, v in scored if score]
+        # score DESC, created_at DESC, id
+        scored.sort(key=lambda item: item[1].id)
+        scored.sort(key=lambda item: (item[0], item[1].created_at), reverse=True)
+        return [v.id for _, v in scored[: settings.related_videos_top_k]]
+
     def add(self, obj):
         if not hasattr(obj, "id") or obj.id is None:
             obj.id = uuid.uuid4()
@@ -306,6 +684,11 @@ class FakeDB:
             self.collection_videos.pop(obj.id, None)
             return
         self.store.pop(obj.id, None)
+        # ON DELETE CASCADE of video_relations
+        self.relations.pop(obj.id, None)
+        for related in self.relations.values():
+            if obj.id in related:
+                related.remove(obj.id)
 
     async def commit(self):
         for col in self.collection_store.values():
@@ -346,9 +729,15 @@ def client(fake_db):
             username="test-user",
             password_hash="hashed",
             created_at=datetime(2026, 1, 15, tzinfo=UTC),
+            library_version=fake_db.library_versions.get(TEST_USER_ID, 0),
+            embedding_version=fake_db.embedding_versions.get(TEST_USER_ID, 0),
         )
 
     app.dependency_overrides[get_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
-    yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    with (
+        patch("app.routers.videos.view_tracker", ViewTracker()),
+        patch("app.routers.videos.embedding_indexes", EmbeddingIndexCache()),
+    ):
+        yield AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
     app.dependency_overrides.clear()
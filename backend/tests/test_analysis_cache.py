@@ -0,0 +1,88 @@
+"""Tests for the content-addressed analysis cache."""
+
+import pytest
+
+from app.services.analysis_cache import AnalysisCache, analysis_cache_key
+from app.services.summarizer import AnalysisUsage, KnowledgeResult
+
+RESULT = KnowledgeResult(
+    explanation="exp",
+    key_knowledge="- key",
+    critical_analysis="crit",
+    real_world_applications="apps",
+    keywords=["python"],
+    category="technology",
+    usage=AnalysisUsage(
+        prompt_version="v1",
+        prompt_tokens=100,
+        cached_tokens=0,
+        completion_tokens=20,
+        reasoning_tokens=0,
+    ),
+)
+
+
+def _key(**overrides) -> str:
+    args = dict(
+        transcript="some transcript",
+        title="Title",
+        category_slugs=["technology", "other"],
+        model="gpt-5.2",
+        prompt_version="v1",
+    )
+    args.update(overrides)
+    return analysis_cache_key(**args)
+
+
+def test_key_ignores_category_order():
+    assert _key(category_slugs=["other", "technology"]) == _key()
+
+
+@pytest.mark.parametrize(
+    "override",
+    [
+        {"transcript": "other transcript"},
+        {"title": "Other"},
+        {"category_slugs": ["technology"]},
+        {"model": "gpt-5-mini"},
+        {"prompt_version": "v2"},
+    ],
+)
+def test_key_changes_with_each_input(override):
+    assert _key(**override) != _key()
+
+
+@pytest.mark.asyncio
+async def test_miss_then_database_hit(fake_db):
+    writer = AnalysisCache()
+    key = _key()
+    assert await writer.get(fake_db, key) is None
+
+    await writer.put(fake_db, key, RESULT, model="gpt-5.2", prompt_version="v1")
+
+    # A fresh cache (another worker) has to go to the database.
+    reader = AnalysisCache()
+    cached = await reader.get(fake_db, key)
+    assert cached is not None
+    result, source = cached
+    assert source == "database"
+    assert result.explanation == "exp"
+    assert result.usage is None
+    assert fake_db.analysis_cache_store[key].hit_count == 1
+
+    cached = await reader.get(fake_db, key)
+    assert cached is not None and cached[1] == "memory"
+    assert reader.stats.database_hits == 1
+    assert reader.stats.memory_hits == 1
+    assert reader.stats.hit_rate == 1.0
+    assert writer.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_layer_is_bounded(fake_db):
+    cache = AnalysisCache(max_memory_entries=2)
+    for index in range(3):
+        await cache.put(
+            fake_db, _key(title=str(index)), RESULT, model="m", prompt_version="v1"
+        )
+    assert cache.memory_entries == 2
@@ -0,0 +1,77 @@
+"""Tests for the on-disk audio cache and its use by Whisper transcription."""
+
+import os
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.services.audio_cache import AudioCache
+from app.services.transcription import AUDIO_PROFILE, TranscriptionService
+
+
+def _write(path, size: int) -> None:
+    path.write_bytes(b"\0" * size)
+
+
+def test_chunk_text_round_trip(tmp_path):
+    entry = AudioCache(tmp_path, max_bytes=1024).entry("abc", AUDIO_PROFILE)
+    assert entry.audio_path is None
+    assert entry.chunk_text(3, 1) is None
+
+    entry.store_chunk_text(3, 1, "hello world")
+
+    assert entry.chunk_text(3, 1) == "hello world"
+    assert entry.chunk_text(2, 1) is None
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = AudioCache(tmp_path, max_bytes=250)
+    for age, youtube_id in enumerate(["new", "mid", "old"]):
+        entry = cache.entry(youtube_id, AUDIO_PROFILE)
+        _write(entry.path / "audio.mp3", 100)
+        os.utime(entry.path, (1_000 - age, 1_000 - age))
+
+    assert cache.evict() == 1
+    remaining = sorted(p.name for p in tmp_path.iterdir())
+    assert remaining == [f"mid-{AUDIO_PROFILE}", f"new-{AUDIO_PROFILE}"]
+
+
+def test_evict_keeps_entry_in_use(tmp_path):
+    cache = AudioCache(tmp_path, max_bytes=50)
+    old = cache.entry("old", AUDIO_PROFILE)
+    _write(old.path / "audio.mp3", 100)
+    os.utime(old.path, (1, 1))
+
+    cache.evict(keep=old)
+
+    assert old.path.is_dir()
+
+
+@pytest.mark.asyncio
+async def test_whisper_retry_reuses_downloaded_audio(tmp_path):
+    service = TranscriptionService()
+    service.audio_cache = AudioCache(tmp_path, max_bytes=10 * 1024 * 1024)
+
+    def download(youtube_id, entry):
+        source = tmp_path / "download.mp3"
+        _write(source, 1024)
+        return entry.store_audio(source)
+
+    transcribe = AsyncMock(side_effect=[Exception("timeout"), "spoken words"])
+    with (
+        patch.object(service, "_download_audio", side_effect=download) as dl,
+        patch.object(service, "_transcribe_file", transcribe),
+    ):
+        with pytest.raises(RuntimeError):
+            await service.transcribe_with_whisper("abc")
+        text, source = await service.transcribe_with_whisper("abc")
+        assert (text, source) == ("spoken words", "whisper")
+
+        # A third run is served entirely from the cache.
+        assert await service.transcribe_with_whisper("abc") == (
+            "spoken words",
+            "whisper",
+        )
+
+    assert dl.call_count == 1
+    assert transcribe.await_count == 2
@@ -0,0 +1,97 @@
+"""Tests for chapter splitting, grouping and merging."""
+
+from app.services.chapters import (
+    format_timestamp,
+    group_chapters,
+    merge_chapter_analyses,
+    split_by_chapters,
+)
+from app.services.summarizer import KnowledgeResult
+from app.services.youtube import Chapter, TranscriptSegment, _parse_chapters
+
+INTRO = Chapter(title="Intro", start_time=0.0, end_time=60.0)
+BODY = Chapter(title="Body", start_time=60.0, end_time=600.0)
+OUTRO = Chapter(title="Outro", start_time=600.0, end_time=660.0)
+
+
+def _segment(start: float, text: str) -> TranscriptSegment:
+    return TranscriptSegment(start=start, duration=5.0, text=text)
+
+
+def _result(text: str, keywords: list[str], category: str) -> KnowledgeResult:
+    return KnowledgeResult(
+        explanation=text,
+        key_knowledge=f"- {text}",
+        critical_analysis="",
+        real_world_applications="",
+        keywords=keywords,
+        category=category,
+    )
+
+
+def test_format_timestamp():
+    assert format_timestamp(0) == "0:00"
+    assert format_timestamp(75.9) == "1:15"
+    assert format_timestamp(3725) == "1:02:05"
+
+
+def test_split_assigns_segments_to_chapter_they_start_in():
+    segments = [
+        _segment(0, "hello"),
+        _segment(59, "welcome"),
+        _segment(60, "main"),
+        _segment(700, "late"),
+    ]
+    pieces = split_by_chapters(segments, (INTRO, BODY, OUTRO))
+    assert pieces == [(INTRO, "hello welcome"), (BODY, "main"), (OUTRO, "late")]
+
+
+def test_split_skips_empty_chapters():
+    pieces = split_by_chapters([_segment(10, "only intro")], (INTRO, BODY))
+    assert pieces == [(INTRO, "only intro")]
+
+
+def test_group_chapters_merges_adjacent_pieces():
+    pieces = [(INTRO, "a" * 10), (BODY, "b" * 10), (OUTRO, "c" * 10)]
+    grouped = group_chapters(pieces, max_groups=2)
+    assert len(grouped) == 2
+    first, _ = grouped[0]
+    assert first.title == "Intro / Body"
+    assert (first.start_time, first.end_time) == (0.0, 600.0)
+    assert grouped[1] == (OUTRO, "c" * 10)
+
+
+def test_group_chapters_keeps_pieces_under_limit():
+    pieces = [(INTRO, "a"), (BODY, "b")]
+    assert group_chapters(pieces, max_groups=8) == pieces
+
+
+def test_merge_adds_timestamped_headings_and_votes():
+    merged = merge_chapter_analyses(
+        [
+            (INTRO, _result("intro text", ["python"], "technology")),
+            (BODY, _result("body text", ["asyncio", "python"], "technology")),
+            (OUTRO, _result("", ["wrap-up"], "other")),
+        ]
+    )
+    assert merged.explanation == (
+        "### Intro (0:00)\n\nintro text\n\n### Body (1:00)\n\nbody text"
+    )
+    assert merged.critical_analysis == ""
+    assert merged.keywords == ["python", "asyncio", "wrap-up"]
+    assert merged.category == "technology"
+
+
+def test_parse_chapters_skips_malformed_entries():
+    info = {
+        "chapters": [
+            {"title": "Body", "start_time": 60, "end_time": 600},
+            {"title": "Intro", "start_time": 0, "end_time": 60},
+            {"title": "Broken", "start_time": None, "end_time": 10},
+            {"title": "Empty", "start_time": 600, "end_time": 600},
+        ]
+    }
+    assert _parse_chapters(info) == (
+        Chapter(title="Intro", start_time=0.0, end_time=60.0),
+        Chapter(title="Body", start_time=60.0, end_time=600.0),
+    )
@@ -0,0 +1,61 @@
+"""Tests for deterministic transcript compaction."""
+
+from app.services.compaction import compact_transcript
+
+
+def test_removes_bracketed_noise_and_music_symbols():
+    result = compact_transcript("[Music] hello there ♪ ♪ [Applause] friends >> yes")
+    assert result.text == "hello there friends yes"
+
+
+def test_removes_filler_words_but_keeps_content():
+    result = compact_transcript("so um we need uh, to measure erm latency")
+    assert result.text == "so we need to measure latency"
+    assert result.removed_fillers == 3
+
+
+def test_keeps_words_that_only_look_like_fillers():
+    result = compact_transcript("use a 5 mm drill bit, ừ đúng rồi")
+    assert result.text == "use a 5 mm drill bit, ừ đúng rồi"
+    assert result.removed_fillers == 0
+
+
+def test_removes_rolling_caption_overlap():
+    # Auto captions repeat the tail of each line at the start of the next.
+    text = "and then we go to the go to the store and buy milk buy milk today"
+    result = compact_transcript(text)
+    assert result.text == "and then we go to the store and buy milk today"
+    assert result.removed_repeats == 5
+
+
+def test_repeat_detection_ignores_case_and_punctuation():
+    result = compact_transcript("The event loop. the event loop runs tasks")
+    assert result.text == "The event loop. runs tasks"
+
+
+def test_keeps_single_repeated_words():
+    result = compact_transcript("it is very very fast")
+    assert result.text == "it is very very fast"
+
+
+def test_unescapes_html_entities():
+    result = compact_transcript("it&#39;s fine")
+    assert result.text == "it's fine"
+
+
+def test_is_deterministic_and_reports_ratio():
+    text = "[Music] um the cache the cache is warm now"
+    first = compact_transcript(text)
+    second = compact_transcript(text)
+    assert first == second
+    assert first.compression_ratio < 1.0
+    data = first.as_dict()
+    assert "text" not in data
+    assert data["original_chars"] == len(text)
+    assert data["compression_ratio"] == first.compression_ratio
+
+
+def test_empty_text():
+    result = compact_transcript("")
+    assert result.text == ""
+    assert result.compression_ratio == 1.0
@@ -0,0 +1,83 @@
+"""Tests for the pre-flight duration and cost guard."""
+
+import pytest
+
+from app.config import settings
+from app.services.cost_guard import check_job, estimate_job_cost, limits_for
+from app.services.youtube import Chapter, VideoMetadata
+
+
+def _metadata(duration: int | None, chapters: tuple[Chapter, ...] = ()):
+    return VideoMetadata(
+        title="Talk",
+        thumbnail_url=None,
+        channel_name=None,
+        duration=duration,
+        chapters=chapters,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _limits(monkeypatch):
+    monkeypatch.setattr(settings, "max_video_duration_seconds", 3 * 3600)
+    monkeypatch.setattr(settings, "max_estimated_cost_usd", 1.5)
+    monkeypatch.setattr(settings, "over_limit_action", "reject")
+
+
+def test_short_video_is_allowed():
+    decision = check_job(_metadata(600))
+    assert decision.action == "allow"
+    assert decision.reasons == []
+    assert 0 < decision.estimate.total_cost_usd < 1.5
+
+
+def test_ten_hour_livestream_is_rejected():
+    decision = check_job(_metadata(10 * 3600))
+    assert decision.action == "reject"
+    assert len(decision.reasons) == 2
+    assert decision.estimate.whisper_cost_usd == pytest.approx(3.6)
+
+
+def test_unknown_duration_is_over_the_limits(monkeypatch):
+    decision = check_job(_metadata(None))
+    assert decision.action == "reject"
+    assert decision.reasons == ["unknown duration, so the cost can't be estimated"]
+
+    monkeypatch.setattr(settings, "over_limit_action", "low_priority")
+    assert check_job(_metadata(None)).action == "low_priority"
+
+
+def test_user_limits_only_tighten_global_ones():
+    limits = limits_for(
+        {
+            "max_video_duration_seconds": 600,
+            "max_estimated_cost_usd": 99,
+            "over_limit_action": "low_priority",
+        }
+    )
+    assert limits.max_duration_seconds == 600
+    assert limits.max_cost_usd == 1.5
+    assert limits.over_limit_action == "low_priority"
+
+
+def test_invalid_user_limits_are_ignored():
+    limits = limits_for(
+        {
+            "max_video_duration_seconds": "short",
+            "max_estimated_cost_usd": -1,
+            "over_limit_action": "explode",
+        }
+    )
+    assert limits.max_duration_seconds == 3 * 3600
+    assert limits.max_cost_usd == 1.5
+    assert limits.over_limit_action == "reject"
+
+
+def test_chaptered_video_is_estimated_per_chapter_call():
+    chapters = tuple(
+        Chapter(title=str(i), start_time=i * 600.0, end_time=(i + 1) * 600.0)
+        for i in range(4)
+    )
+    estimate = estimate_job_cost(_metadata(2400, chapters))
+    assert estimate.llm_calls == 4
+    assert estimate.llm_cost_usd > estimate_job_cost(_metadata(2400)).llm_cost_usd
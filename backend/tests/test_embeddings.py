@@ -0,0 +1,159 @@
+"""Tests for the hashed TF-IDF embeddings and their top-k index."""
+
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.embeddings import (
+    EMBEDDING_DIMENSIONS,
+    EmbeddingIndex,
+    backfill_embeddings,
+    embed_text,
+)
+
+_DOCS = {
+    "rust": ("Rust ownership explained", "Borrow checker, lifetimes and ownership"),
+    "borrow": ("Understanding the borrow checker", "Ownership rules and lifetimes"),
+    "bread": ("Sourdough bread at home", "Starter, hydration and baking times"),
+    "pasta": ("Fresh pasta by hand", "Flour, eggs and kneading the dough"),
+}
+
+
+def _index() -> tuple[EmbeddingIndex, dict[str, uuid.UUID]]:
+    ids = {name: uuid.uuid4() for name in _DOCS}
+    blobs = [embed_text(title, body) for title, body in _DOCS.values()]
+    return EmbeddingIndex(list(ids.values()), blobs), ids
+
+
+def test_embedding_stores_only_non_zero_buckets_and_is_deterministic():
+    blob = embed_text("Rust ownership explained", "Borrow checker")
+
+    # rust, ownership, explained, borrow, checker and three bigrams
+    size = len(blob) // 8
+    assert size == 8
+    buckets = np.frombuffer(blob, dtype=np.int32, count=size)
+    assert (np.diff(buckets) > 0).all() and buckets.max() < EMBEDDING_DIMENSIONS
+    assert np.frombuffer(blob, dtype=np.float32, offset=size * 4).all()
+    assert blob == embed_text("Rust ownership explained", "Borrow checker")
+
+
+def test_text_without_content_tokens_has_no_embedding():
+    assert embed_text(None) is None
+    assert embed_text("the and of", "") is None
+
+
+def test_similar_to_ranks_shared_vocabulary_first_and_skips_itself():
+    index, ids = _index()
+
+    matches = index.similar_to(ids["rust"], limit=3)
+
+    assert matches[0].video_id == ids["borrow"]
+    assert ids["rust"] not in {match.video_id for match in matches}
+    assert [m.score for m in matches] == sorted(
+        (m.score for m in matches), reverse=True
+    )
+
+
+def test_query_text_finds_videos_without_matching_tags():
+    index, ids = _index()
+
+    matches = index.query_text("baking bread with a sourdough starter", limit=2)
+
+    assert matches[0].video_id == ids["bread"]
+    # Videos sharing no term at all are left out rather than padded in
+    assert ids["rust"] not in {match.video_id for match in matches}
+
+
+def test_unrelated_query_returns_nothing():
+    docs = [
+        (f"Episode {i} on distributed systems", f"Consensus, replication and {i}")
+        for i in range(300)
+    ]
+    index = EmbeddingIndex(
+        [uuid.uuid4() for _ in docs], [embed_text(*doc) for doc in docs]
+    )
+
+    assert index.query_text("xyzzy", limit=100) == []
+    assert index.query_text("xyzzy plugh frobnicate", limit=100) == []
+
+
+def test_matches_below_the_similarity_floor_are_dropped():
+    ids = {name: uuid.uuid4() for name in _DOCS}
+    blobs = [embed_text(title, body) for title, body in _DOCS.values()]
+    query = "sourdough bread and an unrelated pile of other words entirely"
+
+    loose = EmbeddingIndex(list(ids.values()), blobs, min_similarity=0.0)
+    strict = EmbeddingIndex(list(ids.values()), blobs, min_similarity=0.9)
+
+    assert loose.query_text(query, limit=4)[0].video_id == ids["bread"]
+    assert strict.query_text(query, limit=4) == []
+
+
+def test_empty_index_and_unknown_video():
+    index = EmbeddingIndex([], [])
+
+    assert index.query_text("anything", limit=5) == []
+    assert index.similar_to(uuid.uuid4(), limit=5) == []
+
+
+class _BackfillSession:
+    """Serves videos without an embedding and applies the batch UPDATE."""
+
+    def __init__(self, videos) -> None:
+        self.videos = {video.id: video for video in videos}
+        self.updates: list[str] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self) -> None:
+        pass
+
+    async def execute(self, stmt):
+        result = MagicMock()
+        sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+        if sql.startswith("SELECT"):
+            result.all.return_value = [
+                v for v in self.videos.values() if v.embedding is None
+            ]
+        elif sql.startswith("UPDATE videos"):
+            self.updates.append(sql)
+            flat = list(stmt.compile().params.values())
+            for video_id, blob in zip(flat[0::2], flat[1::2], strict=True):
+                self.videos[video_id].embedding = blob
+        return result
+
+
+@pytest.mark.asyncio
+async def test_backfill_writes_embeddings_without_touching_updated_at():
+    edited = datetime(2025, 6, 1)
+    videos = [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            title=title,
+            key_knowledge=body,
+            embedding=None,
+            updated_at=edited,
+        )
+        for title, body in _DOCS.values()
+    ]
+    session = _BackfillSession(videos)
+
+    with patch("app.services.embeddings.async_session", lambda: session):
+        assert await backfill_embeddings() == len(videos)
+
+    assert all(v.embedding == embed_text(v.title, v.key_knowledge) for v in videos)
+    assert all(v.updated_at == edited for v in videos)
+    # One statement per batch, and it keeps onupdate off updated_at
+    assert len(session.updates) == 1
+    assert "FROM (VALUES" in session.updates[0]
+    assert "updated_at=videos.updated_at" in session.updates[0]
@@ -1,15 +1,17 @@
 """Tests for video CRUD endpoints with mocked services."""
 
 import uuid
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from unittest.mock import patch
 
 import pytest
 
-from app.models import Category
+from app.models import Category, TagAlias
+from app.services.embeddings import embed_text
+from app.services.shuffle import shuffle_start
 from app.services.summarizer import KnowledgeResult
 from app.services.youtube import VideoMetadata
-from tests.conftest import make_video
+from tests.conftest import TEST_USER_ID, make_video
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -82,6 +84,23 @@ class TestCreateVideo:
         assert data["video_id"] == str(vid.id)
         mock_create_task.assert_not_called()
 
+    @pytest.mark.asyncio
+    @patch("app.routers.videos.asyncio.create_task")
+    @patch("app.routers.videos.youtube_service")
+    async def test_create_video_with_preview_only_starts_new_job(
+        self, mock_youtube, mock_create_task, client, fake_db
+    ):
+        mock_create_task.side_effect = _close_coro
+        vid = make_video(analysis_status="preview")
+        fake_db.store[vid.id] = vid
+        mock_youtube.extract_youtube_id.return_value = vid.youtube_id
+
+        res = await client.post("/api/videos", json={"youtube_url": MOCK_YOUTUBE_URL})
+
+        assert res.status_code == 202
+        assert res.json()["status"] == "queued"
+        mock_create_task.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_create_video_invalid_url(self, client):
         res = await client.post("/api/videos", json={"youtube_url": "not-a-url"})
@@ -98,7 +117,15 @@ class TestListVideos:
     async def test_list_empty(self, client, fake_db):
         res = await client.get("/api/videos")
         assert res.status_code == 200
-        assert res.json() == {"items": [], "total": 0, "limit": 50, "offset": 0}
+        assert res.json() == {
+            "items": [],
+            "total": 0,
+            "limit": 50,
+            "offset": 0,
+            "has_more": False,
+            "next_cursor": None,
+            "facets": None,
+        }
 
     @pytest.mark.asyncio
     async def test_list_with_videos(self, client, fake_db):
@@ -112,6 +139,21 @@ class TestListVideos:
         assert len(data["items"]) == 1
         assert data["items"][0]["title"] == "Test Video"
 
+    @pytest.mark.asyncio
+    async def test_list_loads_excerpt_instead_of_text_fields(self, client, fake_db):
+        vid = make_video(excerpt="Short preview", explanation="A long essay")
+        fake_db.store[vid.id] = vid
+
+        res = await client.get("/api/videos")
+
+        item = res.json()["items"][0]
+        assert item["excerpt"] == "Short preview"
+        assert "explanation" not in item
+        assert "key_knowledge" not in item
+        page_sql = fake_db.executed[-1]
+        for column in ("explanation", "key_knowledge", "critical_analysis", "notes"):
+            assert f"videos.{column}" not in page_sql
+
     @pytest.mark.asyncio
     async def test_filter_uncategorized(self, client, fake_db):
         uncategorized = make_video(title="No Category", category=None)
@@ -175,6 +217,208 @@ class TestListVideosPaginated:
         assert "total" in body
 
 
+class TestListVideosCursor:
+    @staticmethod
+    async def _walk(client, query: str) -> list[str]:
+        titles: list[str] = []
+        cursor = None
+        while True:
+            url = f"/api/videos?limit=2&{query}"
+            resp = await client.get(f"{url}&cursor={cursor}" if cursor else url)
+            assert resp.status_code == 200
+            body = resp.json()
+            titles += [item["title"] for item in body["items"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return titles
+
+    @pytest.mark.asyncio
+    async def test_cursor_walks_every_sort_without_gaps(self, client, fake_db):
+        for i, duration in enumerate([300, None, 120, 300, None]):
+            video = make_video(
+                title=f"Video {i}",
+                duration=duration,
+                created_at=datetime(2024, 1, i + 1, tzinfo=UTC),
+            )
+            fake_db.store[video.id] = video
+
+        for query in (
+            "sort_by=created_at&sort_order=desc",
+            "sort_by=title&sort_order=asc",
+            "sort_by=duration&sort_order=desc",
+            "sort_by=duration&sort_order=asc",
+        ):
+            walked = await self._walk(client, query)
+            resp = await client.get(f"/api/videos?limit=100&{query}")
+            assert walked == [item["title"] for item in resp.json()["items"]]
+
+    @pytest.mark.asyncio
+    async def test_nullable_sort_keys_go_last(self, client, fake_db):
+        for title, duration in (("Unknown", None), ("Short", 60), ("Long", 600)):
+            video = make_video(title=title, duration=duration)
+            fake_db.store[video.id] = video
+
+        titles = await self._walk(client, "sort_by=duration&sort_order=desc")
+
+        assert titles == ["Long", "Short", "Unknown"]
+
+    @pytest.mark.asyncio
+    async def test_exact_total_holds_across_null_segment(self, client, fake_db):
+        for duration in (600, 60, None, None):
+            video = make_video(duration=duration)
+            fake_db.store[video.id] = video
+        query = "/api/videos?limit=3&sort_by=duration&total_mode=exact"
+
+        first = (await client.get(query)).json()
+        second = (await client.get(f"{query}&cursor={first['next_cursor']}")).json()
+
+        assert first["total"] == second["total"] == 4
+        assert [item["duration"] for item in second["items"]] == [None]
+
+    @pytest.mark.asyncio
+    async def test_inserts_do_not_shift_later_pages(self, client, fake_db):
+        for i in range(4):
+            video = make_video(
+                title=f"Video {i}", created_at=datetime(2024, 1, i + 1, tzinfo=UTC)
+            )
+            fake_db.store[video.id] = video
+
+        first = (await client.get("/api/videos?limit=2")).json()
+        newer = make_video(title="Newest", created_at=datetime(2025, 1, 1, tzinfo=UTC))
+        fake_db.store[newer.id] = newer
+        second = (
+            await client.get(f"/api/videos?limit=2&cursor={first['next_cursor']}")
+        ).json()
+
+        assert [i["title"] for i in first["items"]] == ["Video 3", "Video 2"]
+        assert [i["title"] for i in second["items"]] == ["Video 1", "Video 0"]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_cursor_follows_relevance_order(self, client, fake_db):
+        for title in ("Rust ownership", "Rust async", "Weekly notes"):
+            video = make_video(title=title, explanation="rust", keywords=[])
+            fake_db.store[video.id] = video
+
+        titles = await self._walk(client, "search=rust&sort_by=relevance")
+
+        assert titles[-1] == "Weekly notes"
+        assert sorted(titles) == ["Rust async", "Rust ownership", "Weekly notes"]
+
+    @pytest.mark.asyncio
+    async def test_rejects_bad_or_mismatched_cursors(self, client, fake_db):
+        for i in range(3):
+            video = make_video(title=f"Video {i}")
+            fake_db.store[video.id] = video
+        cursor = (await client.get("/api/videos?limit=1")).json()["next_cursor"]
+
+        assert (await client.get("/api/videos?cursor=not-a-cursor")).status_code == 400
+        resp = await client.get(f"/api/videos?sort_by=title&cursor={cursor}")
+        assert resp.status_code == 400
+        resp = await client.get(f"/api/videos?sort_by=random&cursor={cursor}")
+        assert resp.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_seeded_shuffle_wraps_around_once(self, client, fake_db):
+        for i in range(7):
+            video = make_video(title=f"Video {i}", random_key=i / 7)
+            fake_db.store[video.id] = video
+        start = shuffle_start("abc")
+        by_key = [f"Video {i}" for i in range(7)]
+        first = next(i for i in range(7) if i / 7 >= start)
+
+        titles = await self._walk(client, "sort_by=random&seed=abc")
+
+        assert titles == by_key[first:] + by_key[:first]
+        assert await self._walk(client, "sort_by=random&seed=abc") == titles
+
+    @pytest.mark.asyncio
+    async def test_shuffle_without_seed_still_pages_by_cursor(self, client, fake_db):
+        for i in range(5):
+            video = make_video(title=f"Video {i}", random_key=i / 5)
+            fake_db.store[video.id] = video
+
+        titles = await self._walk(client, "sort_by=random")
+
+        assert sorted(titles) == [f"Video {i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_shuffle_rejects_offset(self, client, fake_db):
+        resp = await client.get("/api/videos?sort_by=random&offset=10")
+        assert resp.status_code == 400
+
+
+class TestListVideosTotalMode:
+    @pytest.fixture(autouse=True)
+    def _library(self, fake_db):
+        for i in range(5):
+            video = make_video(
+                title=f"Video {i}",
+                category="science" if i < 3 else None,
+                created_at=datetime(2024, 1, i + 1, tzinfo=UTC),
+            )
+            fake_db.store[video.id] = video
+
+    @pytest.mark.asyncio
+    async def test_exact_total_holds_across_cursor_pages(self, client):
+        first = (await client.get("/api/videos?limit=2")).json()
+        second = (
+            await client.get(f"/api/videos?limit=2&cursor={first['next_cursor']}")
+        ).json()
+        last = (
+            await client.get(f"/api/videos?limit=2&cursor={second['next_cursor']}")
+        ).json()
+
+        assert [first["total"], second["total"], last["total"]] == [5, 5, 5]
+        assert [first["has_more"], second["has_more"], last["has_more"]] == [
+            True,
+            True,
+            False,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_exact_total_with_offset(self, client):
+        body = (await client.get("/api/videos?limit=2&offset=2")).json()
+        assert body["total"] == 5
+
+        body = (await client.get("/api/videos?limit=2&offset=10")).json()
+        assert body["items"] == []
+        assert body["total"] == 5
+
+    @pytest.mark.asyncio
+    async def test_none_mode_reports_has_more_only(self, client):
+        body = (await client.get("/api/videos?limit=2&total_mode=none")).json()
+
+        assert body["total"] is None
+        assert body["has_more"] is True
+        assert len(body["items"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_estimated_mode(self, client):
+        # The fake planner estimates 5 rows whatever the filter
+        first = (
+            await client.get(
+                "/api/videos?category=science&total_mode=estimated&limit=2"
+            )
+        ).json()
+        assert first["total"] == 5
+
+        # On the last page the total is known exactly
+        last = (
+            await client.get(
+                "/api/videos?category=science&total_mode=estimated&limit=2"
+                f"&cursor={first['next_cursor']}"
+            )
+        ).json()
+        assert last["total"] == 3
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_total_mode(self, client):
+        resp = await client.get("/api/videos?total_mode=approximate")
+
+        assert resp.status_code == 400
+
+
 class TestSearchVideos:
     @pytest.mark.asyncio
     async def test_search_by_title(self, client, fake_db):
@@ -232,6 +476,172 @@ class TestSearchVideos:
         assert body["total"] == 1
         assert body["items"][0]["title"] == "Video A"
 
+    @pytest.mark.asyncio
+    async def test_search_matches_word_prefixes(self, client, fake_db):
+        v1 = make_video(title="Distributed consensus", keywords=[])
+        fake_db.store[v1.id] = v1
+
+        resp = await client.get("/api/videos?search=distrib cons")
+
+        assert resp.json()["total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_search_ignores_vietnamese_diacritics(self, client, fake_db):
+        v1 = make_video(title="Học máy cơ bản", keywords=["đầu tư"])
+        v2 = make_video(title="Nấu ăn", keywords=["ẩm thực"])
+        fake_db.store[v1.id] = v1
+        fake_db.store[v2.id] = v2
+
+        resp = await client.get("/api/videos?search=hoc may")
+        assert [i["title"] for i in resp.json()["items"]] == ["Học máy cơ bản"]
+
+        resp = await client.get("/api/videos?search=dau tu")
+        assert resp.json()["total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_search_supports_phrases_and_exclusions(self, client, fake_db):
+        v1 = make_video(title="Event loop internals", explanation="asyncio only")
+        v2 = make_video(title="Loop event handlers", explanation="browser events")
+        fake_db.store[v1.id] = v1
+        fake_db.store[v2.id] = v2
+
+        resp = await client.get('/api/videos?search="event loop"')
+        assert [i["title"] for i in resp.json()["items"]] == ["Event loop internals"]
+
+        resp = await client.get("/api/videos?search=loop -asyncio")
+        assert [i["title"] for i in resp.json()["items"]] == ["Loop event handlers"]
+
+    @pytest.mark.asyncio
+    async def test_search_relevance_sort_prefers_title_hits(self, client, fake_db):
+        body_hit = make_video(
+            title="Weekly notes",
+            explanation="A short aside about rust",
+            keywords=[],
+            created_at=datetime(2026, 3, 1, tzinfo=UTC),
+        )
+        title_hit = make_video(
+            title="Rust ownership",
+            keywords=[],
+            created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        )
+        fake_db.store[body_hit.id] = body_hit
+        fake_db.store[title_hit.id] = title_hit
+
+        resp = await client.get("/api/videos?search=rust&sort_by=relevance")
+
+        assert [i["title"] for i in resp.json()["items"]] == [
+            "Rust ownership",
+            "Weekly notes",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fuzzy_search_tolerates_typos(self, client, fake_db):
+        v1 = make_video(title="Python decorators explained", channel_name="Corey")
+        v2 = make_video(title="Baking sourdough", channel_name="Bread Lab")
+        fake_db.store[v1.id] = v1
+        fake_db.store[v2.id] = v2
+
+        resp = await client.get("/api/videos?search=pyhton&search_mode=fuzzy")
+
+        assert [i["title"] for i in resp.json()["items"]] == [
+            "Python decorators explained"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fuzzy_search_matches_channel_substrings(self, client, fake_db):
+        v1 = make_video(title="Sourdough", channel_name="Bread Lab")
+        v2 = make_video(title="Rust", channel_name="Corey")
+        fake_db.store[v1.id] = v1
+        fake_db.store[v2.id] = v2
+
+        resp = await client.get("/api/videos?search=ad l&search_mode=fuzzy")
+
+        assert [i["title"] for i in resp.json()["items"]] == ["Sourdough"]
+
+    @pytest.mark.asyncio
+    async def test_fuzzy_search_ranks_by_similarity(self, client, fake_db):
+        close = make_video(
+            title="Kubernetes basics",
+            created_at=datetime(2026, 1, 1, tzinfo=UTC),
+        )
+        closer = make_video(
+            title="Kubernetes",
+            created_at=datetime(2025, 1, 1, tzinfo=UTC),
+        )
+        loose = make_video(
+            title="Kubernete operators",
+            created_at=datetime(2026, 3, 1, tzinfo=UTC),
+        )
+        for video in (close, closer, loose):
+            fake_db.store[video.id] = video
+
+        resp = await client.get(
+            "/api/videos?search=kubernetes&search_mode=fuzzy&sort_by=relevance"
+        )
+
+        titles = [i["title"] for i in resp.json()["items"]]
+        assert titles == ["Kubernetes basics", "Kubernetes", "Kubernete operators"]
+
+    def _embedded(self, fake_db, title: str, **overrides):
+        video = make_video(title=title, keywords=[], **overrides)
+        video.embedding = embed_text(video.title, video.key_knowledge)
+        fake_db.store[video.id] = video
+        return video
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_adds_partial_semantic_matches(self, client, fake_db):
+        self._embedded(fake_db, "Python asyncio tutorial")
+        self._embedded(fake_db, "Asyncio event loops in Python")
+        self._embedded(fake_db, "Sourdough bread")
+
+        fulltext = await client.get(
+            "/api/videos?search=python asyncio tutorial&sort_by=relevance"
+        )
+        hybrid = await client.get(
+            "/api/videos?search=python asyncio tutorial"
+            "&search_mode=hybrid&sort_by=relevance"
+        )
+
+        assert [i["title"] for i in fulltext.json()["items"]] == [
+            "Python asyncio tutorial"
+        ]
+        body = hybrid.json()
+        assert [i["title"] for i in body["items"]] == [
+            "Python asyncio tutorial",
+            "Asyncio event loops in Python",
+        ]
+        assert body["total"] == 2
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_without_any_match_is_empty(self, client, fake_db):
+        for i in range(50):
+            self._embedded(fake_db, f"Python asyncio tutorial part {i}")
+
+        resp = await client.get(
+            "/api/videos?search=xyzzy&search_mode=hybrid&sort_by=relevance"
+        )
+
+        body = resp.json()
+        assert body["items"] == []
+        assert body["total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_keeps_the_other_filters(self, client, fake_db):
+        self._embedded(fake_db, "Python asyncio tutorial", category="technology")
+        self._embedded(fake_db, "Asyncio in Python", category="education")
+
+        resp = await client.get(
+            "/api/videos?search=python asyncio&search_mode=hybrid&category=education"
+        )
+
+        assert [i["title"] for i in resp.json()["items"]] == ["Asyncio in Python"]
+
+    @pytest.mark.asyncio
+    async def test_search_rejects_unknown_mode(self, client):
+        resp = await client.get("/api/videos?search=x&search_mode=regex")
+
+        assert resp.status_code == 400
+
 
 class TestVideoJobs:
     @pytest.mark.asyncio
@@ -361,6 +771,129 @@ class TestDeleteVideo:
         assert res.status_code == 404
 
 
+class TestRelatedVideos:
+    @pytest.mark.asyncio
+    async def test_returns_stored_relations_in_rank_order(self, client, fake_db):
+        source = make_video(keywords=["python"])
+        first = make_video(title="First")
+        second = make_video(title="Second")
+        for video in (source, first, second):
+            fake_db.store[video.id] = video
+        fake_db.relations[source.id] = [second.id, first.id]
+
+        res = await client.get(f"/api/videos/{source.id}/related?limit=1")
+        assert res.status_code == 200
+        assert [v["title"] for v in res.json()] == ["Second"]
+        assert any("JOIN video_relations" in sql for sql in fake_db.executed)
+
+    @pytest.mark.asyncio
+    async def test_other_users_video_is_not_found(self, client, fake_db):
+        video = make_video(user_id=uuid.uuid4())
+        fake_db.store[video.id] = video
+
+        res = await client.get(f"/api/videos/{video.id}/related")
+        assert res.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_rename_tag_refreshes_affected_lists(self, client, fake_db):
+        renamed = make_video(keywords=["ai"])
+        neighbour = make_video(keywords=["machine learning"])
+        unrelated = make_video(keywords=["cooking"])
+        for video in (renamed, neighbour, unrelated):
+            fake_db.store[video.id] = video
+
+        res = await client.post(
+            "/api/tags/rename",
+            json={"from_tag": "ai", "to_tag": "machine learning"},
+        )
+        assert res.status_code == 200
+        assert fake_db.relations[renamed.id] == [neighbour.id]
+        assert fake_db.relations[neighbour.id] == [renamed.id]
+        assert unrelated.id not in fake_db.relations
+
+    @pytest.mark.asyncio
+    async def test_delete_refills_lists_that_included_the_video(self, client, fake_db):
+        kept = make_video(keywords=["python"])
+        deleted = make_video(keywords=["python"])
+        other = make_video(keywords=["python"])
+        for video in (kept, deleted, other):
+            fake_db.store[video.id] = video
+        fake_db.relations[kept.id] = [deleted.id]
+
+        res = await client.delete(f"/api/videos/{deleted.id}")
+        assert res.status_code == 204
+        assert fake_db.relations[kept.id] == [other.id]
+
+
+class TestSemanticSearch:
+    def _store(self, fake_db, title: str, key_knowledge: str):
+        video = make_video(
+            title=title,
+            key_knowledge=key_knowledge,
+            keywords=[],
+            embedding=embed_text(title, key_knowledge),
+        )
+        fake_db.store[video.id] = video
+        return video
+
+    @pytest.mark.asyncio
+    async def test_semantic_related_ignores_tags(self, client, fake_db):
+        source = self._store(fake_db, "Rust ownership", "Borrow checker rules")
+        self._store(fake_db, "Sourdough bread", "Starter and hydration")
+        self._store(fake_db, "The borrow checker", "Ownership and lifetimes")
+
+        res = await client.get(f"/api/videos/{source.id}/related?mode=semantic")
+        assert res.status_code == 200
+        assert res.json()[0]["title"] == "The borrow checker"
+        assert source.id not in {uuid.UUID(v["id"]) for v in res.json()}
+
+    @pytest.mark.asyncio
+    async def test_unknown_related_mode(self, client, fake_db):
+        video = make_video()
+        fake_db.store[video.id] = video
+
+        res = await client.get(f"/api/videos/{video.id}/related?mode=magic")
+        assert res.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_semantic_search_endpoint(self, client, fake_db):
+        self._store(fake_db, "Rust ownership", "Borrow checker rules")
+        self._store(fake_db, "Sourdough bread", "Starter and hydration")
+
+        res = await client.get(
+            "/api/videos/semantic-search", params={"q": "baking sourdough"}
+        )
+        assert res.status_code == 200
+        assert [v["title"] for v in res.json()] == ["Sourdough bread"]
+
+    @pytest.mark.asyncio
+    async def test_index_survives_non_embedding_writes(self, client, fake_db):
+        video = self._store(fake_db, "Sourdough bread", "Starter and hydration")
+        self._store(fake_db, "Rust ownership", "Borrow checker rules")
+        search = {"q": "sourdough starter"}
+
+        def loads() -> int:
+            return sum(
+                sql.startswith("SELECT videos.id, videos.embedding")
+                for sql in fake_db.executed
+            )
+
+        await client.get("/api/videos/semantic-search", params=search)
+        await client.patch(f"/api/videos/{video.id}", json={"is_favourite": True})
+        await client.get("/api/videos/semantic-search", params=search)
+        assert loads() == 1
+
+        await client.delete(f"/api/videos/{video.id}")
+        res = await client.get("/api/videos/semantic-search", params=search)
+        assert loads() == 2
+        assert res.json() == []
+
+    @pytest.mark.asyncio
+    async def test_semantic_search_requires_a_query(self, client):
+        res = await client.get("/api/videos/semantic-search")
+        assert res.status_code == 422
+
+
 # ---------------------------------------------------------------------------
 # GET /api/health
 # ---------------------------------------------------------------------------
@@ -685,18 +1218,66 @@ class TestCollections:
 
 class TestViewTracking:
     @pytest.mark.asyncio
-    async def test_get_video_increments_view_count(self, client, fake_db):
+    async def test_get_video_counts_the_view_without_writing(self, client, fake_db):
         v = make_video()
-        v.view_count = 0
-        v.last_viewed_at = None
         fake_db.store[v.id] = v
 
         await client.get(f"/api/videos/{v.id}")
-        assert v.view_count == 1
+        resp = await client.get(f"/api/videos/{v.id}")
+
+        assert resp.json()["view_count"] == 2
+        assert resp.json()["last_viewed_at"] is not None
+        assert v.view_count == 0
+        assert not any(sql.startswith("UPDATE") for sql in fake_db.executed)
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_buffered_views(self, client, fake_db):
+        from app.routers.videos import view_tracker
+
+        v = make_video()
+        fake_db.store[v.id] = v
+        updated_at = v.updated_at
+        for _ in range(3):
+            await client.get(f"/api/videos/{v.id}")
+
+        with patch("app.services.view_tracker.async_session", lambda: fake_db):
+            assert await view_tracker.flush() == 1
+            assert await view_tracker.flush() == 0
+
+        assert v.view_count == 3
         assert v.last_viewed_at is not None
+        assert v.updated_at == updated_at
+        # A first view moves the video out of "never viewed"
+        assert fake_db.library_versions[TEST_USER_ID] == 1
 
+    @pytest.mark.asyncio
+    async def test_flush_keeps_the_etag_for_recently_viewed_videos(
+        self, client, fake_db
+    ):
+        from app.routers.videos import view_tracker
+
+        v = make_video(view_count=4, last_viewed_at=datetime.now() - timedelta(days=1))
+        fake_db.store[v.id] = v
+        etag = (await client.get("/api/videos")).headers["etag"]
         await client.get(f"/api/videos/{v.id}")
-        assert v.view_count == 2
+
+        with patch("app.services.view_tracker.async_session", lambda: fake_db):
+            assert await view_tracker.flush() == 1
+
+        assert v.view_count == 5
+        assert TEST_USER_ID not in fake_db.library_versions
+        resp = await client.get("/api/videos", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_view_ordered_lists_are_not_cached(self, client, fake_db):
+        v = make_video()
+        fake_db.store[v.id] = v
+
+        for sort_by in ("view_count", "last_viewed_at"):
+            resp = await client.get(f"/api/videos?sort_by={sort_by}")
+            assert resp.status_code == 200
+            assert "etag" not in resp.headers
 
 
 class TestReviewStatusFilter:
@@ -713,6 +1294,109 @@ class TestReviewStatusFilter:
         assert body["items"][0]["title"] == "Never Viewed"
 
 
+class TestTagFilter:
+    @pytest.fixture(autouse=True)
+    def _library(self, fake_db):
+        for title, keywords in (
+            ("Django ORM", ["django", "python"]),
+            ("Go channels", ["go", "concurrency"]),
+            ("Asyncio", ["python", "concurrency"]),
+        ):
+            video = make_video(title=title, keywords=keywords)
+            fake_db.store[video.id] = video
+
+    @staticmethod
+    def _titles(resp) -> list[str]:
+        return sorted(item["title"] for item in resp.json()["items"])
+
+    @pytest.mark.asyncio
+    async def test_any_mode_matches_whole_tags_only(self, client):
+        resp = await client.get("/api/videos?tag=go")
+
+        assert self._titles(resp) == ["Go channels"]
+
+    @pytest.mark.asyncio
+    async def test_any_and_all_modes(self, client):
+        resp = await client.get("/api/videos?tag=go,python")
+        assert self._titles(resp) == ["Asyncio", "Django ORM", "Go channels"]
+
+        resp = await client.get("/api/videos?tag=python,concurrency&tag_mode=all")
+        assert self._titles(resp) == ["Asyncio"]
+
+    @pytest.mark.asyncio
+    async def test_filter_tags_are_canonicalized(self, client, fake_db):
+        alias = TagAlias(user_id=TEST_USER_ID, alias="py", canonical="python")
+        fake_db.alias_store[uuid.uuid4()] = alias
+
+        resp = await client.get("/api/videos?tag= PY ")
+
+        assert self._titles(resp) == ["Asyncio", "Django ORM"]
+
+
+class TestFacets:
+    @pytest.mark.asyncio
+    async def test_counts_cover_the_filtered_set(self, client, fake_db):
+        for category, keywords, favourite in [
+            ("technology", ["python", "ai"], True),
+            ("technology", ["python"], False),
+            ("science", ["python", "physics"], False),
+            ("science", ["cooking"], True),
+        ]:
+            video = make_video(
+                category=category, keywords=keywords, is_favourite=favourite
+            )
+            fake_db.store[video.id] = video
+
+        resp = await client.get(
+            "/api/videos?tag=python&limit=1&facets=category,tag,favourite"
+        )
+
+        assert resp.status_code == 200
+        facets = resp.json()["facets"]
+        # The whole filtered set, not just the page of one
+        assert facets["category"] == [
+            {"value": "technology", "count": 2},
+            {"value": "science", "count": 1},
+        ]
+        assert facets["tag"][0] == {"value": "python", "count": 3}
+        assert {f["value"] for f in facets["tag"]} == {"python", "ai", "physics"}
+        assert facets["favourite"] == [
+            {"value": "false", "count": 2},
+            {"value": "true", "count": 1},
+        ]
+        assert "collection" not in facets
+
+    @pytest.mark.asyncio
+    async def test_collection_facet(self, client, fake_db):
+        inside, outside = make_video(), make_video()
+        fake_db.store[inside.id] = inside
+        fake_db.store[outside.id] = outside
+        collection_id = uuid.uuid4()
+        fake_db.collection_videos[collection_id] = [inside.id]
+
+        resp = await client.get("/api/videos?facets=collection")
+
+        assert resp.json()["facets"] == {
+            "collection": [{"value": str(collection_id), "count": 1}]
+        }
+
+    @pytest.mark.asyncio
+    async def test_one_statement_for_all_facets(self, client, fake_db):
+        fake_db.store[uuid.uuid4()] = make_video()
+
+        await client.get("/api/videos?facets=category,tag,collection,favourite")
+
+        facet_sql = [sql for sql in fake_db.executed if "WITH filtered AS" in sql]
+        assert len(facet_sql) == 1
+        assert "GROUPING SETS" in facet_sql[0]
+
+    @pytest.mark.asyncio
+    async def test_unknown_facet(self, client):
+        resp = await client.get("/api/videos?facets=category,channel")
+
+        assert resp.status_code == 400
+
+
 class TestDashboard:
     @pytest.mark.asyncio
     async def test_get_dashboard_stats(self, client, fake_db):
@@ -731,3 +1415,71 @@ class TestDashboard:
         assert "technology" in body["videos_by_category"]
         assert body["videos_by_category"]["technology"] == 2
         assert len(body["top_tags"]) > 0
+
+    @pytest.mark.asyncio
+    async def test_get_analysis_cache_stats(self, client):
+        resp = await client.get("/api/stats/analysis-cache")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert set(body) == {
+            "memory_hits",
+            "database_hits",
+            "misses",
+            "hit_rate",
+            "memory_entries",
+        }
+
+
+# ---------------------------------------------------------------------------
+# Conditional GET (ETag / If-None-Match)
+# ---------------------------------------------------------------------------
+
+
+class TestConditionalGet:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "/api/videos",
+            "/api/tags",
+            "/api/collections",
+            "/api/categories",
+            "/api/stats/dashboard",
+        ],
+    )
+    async def test_unchanged_library_returns_304(self, client, fake_db, path):
+        vid = make_video()
+        fake_db.store[vid.id] = vid
+        first = await client.get(path)
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert etag.startswith('W/"')
+
+        executed = len(fake_db.executed)
+        resp = await client.get(path, headers={"If-None-Match": etag})
+
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert resp.headers["etag"] == etag
+        # Nothing past the user lookup ran
+        assert len(fake_db.executed) == executed
+
+    @pytest.mark.asyncio
+    async def test_writes_change_the_etag(self, client, fake_db):
+        vid = make_video()
+        fake_db.store[vid.id] = vid
+        etag = (await client.get("/api/videos")).headers["etag"]
+
+        await client.patch(f"/api/videos/{vid.id}", json={"is_favourite": True})
+        resp = await client.get("/api/videos", headers={"If-None-Match": etag})
+
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        assert resp.json()["items"][0]["is_favourite"] is True
+
+    @pytest.mark.asyncio
+    async def test_collection_writes_bump_the_version(self, client, fake_db):
+        await client.post("/api/collections", json={"name": "Reading list"})
+        await client.post("/api/categories", json={"slug": "art", "name": "Art"})
+
+        assert fake_db.library_versions[TEST_USER_ID] == 2
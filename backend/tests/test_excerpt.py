@@ -0,0 +1,21 @@
+"""Tests for list-view excerpts."""
+
+from app.services.excerpt import EXCERPT_MAX_CHARS, make_excerpt
+
+
+def test_strips_markdown_and_collapses_whitespace():
+    text = "### Overview\n\n- **Bold** point with `code`\n- A [link](http://x.y)\n"
+
+    assert make_excerpt(text) == "Overview Bold point with code A link"
+
+
+def test_long_text_is_cut_at_a_word_boundary():
+    excerpt = make_excerpt("word " * 200)
+
+    assert len(excerpt) <= EXCERPT_MAX_CHARS
+    assert excerpt.endswith("word…")
+
+
+def test_falls_back_to_later_sources():
+    assert make_excerpt(None, "", "- Key point") == "Key point"
+    assert make_excerpt(None, "  ") is None
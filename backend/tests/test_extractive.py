@@ -0,0 +1,84 @@
+"""Tests for the local extractive summarizer and TF-IDF keywords."""
+
+import numpy as np
+import pytest
+
+from app.services.extractive import (
+    ExtractiveSummarizerService,
+    build_local_preview,
+    extract_keywords,
+    split_sentences,
+    summarize,
+    textrank_scores,
+)
+
+TRANSCRIPT = (
+    "Python asyncio lets you write concurrent code with async and await. "
+    "The event loop schedules coroutines and runs them cooperatively. "
+    "My cat likes to sleep on the keyboard all afternoon. "
+    "When a coroutine awaits network IO, the event loop switches to another coroutine. "
+    "Blocking calls stall the event loop, so run CPU work in a thread pool. "
+    "Asyncio tasks wrap coroutines so the event loop can run them concurrently."
+)
+
+
+def test_split_sentences_uses_punctuation():
+    sentences = split_sentences("First one here. Second one here! Third?")
+    assert sentences == ["First one here.", "Second one here!", "Third?"]
+
+
+def test_split_sentences_windows_unpunctuated_captions():
+    text = " ".join(f"word{i}" for i in range(100))
+    sentences = split_sentences(text)
+    assert len(sentences) == 4
+    assert sentences[0].split()[0] == "word0"
+
+
+def test_extract_keywords_prefers_topical_terms():
+    keywords = extract_keywords(TRANSCRIPT, max_keywords=5)
+    assert 0 < len(keywords) <= 5
+    assert any("event loop" in kw or "coroutine" in kw for kw in keywords)
+    assert "the" not in keywords
+
+
+def test_summarize_keeps_original_order_and_drops_off_topic():
+    summary = summarize(TRANSCRIPT, max_sentences=3)
+    assert len(summary) == 3
+    positions = [TRANSCRIPT.index(sentence) for sentence in summary]
+    assert positions == sorted(positions)
+    assert not any("cat" in sentence for sentence in summary)
+
+
+def test_build_local_preview_formats_markdown_bullets():
+    preview = build_local_preview(TRANSCRIPT, max_sentences=2)
+    lines = preview.key_knowledge.splitlines()
+    assert len(lines) == 2
+    assert all(line.startswith("- ") for line in lines)
+    assert preview.keywords
+
+
+def test_empty_transcript_yields_empty_preview():
+    preview = build_local_preview("")
+    assert preview.key_knowledge == ""
+    assert preview.keywords == []
+
+
+def test_textrank_scores_favor_central_sentences():
+    vectors = np.array(
+        [[1.0, 0.0, 0.0], [0.8, 0.6, 0.0], [0.6, 0.8, 0.0], [0.0, 0.0, 1.0]]
+    )
+    scores = textrank_scores(vectors)
+    assert scores.sum() == pytest.approx(1.0)
+    assert scores[1] > scores[3]
+
+
+@pytest.mark.asyncio
+async def test_extractive_service_fills_key_knowledge_and_keywords():
+    service = ExtractiveSummarizerService(max_sentences=2)
+    result = await service.analyze(
+        TRANSCRIPT, "Asyncio", [{"slug": "other", "name": "Other"}]
+    )
+    assert result.key_knowledge.count("- ") == 2
+    assert result.keywords
+    assert result.explanation == ""
+    assert result.category == "other"
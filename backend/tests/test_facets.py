@@ -0,0 +1,46 @@
+"""Tests for the facet count query."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models import Video
+from app.services.facets import TAG_FACET_LIMIT, facet_query, parse_facets
+
+
+def _sql(facets: list[str]) -> str:
+    query = select(Video).where(Video.category == "science")
+    stmt = facet_query(query, facets)
+    return str(
+        stmt.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_parse_facets_keeps_a_canonical_order():
+    assert parse_facets(" tag,category ,tag") == ["category", "tag"]
+    assert parse_facets(None) == []
+    with pytest.raises(ValueError):
+        parse_facets("category,channel")
+
+
+def test_filtered_set_is_one_cte_shared_by_every_facet():
+    sql = _sql(["category", "tag", "collection", "favourite"])
+
+    assert sql.count("WITH filtered AS") == 1
+    assert sql.count("FROM videos") == 1
+    assert "videos.category = 'science'" in sql
+    assert sql.count("UNION ALL") == 2
+    assert (
+        "GROUP BY GROUPING SETS(filtered.category, "
+        "CAST(filtered.is_favourite AS VARCHAR))"
+    ) in sql
+    assert f"LIMIT {TAG_FACET_LIMIT}" in sql
+
+
+def test_single_grouped_facet_needs_no_case():
+    sql = _sql(["favourite"])
+
+    assert "CASE" not in sql
+    assert "UNION ALL" not in sql
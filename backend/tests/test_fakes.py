@@ -0,0 +1,91 @@
+"""Tests for the offline stand-in providers."""
+
+import uuid
+from datetime import UTC, datetime
+from unittest.mock import patch
+
+import pytest
+
+from app.config import settings
+from app.models import VideoJob
+from app.services.analysis_cache import AnalysisCache
+from app.services.fakes import (
+    FakeSummarizerService,
+    FakeTranscriptionService,
+    FakeYouTubeService,
+    fake_segments,
+)
+from app.services.video_jobs import JOB_STEPS, run_video_job
+from app.services.youtube import TranscriptNotAvailableError
+from tests.conftest import TEST_USER_ID
+
+
+@pytest.fixture(autouse=True)
+def _instant(monkeypatch):
+    for name in (
+        "fake_metadata_latency_seconds",
+        "fake_transcript_latency_seconds",
+        "fake_whisper_latency_seconds",
+        "fake_analysis_latency_seconds",
+    ):
+        monkeypatch.setattr(settings, name, 0.0)
+    monkeypatch.setattr(settings, "fake_transcript_chars", 2_000)
+
+
+def test_segments_are_deterministic_and_sized():
+    segments = fake_segments("abc", 2_000)
+    assert segments == fake_segments("abc", 2_000)
+    assert segments != fake_segments("xyz", 2_000)
+    assert 2_000 <= sum(len(s.text) + 1 for s in segments) < 2_200
+    assert segments[1].start == segments[0].start + segments[0].duration
+
+
+@pytest.mark.asyncio
+async def test_caption_rate_controls_whisper_fallback(monkeypatch):
+    monkeypatch.setattr(settings, "fake_caption_rate", 0.0)
+    with pytest.raises(TranscriptNotAvailableError):
+        await FakeYouTubeService().fetch_transcript("abc")
+
+    text, source = await FakeTranscriptionService().transcribe_with_whisper("abc")
+    assert source == "whisper"
+    assert len(text) >= 2_000
+
+
+@pytest.mark.asyncio
+async def test_error_rate_makes_analysis_fail(monkeypatch):
+    monkeypatch.setattr(settings, "fake_error_rate", 1.0)
+    with pytest.raises(RuntimeError):
+        await FakeSummarizerService().analyze("text", "title", [])
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_end_to_end_on_fakes(fake_db):
+    job = VideoJob(
+        id=uuid.uuid4(),
+        user_id=TEST_USER_ID,
+        youtube_url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        youtube_id="dQw4w9WgXcQ",
+        status="queued",
+        current_step=0,
+        total_steps=len(JOB_STEPS),
+        step_label=JOB_STEPS[0],
+        created_at=datetime(2026, 1, 15, tzinfo=UTC),
+    )
+    fake_db.job_store[job.id] = job
+
+    with (
+        patch("app.services.video_jobs.async_session", lambda: fake_db),
+        patch("app.services.video_jobs.youtube_service", FakeYouTubeService()),
+        patch("app.services.video_jobs.summarizer_service", FakeSummarizerService()),
+        patch(
+            "app.services.video_jobs.transcription_service",
+            FakeTranscriptionService(),
+        ),
+        patch("app.services.video_jobs.analysis_cache", AnalysisCache()),
+    ):
+        await run_video_job(job.id, TEST_USER_ID)
+
+    assert job.status == "completed"
+    video = fake_db.store[job.video_id]
+    assert video.analysis_status == "complete"
+    assert video.explanation
@@ -0,0 +1,32 @@
+"""Tests for library ETags."""
+
+import uuid
+
+from app.models import User
+from app.services.library import etag_matches, library_etag
+
+
+def _user(version: int) -> User:
+    return User(
+        id=uuid.UUID("00000000-0000-0000-0000-000000000001"),
+        username="test-user",
+        password_hash="hashed",
+        library_version=version,
+    )
+
+
+def test_etag_changes_with_the_version():
+    assert library_etag(_user(1)) != library_etag(_user(2))
+    assert library_etag(_user(1)) == library_etag(_user(1))
+
+
+def test_etag_matches_uses_weak_comparison():
+    etag = library_etag(_user(3))
+    strong = etag.removeprefix("W/")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(strong, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches(library_etag(_user(4)), etag)
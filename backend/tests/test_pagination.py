@@ -0,0 +1,92 @@
+"""Tests for keyset cursor encoding and conditions."""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models import Video
+from app.services.pagination import (
+    InvalidCursorError,
+    SortKey,
+    after_cursor,
+    cursor_segments,
+    decode_cursor,
+    encode_cursor,
+)
+
+DURATION_DESC = [
+    SortKey("duration", Video.duration, descending=True, nullable=True),
+    SortKey("id", Video.id, descending=True),
+]
+
+
+def _sql(condition) -> str:
+    return str(condition.compile(dialect=postgresql.dialect()))
+
+
+def test_cursor_round_trips_typed_values():
+    values = [datetime(2026, 1, 2, 3, 4, 5), uuid.uuid4(), 0.25, "title", None]
+
+    token = encode_cursor("created_at:desc", values, 40)
+
+    assert "=" not in token
+    assert decode_cursor(token, "created_at:desc", len(values)) == (values, 40)
+
+
+@pytest.mark.parametrize(
+    ("token", "scope", "size"),
+    [
+        ("not base64 at all!", "created_at:desc", 2),
+        (encode_cursor("created_at:desc", [1, 2], 2), "title:asc", 2),
+        (encode_cursor("created_at:desc", [1, 2], 2), "created_at:desc", 3),
+    ],
+)
+def test_invalid_cursors_are_rejected(token, scope, size):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, scope, size)
+
+
+def test_same_direction_keys_compare_as_a_row():
+    sql = _sql(after_cursor(DURATION_DESC, [300, uuid.uuid4()]))
+
+    assert sql == (
+        "(videos.duration, videos.id) < (%(cursor_0)s::INTEGER, %(cursor_1)s::UUID)"
+    )
+
+
+def test_mixed_directions_keep_a_leading_bound():
+    keys = [
+        SortKey("title", Video.title, descending=False),
+        SortKey("id", Video.id, descending=True),
+    ]
+
+    sql = _sql(after_cursor(keys, ["b", uuid.uuid4()]))
+
+    assert sql.startswith("videos.title >= %(cursor_0)s::VARCHAR AND (")
+    assert "videos.title > %(cursor_0)s::VARCHAR OR " in sql
+    assert "videos.title = %(cursor_0)s::VARCHAR AND videos.id < %(cursor_1)s" in sql
+
+
+def test_nullable_key_reads_null_rows_as_a_last_segment():
+    segments = [_sql(s) for s in cursor_segments(DURATION_DESC, [300, uuid.uuid4()])]
+
+    assert segments == [
+        "videos.duration IS NOT NULL AND (videos.duration, videos.id) "
+        "< (%(cursor_0)s::INTEGER, %(cursor_1)s::UUID)",
+        "videos.duration IS NULL",
+    ]
+
+
+def test_null_cursor_value_only_pages_within_nulls():
+    segments = [_sql(s) for s in cursor_segments(DURATION_DESC, [None, uuid.uuid4()])]
+
+    assert segments == ["videos.duration IS NULL AND videos.id < %(cursor_0)s::UUID"]
+
+
+def test_only_the_leading_key_may_be_nullable():
+    keys = [DURATION_DESC[1], DURATION_DESC[0]]
+
+    with pytest.raises(ValueError):
+        cursor_segments(keys, [uuid.uuid4(), 300])
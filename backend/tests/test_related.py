@@ -0,0 +1,163 @@
+"""Tests for the precomputed related-video query."""
+
+import random
+import uuid
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.models import VideoRelation
+from app.services import related
+from app.services.related import _ranked_relations, update_relations
+from tests.conftest import TEST_USER_ID, make_video
+
+
+def _compiled(video_ids: list[uuid.UUID]) -> str:
+    stmt = insert(VideoRelation).from_select(
+        ["video_id", "rank", "related_video_id", "score"],
+        _ranked_relations(video_ids),
+    )
+    return str(
+        stmt.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def test_neighbours_are_a_correlated_top_k_lateral():
+    sql = _compiled([uuid.uuid4()])
+
+    assert "JOIN LATERAL" in sql
+    assert f"LIMIT {settings.related_videos_top_k}" in sql
+    # Served by the GIN index on keywords, restricted to the owner's videos
+    assert "other.keywords && source.keywords" in sql
+    assert "other.user_id = source.user_id" in sql
+    # The score subquery must correlate, not cross join another videos scan
+    assert sql.count("FROM videos AS source") == 1
+
+
+def test_ranks_follow_the_neighbour_order():
+    sql = _compiled([uuid.uuid4()])
+
+    assert (
+        "row_number() OVER (PARTITION BY source.id ORDER BY neighbours.score DESC, "
+        "neighbours.created_at DESC, neighbours.id)"
+    ) in sql
+    assert "ORDER BY score DESC, other.created_at DESC, other.id" in sql
+
+
+def _rebuilt(fake_db) -> dict[uuid.UUID, list[uuid.UUID]]:
+    """Every stored list as a full rebuild would compute it."""
+    rebuilt = {}
+    for video_id in fake_db.store:
+        ranked = fake_db._rank_related(video_id)
+        if ranked:
+            rebuilt[video_id] = ranked
+    return rebuilt
+
+
+def _stored(fake_db) -> dict[uuid.UUID, list[uuid.UUID]]:
+    return {
+        video_id: ranked for video_id, ranked in fake_db.relations.items() if ranked
+    }
+
+
+def _refreshed(spy) -> list[uuid.UUID]:
+    return [video_id for call in spy.await_args_list for video_id in call.args[1]]
+
+
+def _seed(fake_db, keyword_sets: list[list[str]]) -> list:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    videos = [
+        make_video(keywords=keywords, created_at=start + timedelta(hours=i))
+        for i, keywords in enumerate(keyword_sets)
+    ]
+    for video in videos:
+        fake_db.store[video.id] = video
+    fake_db.relations = _rebuilt(fake_db)
+    for video_id, ranked in fake_db.relations.items():
+        for related_id in ranked:
+            fake_db.relation_scores[video_id, related_id] = fake_db._overlap(
+                fake_db.store[video_id], fake_db.store[related_id]
+            )
+    return videos
+
+
+@pytest.fixture
+def top_k(monkeypatch):
+    monkeypatch.setattr(settings, "related_videos_top_k", 2)
+    return 2
+
+
+@pytest.mark.asyncio
+async def test_new_video_is_merged_into_neighbour_lists(fake_db, top_k):
+    videos = _seed(fake_db, [["python"], ["python", "django"], ["rust"]])
+    new = make_video(keywords=["python", "django"], created_at=datetime.now(UTC))
+    fake_db.store[new.id] = new
+
+    with patch.object(
+        related, "refresh_relations", wraps=related.refresh_relations
+    ) as spy:
+        await update_relations(fake_db, TEST_USER_ID, [new.id])
+
+    assert _refreshed(spy) == [new.id]
+    assert _stored(fake_db) == _rebuilt(fake_db)
+    assert fake_db.relations[videos[1].id][0] == new.id
+
+
+@pytest.mark.asyncio
+async def test_weak_match_leaves_full_lists_alone(fake_db, top_k):
+    _seed(fake_db, [["a", "b"], ["a", "b"], ["a", "b"]])
+    before = dict(fake_db.relations)
+    new = make_video(keywords=["a"], created_at=datetime(2023, 1, 1, tzinfo=UTC))
+    fake_db.store[new.id] = new
+
+    await update_relations(fake_db, TEST_USER_ID, [new.id])
+
+    assert {k: v for k, v in fake_db.relations.items() if k != new.id} == before
+    assert not any(
+        sql.startswith("SELECT video_relations.video_id, video_relations.related")
+        for sql in fake_db.executed
+    )
+
+
+@pytest.mark.asyncio
+async def test_full_list_losing_a_video_is_refilled(fake_db, top_k):
+    kept, *_, dropped = _seed(fake_db, [["a"], ["a"], ["a"], ["a"]])
+    assert dropped.id in fake_db.relations[kept.id]
+    dropped.keywords = ["cooking"]
+
+    await update_relations(fake_db, TEST_USER_ID, [dropped.id])
+
+    assert _stored(fake_db) == _rebuilt(fake_db)
+
+
+@pytest.mark.asyncio
+async def test_refills_beyond_the_limit_wait_for_a_rebuild(fake_db, top_k, monkeypatch):
+    monkeypatch.setattr(related, "REFILL_LIMIT", 0)
+    kept, *_, dropped = _seed(fake_db, [["a"], ["a"], ["a"], ["a"]])
+    dropped.keywords = ["cooking"]
+
+    await update_relations(fake_db, TEST_USER_ID, [dropped.id])
+
+    assert dropped.id not in fake_db.relations[kept.id]
+    assert len(fake_db.relations[kept.id]) == top_k - 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_updates_match_a_rebuild(fake_db, top_k):
+    rng = random.Random(7)
+    pool = ["a", "b", "c", "d", "e", "f"]
+    videos = _seed(fake_db, [rng.sample(pool, rng.randint(0, 3)) for _ in range(25)])
+
+    for _ in range(40):
+        changed = rng.sample(videos, rng.randint(1, 3))
+        for video in changed:
+            video.keywords = rng.sample(pool, rng.randint(0, 3))
+        await update_relations(fake_db, TEST_USER_ID, [v.id for v in changed])
+
+        assert _stored(fake_db) == _rebuilt(fake_db)
@@ -0,0 +1,81 @@
+"""Tests for search query construction."""
+
+import uuid
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.search import (
+    build_tsquery,
+    fuzzy_filter,
+    fuzzy_query,
+    fuzzy_rank,
+    hybrid_filter,
+    hybrid_rank,
+    reciprocal_rank_fusion,
+)
+
+
+def _sql(search: str) -> tuple[str, dict]:
+    compiled = build_tsquery(search).compile(dialect=postgresql.dialect())
+    return str(compiled), compiled.params
+
+
+def test_plain_words_become_prefix_and_query():
+    sql, params = _sql("  machine   learn ")
+    assert sql.startswith("to_tsquery('simple'::regconfig, immutable_unaccent(")
+    assert params == {"immutable_unaccent_1": "machine:* & learn:*"}
+
+
+def test_operators_in_words_are_dropped():
+    _, params = _sql("c++ & (rust)")
+    assert params == {"immutable_unaccent_1": "c:* & rust:*"}
+
+
+def test_websearch_syntax_is_passed_through():
+    for search in ['"event loop"', "python OR rust", "loop -asyncio"]:
+        sql, params = _sql(search)
+        assert sql.startswith("websearch_to_tsquery(")
+        assert params == {"immutable_unaccent_1": search}
+
+
+def test_query_without_words_is_ignored():
+    assert build_tsquery(" ?! ") is None
+
+
+def test_fuzzy_filter_uses_indexable_operators_on_both_columns():
+    query = fuzzy_query("  Học máy ")
+    compiled = fuzzy_filter(query).compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+
+    assert sql.count("<%") == 2
+    assert sql.count("LIKE") == 2
+    assert "immutable_unaccent(lower(videos.title))" in sql
+    assert "immutable_unaccent(lower(videos.channel_name))" in sql
+    assert compiled.params == {"fuzzy_query": "Học máy"}
+
+
+def test_fuzzy_rank_takes_the_best_column():
+    sql = str(fuzzy_rank(fuzzy_query("x")).compile(dialect=postgresql.dialect()))
+    assert sql.startswith("greatest(word_similarity(")
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    a, b, c, d = (uuid.uuid4() for _ in range(4))
+
+    fused = reciprocal_rank_fusion([a, b, c], [c, d, a])
+
+    # a and c appear in both lists; a ranks higher on average
+    assert fused[:2] == [a, c]
+    assert set(fused) == {a, b, c, d}
+    # Equal scores keep the earlier ranking's order
+    assert fused[2:] == [b, d]
+
+
+def test_hybrid_rank_follows_the_fused_order():
+    ids = [uuid.uuid4(), uuid.uuid4()]
+    rank = hybrid_rank(ids).compile(dialect=postgresql.dialect())
+    condition = hybrid_filter(ids).compile(dialect=postgresql.dialect())
+
+    assert str(rank) == "-array_position(%(hybrid_ids)s::UUID[], videos.id)"
+    assert str(condition) == "videos.id = ANY (%(hybrid_ids)s::UUID[])"
+    assert rank.params == {"hybrid_ids": ids}
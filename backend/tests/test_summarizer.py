@@ -3,7 +3,15 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from app.services.summarizer import SummarizerService
+from app.config import settings
+from app.services.summarizer import (
+    _TIERS,
+    PROMPT_VERSION,
+    SummarizerService,
+    _generated_tokens,
+    build_analysis_prompt,
+    route_for_transcript,
+)
 
 
 @pytest.mark.asyncio
@@ -41,7 +49,7 @@ async def test_analyze_accepts_categories_and_returns_category_slug():
     assert result.category == "technology"
 
     call_kwargs = parse_mock.await_args.kwargs
-    assert "technology" in call_kwargs["messages"][0]["content"]
+    assert "technology" in call_kwargs["messages"][1]["content"]
 
 
 @pytest.mark.asyncio
@@ -81,3 +89,153 @@ async def test_analyze_requests_up_to_five_keywords_without_forcing_five():
         "Generate 1-5 lowercase tags relevant to the video's content." in system_prompt
     )
     assert "Do not force exactly 5 tags" in system_prompt
+
+
+@pytest.mark.asyncio
+async def test_analyze_uses_route_model_and_limits():
+    service = object.__new__(SummarizerService)
+    service.logger = MagicMock()
+
+    parsed = SimpleNamespace(
+        explanation="exp",
+        key_knowledge="key",
+        critical_analysis="crit",
+        real_world_applications="apps",
+        keywords=["python"],
+        category="technology",
+    )
+    parse_mock = AsyncMock(
+        return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))]
+        )
+    )
+    service.client = SimpleNamespace(
+        beta=SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(parse=parse_mock))
+        )
+    )
+    route = route_for_transcript(500_000)
+
+    await SummarizerService.analyze(
+        service,
+        transcript="sample transcript",
+        title="sample title",
+        categories=[{"slug": "technology", "name": "Technology"}],
+        route=route,
+    )
+
+    call_kwargs = parse_mock.await_args.kwargs
+    assert call_kwargs["model"] == route.model
+    assert call_kwargs["reasoning_effort"] == route.reasoning_effort
+    assert call_kwargs["max_completion_tokens"] == route.max_output_tokens
+
+
+class TestRouteForTranscript:
+    def test_short_transcript_uses_main_model_without_reasoning(self):
+        route = route_for_transcript(2_000)
+        assert route.tier == "short"
+        assert route.model == "gpt-5.2"
+        assert route.reasoning_effort == "none"
+        assert not route.downgraded
+
+    def test_output_cap_leaves_headroom_over_expected_generation(self):
+        for chars in (2_000, 50_000, 200_000):
+            route = route_for_transcript(chars)
+            _, output_tokens = _TIERS[route.tier]
+            expected = _generated_tokens(route.reasoning_effort, output_tokens)
+            assert route.max_output_tokens >= 1.5 * expected
+
+    def test_long_transcript_gets_larger_output_budget(self):
+        short = route_for_transcript(2_000)
+        long = route_for_transcript(200_000)
+        assert long.tier == "long"
+        assert long.max_output_tokens > short.max_output_tokens
+
+    def test_tight_latency_budget_downgrades_route(self, monkeypatch):
+        monkeypatch.setattr(settings, "summarizer_latency_budget_seconds", 30.0)
+        route = route_for_transcript(200_000)
+        assert route.downgraded
+        assert route.model == "gpt-5-mini"
+
+    def test_route_is_serializable_for_job_details(self):
+        data = route_for_transcript(50_000).as_dict()
+        assert data["tier"] == "medium"
+        assert data["transcript_chars"] == 50_000
+
+
+class TestBuildAnalysisPrompt:
+    def test_static_prefix_is_byte_stable_across_users_and_videos(self):
+        first = build_analysis_prompt(
+            "transcript one", "Title A", [{"slug": "technology", "name": "Tech"}]
+        )
+        second = build_analysis_prompt(
+            "transcript two", "Title B", [{"slug": "cooking", "name": "Cooking"}]
+        )
+        assert first.messages[0] == second.messages[0]
+        assert "Tech" not in first.messages[0]["content"]
+        assert "Title A" not in first.messages[0]["content"]
+
+    def test_variable_parts_follow_the_prefix(self):
+        prompt = build_analysis_prompt(
+            "the transcript", "The Title", [{"slug": "technology", "name": "Tech"}]
+        )
+        assert [m["role"] for m in prompt.messages] == ["system", "system", "user"]
+        assert "technology" in prompt.messages[1]["content"]
+        assert "The Title" in prompt.messages[2]["content"]
+        assert prompt.messages[2]["content"].endswith("the transcript")
+        assert prompt.version == PROMPT_VERSION
+
+    def test_category_order_does_not_change_bytes(self):
+        categories = [
+            {"slug": "other", "name": "Other"},
+            {"slug": "technology", "name": "Tech"},
+        ]
+        forward = build_analysis_prompt("t", "x", categories)
+        backward = build_analysis_prompt("t", "x", list(reversed(categories)))
+        assert forward.messages[1] == backward.messages[1]
+
+
+@pytest.mark.asyncio
+async def test_analyze_records_cached_token_usage():
+    service = object.__new__(SummarizerService)
+    service.logger = MagicMock()
+
+    parsed = SimpleNamespace(
+        explanation="exp",
+        key_knowledge="key",
+        critical_analysis="crit",
+        real_world_applications="apps",
+        keywords=["python"],
+        category="technology",
+    )
+    usage = SimpleNamespace(
+        prompt_tokens=4000,
+        completion_tokens=900,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=1280),
+        completion_tokens_details=SimpleNamespace(reasoning_tokens=300),
+    )
+    parse_mock = AsyncMock(
+        return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(parsed=parsed))],
+            usage=usage,
+        )
+    )
+    service.client = SimpleNamespace(
+        beta=SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(parse=parse_mock))
+        )
+    )
+
+    result = await SummarizerService.analyze(
+        service,
+        transcript="sample transcript",
+        title="sample title",
+        categories=[{"slug": "technology", "name": "Technology"}],
+    )
+
+    assert result.usage is not None
+    assert result.usage.cached_tokens == 1280
+    assert result.usage.reasoning_tokens == 300
+    assert result.usage.prompt_version == PROMPT_VERSION
+    extra_body = parse_mock.await_args.kwargs["extra_body"]
+    assert extra_body["prompt_cache_key"] == PROMPT_VERSION
@@ -0,0 +1,312 @@
+"""Tests for the background ingest pipeline in run_video_job."""
+
+import uuid
+from dataclasses import replace
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.config import settings
+from app.models import Category, VideoJob
+from app.services.analysis_cache import AnalysisCache
+from app.services.embeddings import embed_text
+from app.services.summarizer import (
+    PROMPT_VERSION,
+    AnalysisUsage,
+    KnowledgeResult,
+    SummarizerBackend,
+)
+from app.services.video_jobs import (
+    JOB_STEPS,
+    requeue_degraded_analyses,
+    run_video_job,
+)
+from app.services.youtube import Chapter, TranscriptSegment, VideoMetadata
+from tests.conftest import TEST_USER_ID
+
+TRANSCRIPT = (
+    "Python asyncio lets you write concurrent code with async and await. "
+    "The event loop schedules coroutines and runs them cooperatively. "
+    "When a coroutine awaits network IO, the event loop switches to another one. "
+    "Blocking calls stall the event loop, so run CPU work in a thread pool."
+)
+
+SEGMENTS = [
+    TranscriptSegment(start=float(i * 10), duration=10.0, text=sentence + ".")
+    for i, sentence in enumerate(TRANSCRIPT.rstrip(".").split(". "))
+]
+
+METADATA = VideoMetadata(
+    title="Asyncio in depth",
+    thumbnail_url=None,
+    channel_name="TestChannel",
+    duration=600,
+)
+
+ANALYSIS = KnowledgeResult(
+    explanation="exp",
+    key_knowledge="- key",
+    critical_analysis="crit",
+    real_world_applications="apps",
+    keywords=["python", "asyncio"],
+    category="technology",
+)
+
+
+def _queue_job(fake_db, seed_categories: bool = True) -> VideoJob:
+    job = VideoJob(
+        id=uuid.uuid4(),
+        user_id=TEST_USER_ID,
+        youtube_url="https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+        youtube_id="dQw4w9WgXcQ",
+        status="queued",
+        current_step=0,
+        total_steps=len(JOB_STEPS),
+        step_label=JOB_STEPS[0],
+        created_at=datetime(2026, 1, 15, tzinfo=UTC),
+    )
+    fake_db.job_store[job.id] = job
+    if not seed_categories:
+        return job
+    for slug in ("technology", "other"):
+        category = Category(id=uuid.uuid4(), slug=slug, name=slug.title())
+        fake_db.category_store[category.id] = category
+    return job
+
+
+@pytest.fixture
+def pipeline(fake_db):
+    youtube = AsyncMock()
+    youtube.fetch_metadata.return_value = METADATA
+    youtube.fetch_transcript_segments.return_value = (SEGMENTS, "captions")
+    # Only the SummarizerBackend interface is available to the pipeline
+    summarizer = AsyncMock(spec=SummarizerBackend)
+    with (
+        patch("app.services.video_jobs.async_session", lambda: fake_db),
+        patch("app.services.video_jobs.youtube_service", youtube),
+        patch("app.services.video_jobs.summarizer_service", summarizer),
+        patch("app.services.video_jobs.analysis_cache", AnalysisCache()),
+    ):
+        summarizer.youtube = youtube
+        yield summarizer
+
+
+@pytest.mark.asyncio
+async def test_job_saves_preview_then_full_analysis(pipeline, fake_db):
+    job = _queue_job(fake_db)
+    previews: list[tuple[str, str | None, str | None]] = []
+
+    async def analyze(transcript, title, categories, route=None):
+        video = next(iter(fake_db.store.values()))
+        previews.append((video.analysis_status, video.key_knowledge, video.excerpt))
+        return ANALYSIS
+
+    pipeline.analyze.side_effect = analyze
+
+    await run_video_job(job.id, TEST_USER_ID)
+
+    assert job.status == "completed"
+    status, preview_text, preview_excerpt = previews[0]
+    assert status == "preview"
+    assert preview_text and preview_text.startswith("- ")
+    assert preview_excerpt and not preview_excerpt.startswith("- ")
+
+    video = fake_db.store[job.video_id]
+    assert video.analysis_status == "complete"
+    assert video.explanation == "exp"
+    assert video.excerpt == "exp"
+    assert video.category == "technology"
+    assert video.embedding == embed_text(video.title, video.key_knowledge)
+    assert job.details["route"]["tier"] == "short"
+    assert "analysis_seconds" in job.details
+    assert job.details["compaction"]["compression_ratio"] <= 1.0
+
+
+@pytest.mark.asyncio
+async def test_job_falls_back_to_extractive_when_llm_fails(pipeline, fake_db):
+    job = _queue_job(fake_db)
+    pipeline.analyze.side_effect = RuntimeError("Analysis failed: rate limited")
+
+    await run_video_job(job.id, TEST_USER_ID)
+
+    assert job.status == "completed"
+    video = fake_db.store[job.video_id]
+    assert video.analysis_status == "degraded"
+    assert video.key_knowledge
+    assert video.keywords
+    assert video.explanation is None
+    assert video.category == "other"
+
+
+@pytest.mark.asyncio
+async def test_upgrade_retries_only_the_analysis_stage(pipeline, fake_db):
+    job = _queue_job(fake_db)
+    pipeline.analyze.side_effect = RuntimeError("Analysis failed: rate limited")
+    await run_video_job(job.id, TEST_USER_ID)
+    video = fake_db.store[job.video_id]
+    assert video.analysis_input == {"transcript": TRANSCRIPT}
+
+    pipeline.analyze.side_effect = None
+    pipeline.analyze.return_value = ANALYSIS
+    assert await requeue_degraded_analyses(5) == 1
+
+    assert pipeline.youtube.fetch_metadata.await_count == 1
+    assert pipeline.youtube.fetch_transcript_segments.await_count == 1
+    assert pipeline.analyze.await_args.args[0] == TRANSCRIPT
+    assert video.analysis_status == "complete"
+    assert video.explanation == "exp"
+    assert video.analysis_input is None
+    assert video.analysis_attempts == 1
+    retry = next(j for j in fake_db.job_store.values() if j.id != job.id)
+    assert retry.status == "completed"
+    assert retry.video_id == video.id
+
+
+@pytest.mark.asyncio
+async def test_upgrade_gives_up_after_max_attempts(pipeline, fake_db, monkeypatch):
+    monkeypatch.setattr(settings, "analysis_upgrade_max_attempts", 2)
+    job = _queue_job(fake_db)
+    pipeline.analyze.side_effect = RuntimeError("Analysis failed: rate limited")
+    await run_video_job(job.id, TEST_USER_ID)
+
+    retried = [await requeue_degraded_analyses(5) for _ in range(3)]
+
+    assert retried == [1, 1, 0]
+    assert pipeline.analyze.await_count == 3
+    video = fake_db.store[job.video_id]
+    assert video.analysis_status == "degraded"
+    assert video.analysis_attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_job_reuses_cached_analysis_for_identical_transcript(pipeline, fake_db):
+    pipeline.analyze.return_value = ANALYSIS
+    first = _queue_job(fake_db)
+    await run_video_job(first.id, TEST_USER_ID)
+    assert first.details["analysis_cache"] == {"hit": False, "source": None}
+    assert len(fake_db.analysis_cache_store) == 1
+
+    second = _queue_job(fake_db, seed_categories=False)
+    await run_video_job(second.id, TEST_USER_ID)
+
+    assert second.status == "completed"
+    assert pipeline.analyze.await_count == 1
+    assert second.details["analysis_cache"] == {"hit": True, "source": "memory"}
+    assert fake_db.store[second.video_id].explanation == "exp"
+
+
+@pytest.mark.asyncio
+async def test_job_does_not_cache_degraded_analysis(pipeline, fake_db):
+    job = _queue_job(fake_db)
+    pipeline.analyze.side_effect = RuntimeError("Analysis failed: rate limited")
+
+    await run_video_job(job.id, TEST_USER_ID)
+
+    assert fake_db.analysis_cache_store == {}
+
+
+@pytest.mark.asyncio
+async def test_long_video_is_analysed_per_chapter(pipeline, fake_db, monkeypatch):
+    monkeypatch.setattr(settings, "chapter_analysis_min_chars", 0)
+    chapters = (
+        Chapter(title="Event loop", start_time=0.0, end_time=20.0),
+        Chapter(title="Blocking", start_time=20.0, end_time=40.0),
+    )
+    youtube = pipeline.youtube
+    youtube.fetch_metadata.return_value = VideoMetadata(
+        title=METADATA.title,
+        thumbnail_url=None,
+        channel_name="TestChannel",
+        duration=40,
+        chapters=chapters,
+    )
+    titles: list[str] = []
+
+    async def analyze(transcript, title, categories, route=None):
+        titles.append(title)
+        return ANALYSIS
+
+    pipeline.analyze.side_effect = analyze
+    job = _queue_job(fake_db)
+
+    await run_video_job(job.id, TEST_USER_ID)
+
+    assert sorted(titles) == [
+        "Asyncio in depth — Blocking",
+        "Asyncio in depth — Event loop",
+    ]
+    video = fake_db.store[job.video_id]
+    assert video.analysis_status == "complete"
+    assert video.explanation.startswith("### Event loop (0:00)")
+    assert "### Blocking (0:20)" in video.explanation
+    assert video.chapters[1] == {
+        "title": "Blocking",
+        "start_time": 20.0,
+        "end_time": 40.0,
+    }
+    assert [c["title"] for c in job.details["chapters"]] == ["Event loop", "Blocking"]
+
+
+@pytest.mark.asyncio
+async def test_chapter_usage_is_summed(pipeline, fake_db, monkeypatch):
+    monkeypatch.setattr(settings, "chapter_analysis_min_chars", 0)
+    pipeline.youtube.fetch_metadata.return_value = VideoMetadata(
+        title=METADATA.title,
+        thumbnail_url=None,
+        channel_name="TestChannel",
+        duration=40,
+        chapters=(
+            Chapter(title="Event loop", start_time=0.0, end_time=20.0),
+            Chapter(title="Blocking", start_time=20.0, end_time=40.0),
+        ),
+    )
+    usage = AnalysisUsage(
+        prompt_version=PROMPT_VERSION,
+        prompt_tokens=1_000,
+        cached_tokens=800,
+        completion_tokens=300,
+        reasoning_tokens=0,
+    )
+    pipeline.analyze.return_value = replace(ANALYSIS, usage=usage)
+    job = _queue_job(fake_db)
+
+    await run_video_job(job.id, TEST_USER_ID)
+
+    assert job.details["usage"] == {
+        "prompt_version": PROMPT_VERSION,
+        "prompt_tokens": 2_000,
+        "cached_tokens": 1_600,
+        "completion_tokens": 600,
+        "reasoning_tokens": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_over_limit_job_is_rejected_before_transcription(pipeline, fake_db):
+    fake_db.preferences[TEST_USER_ID] = {"max_video_duration_seconds": 300}
+    job = _queue_job(fake_db)
+
+    await run_video_job(job.id, TEST_USER_ID)
+
+    assert job.status == "failed"
+    assert "exceeds the 300s limit" in job.error_message
+    assert job.details["cost_guard"]["action"] == "reject"
+    pipeline.youtube.fetch_transcript_segments.assert_not_awaited()
+    pipeline.analyze.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_over_limit_job_can_run_at_low_priority(pipeline, fake_db):
+    fake_db.preferences[TEST_USER_ID] = {
+        "max_video_duration_seconds": 300,
+        "over_limit_action": "low_priority",
+    }
+    pipeline.analyze.return_value = ANALYSIS
+    job = _queue_job(fake_db)
+
+    await run_video_job(job.id, TEST_USER_ID)
+
+    assert job.status == "completed"
+    assert job.details["cost_guard"]["action"] == "low_priority"
+    assert job.details["cost_guard"]["estimate"]["duration_seconds"] == 600
@@ -0,0 +1,63 @@
+"""Tests for write-behind view tracking."""
+
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.view_tracker import PendingViews, ViewTracker, _update_views
+
+
+def test_record_merges_views_of_the_same_video():
+    tracker = ViewTracker()
+    video_id = uuid.uuid4()
+
+    tracker.record(video_id, datetime(2026, 1, 2))
+    tracker.record(video_id, datetime(2026, 1, 1))
+
+    assert tracker.pending(video_id) == PendingViews(2, datetime(2026, 1, 2))
+
+
+def test_update_is_one_statement_that_keeps_updated_at():
+    items = [
+        (uuid.uuid4(), PendingViews(i + 1, datetime(2026, 1, 1))) for i in range(3)
+    ]
+
+    sql = str(_update_views(items).compile(dialect=postgresql.asyncpg.dialect()))
+
+    assert "FROM (VALUES" in sql
+    assert sql.count("::UUID") == 3
+    assert "updated_at=videos.updated_at" in sql
+    assert "greatest(videos.last_viewed_at" in sql
+    # The pre-update row, to tell whether the video changed review bucket
+    assert "videos AS videos_1" in sql
+    assert "RETURNING videos.user_id, videos_1.view_count" in sql
+
+
+class _FailingSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        raise RuntimeError("database is down")
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_the_views():
+    tracker = ViewTracker()
+    video_id = uuid.uuid4()
+    tracker.record(video_id, datetime(2026, 1, 1))
+
+    with (
+        patch("app.services.view_tracker.async_session", _FailingSession),
+        pytest.raises(RuntimeError),
+    ):
+        await tracker.flush()
+
+    tracker.record(video_id, datetime(2026, 1, 3))
+    assert tracker.pending(video_id) == PendingViews(2, datetime(2026, 1, 3))
@@ -1,7 +1,12 @@
-"""Tests for YouTubeService.extract_youtube_id."""
+"""Tests for YouTubeService URL parsing and transcript selection."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from app.config import settings
 from app.services.youtube import YouTubeService
 
 
@@ -86,3 +91,80 @@ class TestExtractYouTubeId:
     def test_youtube_channel_url_raises(self):
         with pytest.raises(ValueError, match="Could not extract"):
             self.service.extract_youtube_id("https://www.youtube.com/channel/UCxxxxxxx")
+
+
+# ---------------------------------------------------------------------------
+# fetch_transcript
+# ---------------------------------------------------------------------------
+
+
+class _FakeTrack:
+    def __init__(self, language_code: str, is_generated: bool):
+        self.language_code = language_code
+        self.is_generated = is_generated
+        self.is_translatable = True
+        self.translate = MagicMock(side_effect=self._translate)
+
+    def _translate(self, language_code: str) -> "_FakeTrack":
+        return _FakeTrack(language_code, self.is_generated)
+
+    def fetch(self):
+        return SimpleNamespace(
+            snippets=[
+                SimpleNamespace(
+                    text=f"text in {self.language_code}", start=0.0, duration=1.5
+                )
+            ]
+        )
+
+
+class _FakeTranscriptList:
+    def __init__(self, tracks: list[_FakeTrack]):
+        self.tracks = tracks
+
+    def __iter__(self):
+        return iter(self.tracks)
+
+    def _find(self, languages: list[str], generated: bool) -> _FakeTrack:
+        for language in languages:
+            for track in self.tracks:
+                if track.language_code == language and track.is_generated == generated:
+                    return track
+        raise LookupError("not found")
+
+    def find_manually_created_transcript(self, languages):
+        return self._find(languages, generated=False)
+
+    def find_generated_transcript(self, languages):
+        return self._find(languages, generated=True)
+
+
+class TestFetchTranscript:
+    def _fetch(self, tracks: list[_FakeTrack]) -> tuple[str, str]:
+        api = MagicMock()
+        api.list.return_value = _FakeTranscriptList(tracks)
+        with patch("app.services.youtube.YouTubeTranscriptApi", return_value=api):
+            return asyncio.run(YouTubeService().fetch_transcript("dQw4w9WgXcQ"))
+
+    def test_native_mode_prefers_vietnamese_without_translation(self):
+        english = _FakeTrack("en", is_generated=True)
+        vietnamese = _FakeTrack("vi", is_generated=False)
+        text, source = self._fetch([english, vietnamese])
+        assert text == "text in vi"
+        assert source == "captions:vi"
+        english.translate.assert_not_called()
+
+    def test_native_mode_uses_other_languages_as_is(self):
+        japanese = _FakeTrack("ja", is_generated=True)
+        text, source = self._fetch([japanese])
+        assert text == "text in ja"
+        assert source == "captions:ja"
+        japanese.translate.assert_not_called()
+
+    def test_translate_mode_records_target_language(self, monkeypatch):
+        monkeypatch.setattr(settings, "transcript_mode", "translate")
+        japanese = _FakeTrack("ja", is_generated=False)
+        text, source = self._fetch([japanese])
+        assert text == "text in en"
+        assert source == "captions-translated:en"
+        japanese.translate.assert_called_once_with("en")
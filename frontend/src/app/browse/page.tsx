@@ -257,6 +257,7 @@ function BrowsePageContent() {
     duration_asc: "Shortest",
     channel_name_asc: "Source A-Z",
     channel_name_desc: "Source Z-A",
+    relevance_desc: "Best match",
   };
 
   const sentinelRef = useRef<HTMLDivElement>(null);
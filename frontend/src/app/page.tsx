@@ -56,22 +56,29 @@ export default function HomePage() {
             sort_by: "created_at",
             sort_order: "desc",
             limit: 20,
+            total_mode: "none",
           }).catch(() => ({ items: [] as VideoListItem[], total: 0 })),
           listVideos({
             sort_by: "random",
+            // A fresh seed per visit; an unchanged URL would be answered
+            // from the HTTP cache with the previous shuffle
+            seed: Math.random().toString(36).slice(2),
             limit: 10,
+            total_mode: "none",
           }).catch(() => ({ items: [] as VideoListItem[], total: 0 })),
           listVideos({
             is_favourite: true,
             sort_by: "created_at",
             sort_order: "desc",
             limit: 20,
+            total_mode: "none",
           }).catch(() => ({ items: [] as VideoListItem[], total: 0 })),
           listVideos({
             review_status: "stale",
             sort_by: "created_at",
             sort_order: "desc",
             limit: 20,
+            total_mode: "none",
           }).catch(() => ({ items: [] as VideoListItem[], total: 0 })),
         ]);
 
@@ -142,24 +142,18 @@ export function CategoriesTab() {
 
   const loadVideoCounts = useCallback(async () => {
     const counts: Record<string, number> = {};
-    const limit = 100;
-    let offset = 0;
-    let total = 0;
+    let cursor: string | undefined;
 
     do {
-      const page = await listVideos({ limit, offset });
-      total = page.total;
+      const page = await listVideos({ limit: 100, cursor, total_mode: "none" });
       page.items.forEach((video) => {
         if (!video.category) {
           return;
         }
         counts[video.category] = (counts[video.category] ?? 0) + 1;
       });
-      offset += page.items.length;
-      if (page.items.length === 0) {
-        break;
-      }
-    } while (offset < total);
+      cursor = page.next_cursor ?? undefined;
+    } while (cursor);
 
     return counts;
   }, []);
@@ -37,6 +37,7 @@ import { DeleteButton } from "@/components/DeleteButton";
 import {
   getVideo,
   getVideoJob,
+  getJobCostEstimate,
   getRelatedVideos,
   listCategories,
   updateVideoCategory,
@@ -94,6 +95,7 @@ export default function VideoPage({
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [relatedVideos, setRelatedVideos] = useState<VideoListItem[]>([]);
+  const [chapterStart, setChapterStart] = useState<number | undefined>();
 
   useEffect(() => {
     let cancelled = false;
@@ -206,7 +208,13 @@ export default function VideoPage({
 
   useEffect(() => {
     if (!video) return;
-    getRelatedVideos(video.id).then(setRelatedVideos).catch(() => setRelatedVideos([]));
+    // Videos without shared tags can still be about the same thing
+    getRelatedVideos(video.id)
+      .then((items) =>
+        items.length > 0 ? items : getRelatedVideos(video.id, 5, "semantic"),
+      )
+      .then(setRelatedVideos)
+      .catch(() => setRelatedVideos([]));
   }, [video]);
 
   const handleCategoryChange = useCallback(
@@ -360,6 +368,7 @@ export default function VideoPage({
     const totalSteps = Math.max(job.total_steps, 1);
     const stepNumber = Math.min(job.current_step + 1, totalSteps);
     const progress = (stepNumber / totalSteps) * 100;
+    const costEstimate = getJobCostEstimate(job);
 
     return (
       <div className="min-h-screen bg-background">
@@ -386,6 +395,11 @@ export default function VideoPage({
                 </span>
               </div>
               <Progress value={progress} className="h-2" />
+              {costEstimate && (
+                <p className="text-xs text-muted-foreground">
+                  Estimated cost: up to ${costEstimate.total_cost_usd.toFixed(2)}
+                </p>
+              )}
             </div>
           </div>
 
@@ -436,7 +450,11 @@ export default function VideoPage({
         {/* Left panel - player + metadata */}
         <div className="lg:w-2/5">
           <div className="lg:sticky lg:top-6">
-            <YouTubeEmbed youtubeId={video.youtube_id} title={video.title ?? "Resource"} />
+            <YouTubeEmbed
+              youtubeId={video.youtube_id}
+              title={video.title ?? "Resource"}
+              startSeconds={chapterStart}
+            />
 
             <div className="mt-4 rounded-2xl border bg-card p-5 shadow-sm">
               <div className="flex items-start justify-between gap-2">
@@ -482,6 +500,27 @@ export default function VideoPage({
                 </div>
               )}
 
+              {video.chapters && video.chapters.length > 0 && (
+                <div className="mt-3 space-y-1">
+                  <p className="text-xs font-medium uppercase tracking-wide text-muted-foreground">
+                    Chapters
+                  </p>
+                  {video.chapters.map((chapter) => (
+                    <button
+                      key={chapter.start_time}
+                      type="button"
+                      onClick={() => setChapterStart(chapter.start_time)}
+                      className="flex w-full items-baseline gap-2 rounded px-1 py-0.5 text-left text-sm hover:bg-muted"
+                    >
+                      <span className="shrink-0 font-mono text-xs text-muted-foreground">
+                        {formatDuration(Math.floor(chapter.start_time)) || "0:00"}
+                      </span>
+                      <span className="truncate">{chapter.title}</span>
+                    </button>
+                  ))}
+                </div>
+              )}
+
               <div className="mt-3 space-y-2">
                 <p className="text-xs font-medium uppercase tracking-wide text-muted-foreground">
                   Category
@@ -46,6 +46,9 @@ export function ResourceListItem({
       <Link href={`/video/${video.id}`} className="flex min-w-0 flex-1 items-start gap-4">
         <div className="flex min-w-0 flex-1 flex-col gap-1">
           <h3 className="text-sm font-medium leading-snug">{video.title ?? "Untitled"}</h3>
+          {video.excerpt && (
+            <p className="line-clamp-2 text-xs text-muted-foreground">{video.excerpt}</p>
+          )}
           <div className="flex flex-wrap items-center gap-x-2 gap-y-1 text-xs text-muted-foreground">
             {video.channel_name && <span>{video.channel_name}</span>}
             {video.channel_name && <span>&middot;</span>}
@@ -1,13 +1,18 @@
 interface YouTubeEmbedProps {
   youtubeId: string;
   title: string;
+  startSeconds?: number;
 }
 
-export function YouTubeEmbed({ youtubeId, title }: YouTubeEmbedProps) {
+export function YouTubeEmbed({ youtubeId, title, startSeconds }: YouTubeEmbedProps) {
+  const query =
+    startSeconds !== undefined
+      ? `?start=${Math.floor(startSeconds)}&autoplay=1`
+      : "";
   return (
     <div className="aspect-video w-full overflow-hidden rounded-lg bg-muted">
       <iframe
-        src={`https://www.youtube-nocookie.com/embed/${youtubeId}`}
+        src={`https://www.youtube-nocookie.com/embed/${youtubeId}${query}`}
         title={title}
         allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"
         allowFullScreen
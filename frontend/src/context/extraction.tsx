@@ -68,7 +68,7 @@ export function ExtractionProvider({ children }: { children: React.ReactNode })
   }, []);
 
   const refreshVideos = useCallback(async () => {
-    const data = await listVideos({ limit: 100 });
+    const data = await listVideos({ limit: 100, total_mode: "none" });
     setVideos(data.items);
   }, []);
 
@@ -192,7 +192,7 @@ export function ExtractionProvider({ children }: { children: React.ReactNode })
       }
 
       try {
-        const data = await listVideos({ limit: 100 });
+        const data = await listVideos({ limit: 100, total_mode: "none" });
         if (isMounted) setVideos(data.items);
       } catch {
         if (isMounted) setExtractError("Failed to load resources");
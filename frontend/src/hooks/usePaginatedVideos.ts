@@ -21,14 +21,17 @@ interface UsePaginatedVideosResult {
 }
 
 export function usePaginatedVideos(
-  filters: Omit<VideoListParams, "limit" | "offset">,
+  filters: Omit<VideoListParams, "limit" | "offset" | "cursor" | "total_mode">,
 ): UsePaginatedVideosResult {
   const [videos, setVideos] = useState<VideoListItem[]>([]);
   const [total, setTotal] = useState(0);
+  const [hasMore, setHasMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const offsetRef = useRef(0);
+  // Keyset cursor for the next page; null once the server has no more.
+  const cursorRef = useRef<string | null>(null);
   const requestInFlightRef = useRef(false);
 
   const filtersKey = JSON.stringify(filters);
@@ -45,10 +48,13 @@ export function usePaginatedVideos(
         if (append) setLoadingMore(true);
         else setLoading(true);
 
+        const cursor = append ? cursorRef.current : null;
         const data = await listVideos({
           ...filters,
           limit: PAGE_SIZE,
-          offset,
+          ...(cursor ? { cursor } : { offset }),
+          // The total only changes on a refresh; later pages skip counting
+          total_mode: append ? "none" : "exact",
         });
 
         setVideos((prev) => {
@@ -70,8 +76,12 @@ export function usePaginatedVideos(
 
           return merged;
         });
-        setTotal(data.total);
+        if (data.total !== null) {
+          setTotal(data.total);
+        }
+        setHasMore(data.has_more ?? false);
         offsetRef.current = offset + data.items.length;
+        cursorRef.current = data.next_cursor ?? null;
         setError(null);
       } catch (e) {
         setError(e instanceof Error ? e.message : "Failed to load videos");
@@ -87,17 +97,19 @@ export function usePaginatedVideos(
 
   useEffect(() => {
     offsetRef.current = 0;
+    cursorRef.current = null;
     fetchPage(0, false);
   }, [fetchPage]);
 
   const loadMore = useCallback(() => {
-    if (!loadingMore && offsetRef.current < total) {
+    if (!loadingMore && hasMore) {
       fetchPage(offsetRef.current, true);
     }
-  }, [loadingMore, total, fetchPage]);
+  }, [loadingMore, hasMore, fetchPage]);
 
   const refresh = useCallback(() => {
     offsetRef.current = 0;
+    cursorRef.current = null;
     fetchPage(0, false);
   }, [fetchPage]);
 
@@ -107,7 +119,7 @@ export function usePaginatedVideos(
     loading,
     loadingMore,
     error,
-    hasMore: offsetRef.current < total,
+    hasMore,
     loadMore,
     refresh,
   };
@@ -16,17 +16,27 @@ export interface VideoListItem {
     thumbnail_url: string | null;
     channel_name: string | null;
     duration: number | null;
-    explanation: string | null;
-    key_knowledge: string | null;
+    /** Plain-text preview of the analysis, at most 280 characters. */
+    excerpt: string | null;
     keywords: string[] | null;
     category: string | null;
     transcript_source: string | null;
+    analysis_status: string;
     is_favourite: boolean;
     created_at: string;
     updated_at: string;
 }
 
+export interface VideoChapter {
+    title: string;
+    start_time: number;
+    end_time: number;
+}
+
 export interface Video extends VideoListItem {
+    chapters: VideoChapter[] | null;
+    explanation: string | null;
+    key_knowledge: string | null;
     critical_analysis: string | null;
     real_world_applications: string | null;
     notes: string | null;
@@ -43,11 +53,30 @@ export interface VideoJob {
     total_steps: number;
     step_label: string;
     error_message: string | null;
+    details: Record<string, unknown> | null;
     video_id: string | null;
     created_at: string;
     updated_at: string;
 }
 
+export interface JobCostEstimate {
+    duration_seconds: number | null;
+    transcript_chars: number;
+    llm_calls: number;
+    llm_cost_usd: number;
+    whisper_cost_usd: number;
+    llm_latency_seconds: number;
+    total_cost_usd: number;
+}
+
+/** Pre-flight cost estimate recorded on a job, if the guard has run. */
+export function getJobCostEstimate(job: VideoJob): JobCostEstimate | null {
+    const guard = job.details?.cost_guard as
+        | { estimate?: JobCostEstimate }
+        | undefined;
+    return guard?.estimate ?? null;
+}
+
 export interface TagSummary {
     tag: string;
     usage_count: number;
@@ -137,23 +166,50 @@ export function listVideoJobs(statuses?: VideoJobStatus[]) {
 
 export interface PaginatedResponse<T> {
     items: T[];
-    total: number;
+    /** null when requested with total_mode "none". */
+    total: number | null;
     limit: number;
     offset: number;
+    has_more?: boolean;
+    /** Pass back as `cursor` for the next page; null on the last page. */
+    next_cursor?: string | null;
+    /** Per-facet counts over the whole filtered set, when `facets` is set. */
+    facets?: Partial<Record<VideoFacet, FacetCount[]>> | null;
+}
+
+export type VideoFacet = "category" | "tag" | "collection" | "favourite";
+
+export interface FacetCount {
+    /** Slug, tag, collection id or "true"/"false"; null = uncategorized. */
+    value: string | null;
+    count: number;
 }
 
 export interface VideoListParams {
     limit?: number;
     offset?: number;
+    /** Keyset cursor from a previous page; takes precedence over offset. */
+    cursor?: string;
+    /** "exact" (default), "estimated" (planner estimate) or "none". */
+    total_mode?: "exact" | "estimated" | "none";
     search?: string;
+    /**
+     * "fuzzy" matches titles/channels by trigram similarity (typo-tolerant);
+     * "hybrid" fuses full-text and semantic matches (rank with relevance).
+     */
+    search_mode?: "fulltext" | "fuzzy" | "hybrid";
     sort_by?: string;
     sort_order?: "asc" | "desc";
+    /** Shuffle seed for sort_by=random; the same seed gives the same order. */
+    seed?: string;
     tag?: string;
     tag_mode?: "all" | "any";
     category?: string;
     collection_id?: string;
     review_status?: string;
     is_favourite?: boolean;
+    /** Comma-separated `VideoFacet`s to count, e.g. "category,tag". */
+    facets?: string;
 }
 
 /** List videos with server-side pagination, search, and filtering. */
@@ -299,15 +355,26 @@ export function removeVideoFromCollection(
     );
 }
 
+export type RelatedMode = "keywords" | "semantic";
+
 export function getRelatedVideos(
     videoId: string,
     limit = 5,
+    mode: RelatedMode = "keywords",
 ): Promise<VideoListItem[]> {
     return request<VideoListItem[]>(
-        `/api/videos/${videoId}/related?limit=${limit}`,
+        `/api/videos/${videoId}/related?limit=${limit}&mode=${mode}`,
     );
 }
 
+export function semanticSearch(
+    query: string,
+    limit = 20,
+): Promise<VideoListItem[]> {
+    const params = new URLSearchParams({ q: query, limit: String(limit) });
+    return request<VideoListItem[]>(`/api/videos/semantic-search?${params}`);
+}
+
 export interface DashboardStats {
     total_videos: number;
     total_collections: number;
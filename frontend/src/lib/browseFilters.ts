@@ -1,5 +1,6 @@
 export type SortOption =
-  `${"created_at" | "title" | "duration" | "channel_name"}_${"asc" | "desc"}`;
+  | `${"created_at" | "title" | "duration" | "channel_name"}_${"asc" | "desc"}`
+  | "relevance_desc";
 
 export type QuickFilter =
   | "inbox"
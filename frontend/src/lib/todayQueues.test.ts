@@ -12,8 +12,7 @@ function video(partial: Partial<VideoListItem>): VideoListItem {
     thumbnail_url: null,
     channel_name: null,
     duration: 60,
-    explanation: null,
-    key_knowledge: null,
+    excerpt: null,
     keywords: [],
     category: partial.category ?? null,
     transcript_source: null,